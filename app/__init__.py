@@ -41,28 +41,6 @@ def create_app(config_class=None):
     os.makedirs('app/uploads', exist_ok=True)
     os.makedirs('instance', exist_ok=True) # to hold the SQLite database 
     
-    # Copy schema.sql to app directory if it doesn't exist
-    schema_path = os.path.join(app.root_path, 'schema.sql')
-    if not os.path.exists(schema_path): # If the schema file doesn't exist, create it
-        with open(schema_path, 'w') as f:
-            f.write('''
-DROP TABLE IF EXISTS jobs;
-CREATE TABLE IF NOT EXISTS jobs (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    title TEXT NOT NULL,
-    company TEXT NOT NULL,
-    description TEXT NOT NULL,
-    location TEXT,
-    skills_required TEXT,
-    application_link TEXT UNIQUE NOT NULL,
-    created TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-    posted_date TEXT NOT NULL,
-    source TEXT NOT NULL
-);
-CREATE INDEX IF NOT EXISTS idx_jobs_source ON jobs(source);
-CREATE INDEX IF NOT EXISTS idx_jobs_posted_date ON jobs(posted_date);
-            '''.strip())
-
     # Initialize Flask-Login
     login_manager = LoginManager()
     login_manager.login_view = 'auth.login'
@@ -72,14 +50,40 @@ CREATE INDEX IF NOT EXISTS idx_jobs_posted_date ON jobs(posted_date);
     @login_manager.user_loader
     def load_user(user_id):
         from app.utils.db_utils import get_db
+        from app.utils.cache import cached
         from app.models.user import User
-        db = get_db()
-        return User.get_by_id(int(user_id), db)
+        # Runs on every authenticated request, so the user record is cached
+        return cached('users', int(user_id), lambda: User.get_by_id(int(user_id), get_db()))
+    
+    # Set up the job and user caches
+    from app.utils import cache
+    cache.init_app(app)
     
     # Initialize database
     from app.utils import db_utils
     db_utils.init_app(app)
     
+    # Register near-duplicate detection commands
+    from app.utils import job_dedup
+    job_dedup.init_app(app)
+    
+    # Load the precomputed job matching index
+    from app.models import job_index
+    job_index.init_app(app)
+    
+    # Register NLP model loading; models load lazily unless NLP_PRELOAD is set
+    from app.utils import nlp_models
+    nlp_models.init_app(app)
+    
+    # Set up the background task queue; task handlers live in app.tasks
+    from app.utils import task_queue
+    from app import tasks
+    task_queue.init_app(app)
+    
+    # Register batch matching commands
+    from app.models import batch_matcher
+    batch_matcher.init_app(app)
+    
     # Register routes
     from app import routes
     app.register_blueprint(routes.bp)
@@ -0,0 +1,178 @@
+import os
+import csv
+import json
+import logging
+import click
+import scipy.sparse as sp
+from flask import current_app
+from flask.cli import with_appcontext
+from app.models.job_index import get_job_index
+from app.models.job_matcher import JobMatcher
+from app.models.resume_processor import ResumeProcessor
+from app.utils.extraction_service import get_extraction_service
+
+logger = logging.getLogger(__name__)
+
+def iter_resume_paths(source):
+    """Yield resume paths from a directory or a manifest with one path per line"""
+    extensions = current_app.config['ALLOWED_EXTENSIONS']
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            path = os.path.join(source, name)
+            if os.path.isfile(path) and name.rsplit('.', 1)[-1].lower() in extensions:
+                yield path
+        return
+
+    # Manifest paths are relative to the manifest itself
+    base_dir = os.path.dirname(os.path.abspath(source))
+    with open(source, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield os.path.join(base_dir, line)
+
+def extract_resume_texts(paths):
+    """Yield (path, text, features, error) for each resume, in completion order"""
+    service = get_extraction_service()
+    for path, text, error in service.iter_extract(paths):
+        if error:
+            yield path, '', None, error
+        elif not text:
+            yield path, '', None, 'No text could be extracted'
+        else:
+            # Same features as an upload, from the text already extracted
+            processor = ResumeProcessor(path)
+            processor.text = processor.preprocess_text(text)
+            yield path, processor.text, processor.extract_features(), None
+
+class BatchMatcher:
+    """Rank many resumes against the job index, giving the same matches as JobMatcher.rank_jobs.
+
+    Text scores for a chunk of resumes come from one sparse matrix-matrix
+    product, which stays sparse. Each resume's candidates are then scored on every component
+    and collapsed to distinct jobs by JobMatcher.rank_candidates, so the
+    batch output only differs from the web path in how it is computed.
+    """
+
+    def __init__(self, index=None, top_n=10, chunk_size=32, hybrid=True):
+        # Batch runs are offline, so a missing index is fitted rather than queued
+        self.index = index if index is not None else get_job_index(rebuild=True)
+        self.top_n = top_n
+        # Resumes vectorised and scored per matrix product
+        self.chunk_size = chunk_size
+        self.matcher = JobMatcher(index=self.index, hybrid=hybrid)
+
+    def score_matrix(self, texts):
+        """Resume-by-job cosine scores from one sparse matrix-matrix product, as a CSR matrix.
+
+        Only pairs sharing a term are stored, so memory follows the overlap
+        rather than the number of jobs. Tombstoned rows are left in; callers
+        pick live candidate columns.
+        """
+        if self.index.is_empty:
+            return sp.csr_matrix((len(texts), len(self.index.job_ids)))
+        queries = self.index.transform(texts)
+        return (queries @ self.index.matrix.T).tocsr()
+
+    def match(self, resumes):
+        """Yield (name, matches) per (name, text) or (name, text, features) resume.
+
+        Matches are (job_id, score) pairs. Without features, skills are taken
+        from the text as rank_jobs does.
+        """
+        chunk = []
+        for name, text, *features in resumes:
+            chunk.append((name, text, features[0] if features else None))
+            if len(chunk) >= self.chunk_size:
+                yield from self._match_chunk(chunk)
+                chunk = []
+        if chunk:
+            yield from self._match_chunk(chunk)
+
+    def _match_chunk(self, chunk):
+        if self.index.is_empty:
+            for name, _, _ in chunk:
+                yield name, []
+            return
+        scores = self.score_matrix([text for _, text, _ in chunk])
+        min_candidates = max(current_app.config.get('MATCH_MIN_CANDIDATES', 200), self.matcher.fetch_size(self.top_n))
+        for i, (name, text, features) in enumerate(chunk):
+            skills = self.matcher.resume_skills(text, features)
+            rows = self.index.candidate_rows(skills if self.matcher.hybrid else None, min_candidates)
+            # Only this resume's candidate columns are made dense
+            text_scores = scores[i][:, rows].toarray().ravel()
+            yield name, self.matcher.rank_candidates(
+                self.index, rows, text_scores, dict(features or {}, skills=skills), self.top_n
+            )
+
+def write_results(results, output, fmt, matcher=None):
+    """Stream batch results as CSV rows or JSON lines, returning the resume count"""
+    matcher = matcher or JobMatcher()
+    writer = None
+    if fmt == 'csv':
+        writer = csv.writer(output)
+        writer.writerow(['resume', 'rank', 'job_id', 'score', 'title', 'company', 'error'])
+
+    count = 0
+    for name, matches, error in results:
+        jobs = {job['id']: job for job in matcher.get_jobs_by_ids([job_id for job_id, _ in matches])}
+        if writer is not None:
+            if error:
+                writer.writerow([name, '', '', '', '', '', error])
+            for rank, (job_id, score) in enumerate(matches, 1):
+                job = jobs.get(job_id, {})
+                writer.writerow([name, rank, job_id, f'{score:.6f}', job.get('title'), job.get('company'), ''])
+        else:
+            output.write(json.dumps({
+                'resume': name,
+                'error': error,
+                'matches': [
+                    {
+                        'job_id': job_id,
+                        'score': round(score, 6),
+                        'title': jobs.get(job_id, {}).get('title'),
+                        'company': jobs.get(job_id, {}).get('company'),
+                    }
+                    for job_id, score in matches
+                ]
+            }) + '\n')
+        output.flush()
+        count += 1
+    return count
+
+def match_resume_files(paths, top_n=10, chunk_size=32):
+    """Yield (path, matches, error) for resume files, matched in chunks"""
+    errors = {}
+
+    def resumes():
+        for path, text, features, error in extract_resume_texts(paths):
+            if error:
+                logger.error(f"Error extracting {path}: {error}")
+                errors[path] = error
+            yield path, text, features
+
+    matcher = BatchMatcher(top_n=top_n, chunk_size=chunk_size)
+    for path, matches in matcher.match(resumes()):
+        error = errors.pop(path, None)
+        yield path, ([] if error else matches), error
+
+@click.command('match-batch')
+@click.argument('source', type=click.Path(exists=True))
+@click.option('--output', '-o', type=click.File('w'), default='-', help='Output file (default: stdout)')
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl']), default=None,
+              help='Output format; inferred from the output file extension if omitted')
+@click.option('--top-n', '-n', default=10, help='Number of matches to keep per resume')
+@click.option('--chunk-size', default=32, help='Resumes scored per matrix product')
+@with_appcontext
+def match_batch_command(source, output, fmt, top_n, chunk_size):
+    """Match a directory or manifest of resumes against all jobs."""
+    if fmt is None:
+        fmt = 'jsonl' if output.name.endswith('.jsonl') else 'csv'
+    results = match_resume_files(iter_resume_paths(source), top_n=top_n, chunk_size=chunk_size)
+    count = write_results(results, output, fmt)
+    if output.name != '<stdout>':
+        click.echo(f'Matched {count} resumes.')
+
+def init_app(app):
+    """Register batch matching commands with the Flask app."""
+    app.cli.add_command(match_batch_command)
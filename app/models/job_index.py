@@ -0,0 +1,532 @@
+import os
+import logging
+import tempfile
+import threading
+import click
+from contextlib import contextmanager
+import numpy as np
+import scipy.sparse as sp
+from flask import current_app
+from flask.cli import with_appcontext
+from sklearn.feature_extraction.text import TfidfVectorizer
+from app.utils.db_utils import get_db
+from app.utils.task_queue import get_task_queue
+from app.models.skill_index import SkillIndex
+from app.models.scoring import location_terms
+from app.utils.job_features import extract_job_features, load_job_features
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are only serialised within one process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_index_lock = threading.RLock()
+# How deeply the thread holding _index_lock has entered index_write_lock
+_write_lock_depth = 0
+
+class JobIndex:
+    """TF-IDF index over job descriptions, fitted once and persisted to disk.
+
+    Rows are built from (id, description, skills_required, location) tuples;
+    location may be left off. Skills, required years and degree level come
+    from the features stored at ingestion time (see load_job_features);
+    rows without stored features have them extracted on the fly.
+    """
+
+    def __init__(self, vectorizer, matrix, job_ids, alive=None, oov_tokens=0, total_tokens=0, skills=None,
+                 required_years=None, degree_levels=None, locations=None, appended_docs=0, fit_docs=None):
+        self.vectorizer = vectorizer
+        # One L2-normalised row per job, aligned with job_ids
+        self.matrix = matrix
+        self.job_ids = job_ids
+        # Skill postings for the candidate prefilter, aligned with the same rows
+        self.skills = skills if skills is not None else SkillIndex()
+        # Per-row attributes used by the scoring engine
+        self.required_years = required_years if required_years is not None else np.full(len(job_ids), np.nan)
+        self.degree_levels = degree_levels if degree_levels is not None else np.zeros(len(job_ids), dtype=np.int8)
+        self.locations = locations if locations is not None else SkillIndex()
+        # Deleted or superseded rows are tombstoned rather than removed
+        self.alive = alive if alive is not None else np.ones(len(job_ids), dtype=bool)
+        # Token counts of documents appended since the last fit, used to measure drift
+        self.oov_tokens = oov_tokens
+        self.total_tokens = total_tokens
+        # Documents appended since the last fit, and how many the vocabulary was fitted on
+        self.appended_docs = appended_docs
+        self.fit_docs = len(job_ids) if fit_docs is None else fit_docs
+
+    @property
+    def is_empty(self):
+        return self.vectorizer is None or not self.alive.any()
+
+    @property
+    def live_count(self):
+        return int(self.alive.sum())
+
+    @property
+    def drift(self):
+        """Share of appended tokens that fall outside the fitted vocabulary"""
+        if not self.total_tokens:
+            return 0.0
+        return self.oov_tokens / self.total_tokens
+
+    @property
+    def appended_share(self):
+        """Documents appended since the last fit, relative to the fitted corpus"""
+        return self.appended_docs / max(self.fit_docs, 1)
+
+    def needs_refit(self, threshold=0.1, min_share=0.1):
+        """Whether appended jobs have drifted from the vocabulary enough to refit.
+
+        Drift alone is measured on the appended documents, so a handful of
+        postings full of new words would trip it; they must also add up to
+        min_share of the fitted corpus.
+        """
+        return self.drift > threshold and self.appended_share >= min_share
+
+    @property
+    def tombstone_ratio(self):
+        if not len(self.job_ids):
+            return 0.0
+        return 1.0 - self.live_count / len(self.job_ids)
+
+    def live_ids(self):
+        return self.job_ids[self.alive]
+
+    def copy(self):
+        """Copy for updating while readers keep using the current index"""
+        return JobIndex(
+            self.vectorizer, self.matrix, self.job_ids, self.alive.copy(),
+            self.oov_tokens, self.total_tokens, self.skills.copy(),
+            self.required_years, self.degree_levels, self.locations.copy(),
+            self.appended_docs, self.fit_docs
+        )
+
+    @staticmethod
+    def make_vectorizer(vocabulary=None):
+        return TfidfVectorizer(stop_words='english', vocabulary=vocabulary)
+
+    @classmethod
+    def empty(cls):
+        return cls(None, sp.csr_matrix((0, 0)), np.empty(0, dtype=np.int64))
+
+    @classmethod
+    def build(cls, rows, features=None):
+        """Fit the vocabulary and IDF weights on job rows, with stored features by job id"""
+        job_ids = np.array([row[0] for row in rows], dtype=np.int64)
+        documents = [row[1] or '' for row in rows]
+        if not documents:
+            return cls.empty()
+
+        vectorizer = cls.make_vectorizer()
+        try:
+            # TfidfVectorizer L2-normalises each row by default
+            matrix = vectorizer.fit_transform(documents).tocsr()
+        except ValueError as e:
+            logger.warning(f"Could not fit job index: {e}")
+            return cls.empty()
+
+        skills, required_years, degree_levels, locations = _row_attributes(rows, features)
+        return cls(vectorizer, matrix, job_ids, skills=SkillIndex.build(skills), required_years=required_years,
+                   degree_levels=degree_levels, locations=SkillIndex.build(locations))
+
+    def transform(self, texts):
+        """Vectorise texts against the fitted vocabulary"""
+        return self.vectorizer.transform(texts)
+
+    def query(self, text):
+        """Cosine similarity between text and every indexed job"""
+        if self.is_empty:
+            return np.empty(0)
+        query_vector = self.transform([text])
+        scores = (self.matrix @ query_vector.T).toarray().ravel()
+        # Tombstoned rows can never be selected
+        scores[~self.alive] = -np.inf
+        return scores
+
+    def candidates(self, text, skills=None, min_candidates=200):
+        """Live row positions worth scoring for a query, with their cosine scores.
+
+        Jobs sharing a skill with the query are gathered from the skill
+        postings and only those rows are scored. When skills is None or
+        fewer than min_candidates are found, every live job is scored.
+        """
+        if self.is_empty:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+
+        rows = self.candidate_rows(skills, min_candidates)
+        if len(rows) == np.count_nonzero(self.alive):
+            return rows, self.query(text)[rows]
+
+        scores = (self.matrix[rows] @ self.transform([text]).T).toarray().ravel()
+        return rows, scores
+    
+    def candidate_rows(self, skills=None, min_candidates=200):
+        """Live row positions sharing a skill, or every live row when there are too few (see candidates)"""
+        if skills is not None:
+            rows = self.skills.lookup(skills)
+            rows = rows[self.alive[rows]]
+            if len(rows) >= min_candidates:
+                return rows
+        return np.flatnonzero(self.alive)
+    
+    def search(self, text, skills, top_n=10, min_candidates=200):
+        """Two-stage retrieval by text alone, returning (row positions, scores), best first"""
+        rows, scores = self.candidates(text, skills, max(min_candidates, top_n))
+        best = top_k(scores, top_n)
+        return rows[best], scores[best]
+
+    def remove(self, job_ids):
+        """Tombstone the rows of deleted or superseded jobs"""
+        if not len(self.job_ids):
+            return 0
+        dead = np.isin(self.job_ids, np.asarray(list(job_ids), dtype=np.int64)) & self.alive
+        self.alive[dead] = False
+        return int(dead.sum())
+
+    def add(self, rows, features=None):
+        """Vectorise job rows against the existing vocabulary"""
+        if not rows:
+            return
+        self.remove([row[0] for row in rows])
+
+        documents = [row[1] or '' for row in rows]
+        analyzer = self.vectorizer.build_analyzer()
+        vocabulary = self.vectorizer.vocabulary_
+        for document in documents:
+            tokens = analyzer(document)
+            self.total_tokens += len(tokens)
+            self.oov_tokens += sum(1 for token in tokens if token not in vocabulary)
+        self.appended_docs += len(documents)
+
+        new_ids = np.array([row[0] for row in rows], dtype=np.int64)
+        self.matrix = sp.vstack([self.matrix, self.transform(documents)], format='csr')
+        self.job_ids = np.concatenate([self.job_ids, new_ids])
+        self.alive = np.concatenate([self.alive, np.ones(len(new_ids), dtype=bool)])
+        skills, required_years, degree_levels, locations = _row_attributes(rows, features)
+        self.skills.append(skills)
+        self.required_years = np.concatenate([self.required_years, required_years])
+        self.degree_levels = np.concatenate([self.degree_levels, degree_levels])
+        self.locations.append(locations)
+
+    def compact(self):
+        """Drop tombstoned rows; the vocabulary is unchanged so no refit is needed"""
+        self.matrix = self.matrix[self.alive]
+        self.job_ids = self.job_ids[self.alive]
+        self.skills = self.skills.select_rows(self.alive)
+        self.required_years = self.required_years[self.alive]
+        self.degree_levels = self.degree_levels[self.alive]
+        self.locations = self.locations.select_rows(self.alive)
+        self.alive = np.ones(len(self.job_ids), dtype=bool)
+
+    def save(self, path):
+        """Write the index atomically so readers never see a partial file"""
+        if self.vectorizer is None:
+            terms = np.empty(0, dtype=str)
+            idf = np.empty(0)
+        else:
+            terms = np.asarray(self.vectorizer.get_feature_names_out(), dtype=str)
+            idf = self.vectorizer.idf_
+
+        matrix = self.matrix.tocsr()
+        skill_matrix = self.skills.matrix.tocsr()
+        location_matrix = self.locations.matrix.tocsr()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.npz')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(
+                    f,
+                    terms=terms,
+                    idf=idf,
+                    data=matrix.data,
+                    indices=matrix.indices,
+                    indptr=matrix.indptr,
+                    shape=np.array(matrix.shape, dtype=np.int64),
+                    job_ids=self.job_ids,
+                    alive=self.alive,
+                    token_counts=np.array(
+                        [self.oov_tokens, self.total_tokens, self.appended_docs, self.fit_docs], dtype=np.int64
+                    ),
+                    skill_terms=np.asarray(self.skills.terms, dtype=str),
+                    skill_indices=skill_matrix.indices,
+                    skill_indptr=skill_matrix.indptr,
+                    required_years=self.required_years,
+                    degree_levels=self.degree_levels,
+                    location_terms=np.asarray(self.locations.terms, dtype=str),
+                    location_indices=location_matrix.indices,
+                    location_indptr=location_matrix.indptr,
+                )
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        """Load an index previously written by save()"""
+        with np.load(path, allow_pickle=False) as data:
+            terms = data['terms']
+            job_ids = data['job_ids']
+            if len(terms) == 0:
+                return cls.empty()
+            if 'degree_levels' not in data.files:
+                # Written before scoring attributes existed; get_job_index rebuilds it
+                raise ValueError('Job index has no scoring attributes')
+            alive = data['alive'] if 'alive' in data.files else None
+            token_counts = data['token_counts'].tolist() if 'token_counts' in data.files else []
+            # Older files only kept the two token counts
+            oov_tokens, total_tokens, appended_docs, fit_docs = (token_counts + [0, 0, 0, len(job_ids)][len(token_counts):])
+
+            vectorizer = cls.make_vectorizer(
+                vocabulary={term: i for i, term in enumerate(terms.tolist())}
+            )
+            vectorizer.idf_ = data['idf']
+            matrix = sp.csr_matrix(
+                (data['data'], data['indices'], data['indptr']),
+                shape=tuple(data['shape'])
+            )
+            skill_terms = data['skill_terms'].tolist()
+            skill_indices = data['skill_indices']
+            skill_matrix = sp.csr_matrix(
+                (np.ones(len(skill_indices), dtype=np.int8), skill_indices, data['skill_indptr']),
+                shape=(len(job_ids), len(skill_terms))
+            )
+            required_years = data['required_years']
+            degree_levels = data['degree_levels']
+            location_vocabulary = data['location_terms'].tolist()
+            location_indices = data['location_indices']
+            location_matrix = sp.csr_matrix(
+                (np.ones(len(location_indices), dtype=np.int8), location_indices, data['location_indptr']),
+                shape=(len(job_ids), len(location_vocabulary))
+            )
+        skills = SkillIndex(skill_terms, skill_matrix)
+        locations = SkillIndex(location_vocabulary, location_matrix)
+        return cls(vectorizer, matrix, job_ids, alive, int(oov_tokens), int(total_tokens), skills,
+                   required_years, degree_levels, locations, int(appended_docs), int(fit_docs))
+
+def _row_attributes(rows, features=None):
+    # Skill sets, required years, degree levels and location words, aligned with rows
+    features = features or {}
+    skills, required_years, degree_levels, locations = [], [], [], []
+    for row in rows:
+        stored = features.get(row[0])
+        if stored is None:
+            stored = extract_job_features(row[1], row[2])
+        skills.append(stored['skills'])
+        required_years.append(stored['required_years'])
+        degree_levels.append(stored['degree_level'])
+        locations.append(location_terms(row[3]) if len(row) > 3 else set())
+    return (
+        skills,
+        np.array(required_years, dtype=np.float64),
+        np.array(degree_levels, dtype=np.int8),
+        locations,
+    )
+
+def top_k(scores, k):
+    """Positions of the k highest finite scores, best first, without a full sort"""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < len(scores):
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    # Order the k winners by score, breaking ties by index position
+    candidates = candidates[np.lexsort((candidates, -scores[candidates]))]
+    return candidates[np.isfinite(scores[candidates])]
+
+def get_index_path(app=None):
+    app = app or current_app
+    path = app.config.get('JOB_INDEX_PATH')
+    if path:
+        return path
+    # Keep the index next to the database it was built from
+    return os.path.splitext(app.config['DATABASE'])[0] + '.index.npz'
+
+@contextmanager
+def index_write_lock(path=None):
+    """Serialise index writers across threads and across processes sharing the file.
+
+    The web app and the scraper both update the same .npz; without this
+    the last one to save drops the other's appended rows. Holders must
+    work from get_job_index() taken inside the lock, which reloads the file
+    if another process saved it. Re-entrant within a thread.
+    """
+    global _write_lock_depth
+    path = path or get_index_path()
+    with _index_lock:
+        if _write_lock_depth:
+            _write_lock_depth += 1
+            try:
+                yield
+            finally:
+                _write_lock_depth -= 1
+            return
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path + '.lock', 'a') as lock_file:
+            if fcntl is not None:
+                # Released when the file is closed, even if this process dies
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            _write_lock_depth = 1
+            try:
+                yield
+            finally:
+                _write_lock_depth = 0
+
+def build_job_index(db=None):
+    """Fit a fresh index over the jobs table and persist it"""
+    db = db or get_db()
+    path = get_index_path()
+    # Rows are read under the lock, so an update waiting on it is applied on top of this fit
+    with index_write_lock(path):
+        rows = db.execute('SELECT id, description, skills_required, location FROM jobs ORDER BY id').fetchall()
+        index = JobIndex.build(rows, load_job_features(db))
+        index.save(path)
+        _set_index(index, path)
+    logger.info(f"Built job index with {len(index.job_ids)} jobs at {path}")
+    return index
+
+def _set_index(index, path):
+    state = current_app.extensions.setdefault('job_index', {})
+    state['index'] = index
+    state['stamp'] = _file_stamp(path)
+
+def _file_stamp(path):
+    # save() replaces the file, so a new inode marks a rewrite even within one mtime tick
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_ino
+
+def get_job_index(rebuild=False):
+    """Return the loaded index, reloading it if another process rewrote the file.
+
+    A missing or unreadable file is refitted on the task queue while an
+    empty index is served, so a request never waits on a full fit. With
+    rebuild it is refitted here instead, for startup and CLI commands.
+    """
+    path = get_index_path()
+    state = current_app.extensions.setdefault('job_index', {})
+    stamp = _file_stamp(path)
+
+    if state.get('index') is not None and state.get('stamp') == stamp:
+        return state['index']
+
+    with _index_lock:
+        if state.get('index') is not None and state.get('stamp') == stamp:
+            return state['index']
+        if stamp is not None:
+            try:
+                _set_index(JobIndex.load(path), path)
+                return state['index']
+            except Exception as e:
+                logger.error(f"Error loading job index: {e}")
+        if rebuild:
+            return build_job_index()
+
+        logger.warning("No usable job index, serving an empty one until the queued refit saves it")
+        # Set before queueing: with inline tasks the refit runs, and reads it, right away
+        state['index'], state['stamp'] = JobIndex.empty(), stamp
+        queue_refit()
+        return state['index']
+
+def update_job_index(job_ids=(), deleted_ids=(), db=None, defer_refit=False):
+    """Apply inserted/updated and deleted jobs to the index without a full refit.
+
+    A full refit only runs once the jobs appended since the last fit have
+    drifted from its vocabulary (see JobIndex.needs_refit). With
+    defer_refit the appended index is saved and the refit is left to a
+    background task, so a request never waits on it.
+    """
+    job_ids = [int(job_id) for job_id in job_ids]
+    deleted_ids = [int(job_id) for job_id in deleted_ids]
+    if not job_ids and not deleted_ids:
+        return get_job_index()
+
+    db = db or get_db()
+    with index_write_lock():
+        # Taken inside the lock, so changes saved by another process are kept
+        current = get_job_index(rebuild=not defer_refit)
+        if current.vectorizer is None:
+            # Nothing was fitted yet, so there is no vocabulary to extend
+            if not defer_refit:
+                return build_job_index(db)
+            queue_refit()
+            return current
+
+        index = current.copy()
+        index.remove(deleted_ids)
+        rows = []
+        for start in range(0, len(job_ids), 500):
+            chunk = job_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows.extend(db.execute(
+                f'SELECT id, description, skills_required, location FROM jobs WHERE id IN ({placeholders}) ORDER BY id', chunk
+            ).fetchall())
+        # Ids that were requested but no longer exist are deletions too
+        index.remove(set(job_ids) - {row[0] for row in rows})
+        index.add(rows, load_job_features(db, [row[0] for row in rows]))
+
+        refit = index_needs_refit(index)
+        if refit and not defer_refit:
+            logger.info(f"Vocabulary drift {index.drift:.2%} over {index.appended_docs} appended jobs, refitting")
+            return build_job_index(db)
+
+        if index.tombstone_ratio > current_app.config.get('JOB_INDEX_MAX_TOMBSTONES', 0.25):
+            index.compact()
+        path = get_index_path()
+        index.save(path)
+        _set_index(index, path)
+
+    logger.info(f"Updated job index: {len(rows)} upserted, {len(deleted_ids)} deleted")
+    if refit:
+        logger.info(f"Vocabulary drift {index.drift:.2%} over {index.appended_docs} appended jobs, refit queued")
+        queue_refit()
+    return index
+
+def queue_refit():
+    """Queue a refit_job_index task unless one is already queued or running"""
+    return get_task_queue().enqueue('refit_job_index', {}, unique=True)
+
+def index_needs_refit(index):
+    return index.needs_refit(
+        current_app.config.get('JOB_INDEX_DRIFT_THRESHOLD', 0.1),
+        current_app.config.get('JOB_INDEX_REFIT_MIN_SHARE', 0.1)
+    )
+
+def sync_job_index(db=None):
+    """Bring the index in line with the ids currently in the jobs table, fitting it if there is none"""
+    db = db or get_db()
+    index = get_job_index(rebuild=True)
+    db_ids = np.array([row[0] for row in db.execute('SELECT id FROM jobs')], dtype=np.int64)
+    live_ids = index.live_ids()
+    missing = np.setdiff1d(db_ids, live_ids)
+    deleted = np.setdiff1d(live_ids, db_ids)
+    if len(missing) or len(deleted):
+        return update_job_index(missing.tolist(), deleted.tolist(), db)
+    return index
+
+@click.command('build-index')
+@with_appcontext
+def build_index_command():
+    """Refit the job matching index from the jobs table."""
+    index = build_job_index()
+    click.echo(f'Indexed {len(index.job_ids)} jobs.')
+
+def init_app(app):
+    """Load the job index at app start and apply any pending changes."""
+    app.cli.add_command(build_index_command)
+
+    with app.app_context():
+        try:
+            # Pick up rows written while the app was not running
+            sync_job_index()
+        except Exception as e:
+            app.logger.error(f"Error initializing job index: {e}")
@@ -1,68 +1,107 @@
-import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import logging
+from flask import current_app
 from app.utils.db_utils import get_db
+from app.utils.skill_matcher import get_skill_matcher
+from app.utils.job_dedup import collapse_duplicates
+from app.models.job_index import get_job_index, top_k
+from app.models.scoring import ScoringEngine
 
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
 class JobMatcher:
-    def __init__(self):
-        self.vectorizer = TfidfVectorizer(stop_words='english')
+    def __init__(self, index=None, hybrid=True):
+        # Use the app-wide precomputed index unless one is injected
+        self.index = index
+        # Prefilter candidates by skill before scoring, instead of scoring every job
+        self.hybrid = hybrid
         
     def preprocess_for_matching(self, text):
         # Basic preprocessing is already done in ResumeProcessor
         return text
         
-    def find_matches(self, resume_text, resume_features=None, top_n=10):
-        # Find matching jobs based on resume text and extracted features
-        import logging
-        logger = logging.getLogger(__name__)
-        
-        db = get_db()
-        all_jobs = db.execute('SELECT * FROM jobs').fetchall()
+    def rank_jobs(self, resume_text, resume_features=None, top_n=10, explain=False):
+        # Rank jobs for a resume, returning (job_id, score) pairs best first;
+        # with explain, (job_id, score, {component: score}) triples
+        index = self.index if self.index is not None else get_job_index()
         
-        logger.debug(f"Found {len(all_jobs)} jobs in database")
+        logger.debug(f"Found {len(index.job_ids)} jobs in index")
         
-        if not all_jobs:
+        if index.is_empty:
             logger.warning("No jobs found in database")
             return []
             
-        # Prepare corpus for TF-IDF (resume + all job descriptions)
-        corpus = [self.preprocess_for_matching(resume_text)]
-        jobs_with_scores = []
+        skills = self.resume_skills(resume_text, resume_features)
+        fetch_n = self.fetch_size(top_n)
         
-        for job in all_jobs:
-            corpus.append(self.preprocess_for_matching(job['description']))
-            jobs_with_scores.append({
-                'job': dict(job),
-                'score': 0  # Will be updated with similarity score
-            })
-            
-        # Calculate TF-IDF vectors
+        # Only the resume is vectorised; job vectors come from the index
         try:
-            tfidf_matrix = self.vectorizer.fit_transform(corpus)
+            rows, text_scores = index.candidates(
+                self.preprocess_for_matching(resume_text),
+                skills if self.hybrid else None,
+                min_candidates=max(current_app.config.get('MATCH_MIN_CANDIDATES', 200), fetch_n)
+            )
         except ValueError as e:
-            print(f"Error in TF-IDF calculation: {e}")
+            logger.error(f"Error in TF-IDF calculation: {e}")
             return []
         
-        # Calculate cosine similarity between resume and all jobs
-        cosine_similarities = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:]).flatten()
+        return self.rank_candidates(index, rows, text_scores, dict(resume_features or {}, skills=skills), top_n, explain)
+    
+    def resume_skills(self, resume_text, resume_features=None):
+        # Skills drive the candidate prefilter; fall back to the taxonomy scan
+        if resume_features and resume_features.get('skills'):
+            return resume_features['skills']
+        return get_skill_matcher().extract(resume_text)
+    
+    def fetch_size(self, top_n):
+        # Over-fetch so collapsing near-duplicates still leaves top_n distinct jobs
+        return top_n * 3 if current_app.config.get('MATCH_COLLAPSE_DUPLICATES', True) else top_n
+    
+    def rank_candidates(self, index, rows, text_scores, resume_features, top_n=10, explain=False):
+        # Score candidate rows on every component and keep the best top_n distinct jobs;
+        # shared by rank_jobs and the batch matcher, which computes text_scores itself
+        fetch_n = self.fetch_size(top_n)
         
-        # Update similarity scores
-        for i, score in enumerate(cosine_similarities):
-            jobs_with_scores[i]['score'] = score
+        # Every component is scored for the whole candidate set at once
+        engine = ScoringEngine(index, current_app.config.get('MATCH_WEIGHTS'))
+        components, scores = engine.score(rows, text_scores, resume_features)
+        # Partially select the best N positions straight from the score vector
+        ranked = top_k(scores, fetch_n)
         
-        # Sort by similarity score (descending)
-        jobs_with_scores.sort(key=lambda x: x['score'], reverse=True)
+        matches = []
+        for position in ranked:
+            match = (int(index.job_ids[rows[position]]), float(scores[position]))
+            if explain:
+                match += ({name: float(values[position]) for name, values in components.items()},)
+            matches.append(match)
+        if current_app.config.get('MATCH_COLLAPSE_DUPLICATES', True):
+            return collapse_duplicates(get_db(), matches, top_n)
+        return matches[:top_n]
         
-        # Extract just the job data for the top N matches
-        job_matches = [item['job'] for item in jobs_with_scores[:top_n]]
+    def find_matches(self, resume_text, resume_features=None, top_n=10):
+        # Find matching jobs based on resume text and extracted features
+        top_ids = [job_id for job_id, *_ in self.rank_jobs(resume_text, resume_features, top_n)]
+        
+        # Only the top N rows are materialised from the database
+        job_matches = self.get_jobs_by_ids(top_ids)
         
-        logger.debug(f"Calculated {len(cosine_similarities)} similarity scores")
         logger.debug(f"Returning {len(job_matches)} job matches")
         
         return job_matches
         
+    def get_jobs_by_ids(self, job_ids):
+        # Retrieve several jobs by ID, preserving the order of job_ids
+        if not job_ids:
+            return []
+        db = get_db()
+        placeholders = ','.join('?' * len(job_ids))
+        rows = db.execute(
+            f'SELECT * FROM jobs WHERE id IN ({placeholders})', list(job_ids)
+        ).fetchall()
+        jobs_by_id = {row['id']: dict(row) for row in rows}
+        return [jobs_by_id[job_id] for job_id in job_ids if job_id in jobs_by_id]
+        
     def get_job_by_id(self, job_id):
         # Retrieve a specific job by ID
         db = get_db()
@@ -0,0 +1,135 @@
+import re
+from markupsafe import Markup, escape
+from app.models.skill_index import normalize_skill
+
+# BM25 column weights: title, company, description, location, skills_required
+BM25_WEIGHTS = (10.0, 4.0, 1.0, 2.0, 5.0)
+
+# Private-use markers around snippet matches, swapped for <mark> after escaping
+MATCH_START, MATCH_END = '\ue000', '\ue001'
+
+SEARCH_TERM = re.compile(r'\w+', re.UNICODE)
+
+RESULT_COLUMNS = 'j.id, j.title, j.company, j.location, j.source, j.posted_date, j.skills_required, j.required_years'
+
+def build_match_query(text):
+    """Turn free text into a safe FTS5 query: every word must match, the last as a prefix"""
+    terms = SEARCH_TERM.findall(text or '')
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+def _highlight(snippet):
+    return Markup(str(escape(snippet or '')).replace(MATCH_START, '<mark>').replace(MATCH_END, '</mark>'))
+
+def encode_cursor(values):
+    return '_'.join(repr(value) if isinstance(value, float) else str(value) for value in values)
+
+def decode_cursor(cursor, types):
+    """Parse a cursor made by encode_cursor; None if it is malformed"""
+    if not cursor:
+        return None
+    parts = cursor.rsplit('_', len(types) - 1)
+    if len(parts) != len(types):
+        return None
+    try:
+        return tuple(kind(part) for kind, part in zip(types, parts))
+    except ValueError:
+        return None
+
+def escape_like(text):
+    """Escape LIKE wildcards so user text matches literally, for use with ESCAPE '\\'"""
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def _filters(source, location, days, skill=None, max_years=None):
+    clauses, params = [], []
+    if source:
+        clauses.append('j.source = ?')
+        params.append(source)
+    if location:
+        clauses.append("j.location LIKE ? ESCAPE '\\'")
+        params.append(f'%{escape_like(location)}%')
+    if days:
+        clauses.append("date(j.posted_date) >= date('now', ?)")
+        params.append(f'-{int(days)} days')
+    # Feature filters are lookups on the columns and tables filled at ingestion
+    if skill:
+        clauses.append(
+            'j.id IN (SELECT js.job_id FROM job_skills js JOIN skills s ON s.id = js.skill_id WHERE s.name = ?)'
+        )
+        params.append(normalize_skill(skill))
+    if max_years is not None:
+        clauses.append('(j.required_years IS NULL OR j.required_years <= ?)')
+        params.append(max_years)
+    return clauses, params
+
+def search_jobs(db, text=None, source=None, location=None, days=None, limit=20, after=None,
+                skill=None, max_years=None):
+    """Search jobs, best match first, returning (jobs, cursor for the next page or None).
+
+    With search text, jobs are ranked by weighted BM25 over the FTS index;
+    without it, the newest postings matching the filters are listed. Pages
+    are keyset-paginated on (score, id) or (posted_date, id), so no page
+    re-reads the rows before it and none skips or repeats a job.
+    """
+    clauses, params = _filters(source, location, days, skill, max_years)
+    match_query = build_match_query(text)
+
+    if match_query:
+        position = decode_cursor(after, (float, int))
+        if position is not None:
+            clauses.append('(hits.score, hits.rowid) > (?, ?)')
+            params.extend(position)
+        weights = ', '.join(str(weight) for weight in BM25_WEIGHTS)
+        sql = (
+            f'SELECT {RESULT_COLUMNS}, hits.score, hits.snippet FROM ('
+            f'  SELECT rowid, bm25(jobs_fts, {weights}) AS score,'
+            f"  snippet(jobs_fts, 2, '{MATCH_START}', '{MATCH_END}', ' … ', 32) AS snippet"
+            '  FROM jobs_fts WHERE jobs_fts MATCH ?'
+            ') AS hits JOIN jobs j ON j.id = hits.rowid'
+        )
+        params = [match_query] + params
+        order = ' ORDER BY hits.score, hits.rowid'
+    else:
+        position = decode_cursor(after, (str, int))
+        if position is not None:
+            posted_date, job_id = position
+            # Undated jobs sort last; an empty date in the cursor means we are among them
+            if posted_date:
+                clauses.append('((j.posted_date, j.id) < (?, ?) OR j.posted_date IS NULL)')
+                params.extend(position)
+            else:
+                clauses.append('j.posted_date IS NULL AND j.id < ?')
+                params.append(job_id)
+        sql = (
+            f"SELECT {RESULT_COLUMNS}, NULL AS score, substr(COALESCE(j.description, ''), 1, 200) AS snippet"
+            ' FROM jobs j'
+        )
+        # Matches idx_jobs_posted_date, so pages are read straight off the index
+        order = ' ORDER BY j.posted_date DESC, j.id DESC'
+
+    if clauses:
+        sql += ' WHERE ' + ' AND '.join(clauses)
+    # One extra row tells whether another page exists
+    rows = db.execute(sql + order + ' LIMIT ?', params + [limit + 1]).fetchall()
+
+    jobs = []
+    for row in rows[:limit]:
+        job = dict(row)
+        job['snippet'] = _highlight(job['snippet'])
+        jobs.append(job)
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        if match_query:
+            next_cursor = encode_cursor((last['score'], last['id']))
+        else:
+            next_cursor = encode_cursor((last['posted_date'] or '', last['id']))
+    return jobs, next_cursor
+
+def get_sources(db):
+    """Distinct job sources, for the search filter"""
+    return [row[0] for row in db.execute('SELECT DISTINCT source FROM jobs WHERE source IS NOT NULL ORDER BY source')]
@@ -30,7 +30,8 @@ class ManualProcessor:
         return {
             'skills': self.manual_data['skills'],
             'education': self.manual_data['education'],
-            'years_of_experience': self.manual_data['years_of_experience']
+            'years_of_experience': self.manual_data['years_of_experience'],
+            'location': self.manual_data.get('location', '').strip()
         }
         
     def generate_text(self):
@@ -0,0 +1,60 @@
+import json
+import uuid
+from flask import current_app
+
+# Columns the dashboard needs; descriptions are cut to what the card shows
+SUMMARY_COLUMNS = "id, title, company, location, skills_required, substr(COALESCE(description, ''), 1, 201) AS description"
+
+def save_match_results(db, user_id, matches):
+    """Persist ranked (job_id, score) or (job_id, score, components) matches and return their match id"""
+    match_id = uuid.uuid4().hex
+    max_age = current_app.config.get('MATCH_RESULTS_MAX_AGE_DAYS', 7)
+    # Drop old results so the table does not grow without bound
+    db.execute(
+        "DELETE FROM match_results WHERE created < datetime('now', ?)",
+        (f'-{int(max_age)} days',)
+    )
+    db.execute(
+        'INSERT INTO match_results (id, user_id, matches) VALUES (?, ?, ?)',
+        (match_id, user_id, json.dumps([_encode_match(*match) for match in matches]))
+    )
+    db.commit()
+    return match_id
+
+def _encode_match(job_id, score, components=None):
+    if components is None:
+        return [job_id, round(score, 6)]
+    return [job_id, round(score, 6), {name: round(value, 4) for name, value in components.items()}]
+
+def get_match_results(db, match_id, user_id):
+    """Return the stored (job_id, score, components) matches, or None if unknown or not the user's"""
+    if not match_id:
+        return None
+    row = db.execute(
+        'SELECT matches FROM match_results WHERE id = ? AND user_id = ?', (match_id, user_id)
+    ).fetchone()
+    if row is None:
+        return None
+    # Results saved without components load with an empty breakdown
+    return [(match[0], match[1], match[2] if len(match) > 2 else {}) for match in json.loads(row['matches'])]
+
+def load_match_jobs(db, match_id, user_id):
+    """Fetch the dashboard fields of matched jobs in ranked order"""
+    matches = get_match_results(db, match_id, user_id)
+    if not matches:
+        return []
+    job_ids = [match[0] for match in matches]
+    placeholders = ','.join('?' * len(job_ids))
+    rows = db.execute(
+        f'SELECT {SUMMARY_COLUMNS} FROM jobs WHERE id IN ({placeholders})', job_ids
+    ).fetchall()
+    jobs_by_id = {row['id']: dict(row) for row in rows}
+
+    jobs = []
+    for job_id, score, components in matches:
+        job = jobs_by_id.get(job_id)
+        if job is not None:
+            job['score'] = score
+            job['score_components'] = components
+            jobs.append(job)
+    return jobs
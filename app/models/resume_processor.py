@@ -1,34 +1,10 @@
 import re
-import nltk
-import spacy
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from app.utils.text_extractor import extract_text
+from app.utils.extraction_service import get_extraction_service
+from app.utils.skill_matcher import get_skill_matcher
+from app.utils.nlp_models import get_stopwords, word_tokenize
 
-# Download necessary NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('punkt')
-    nltk.download('stopwords')
-
-# Initialize spaCy with better error handling
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("Downloading spaCy model...")
-    try:
-        import subprocess
-        result = subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"], 
-                              capture_output=True, text=True, check=True)
-        print(result.stdout)
-        nlp = spacy.load("en_core_web_sm")
-    except Exception as e:
-        print(f"Error installing spaCy model: {e}")
-        print("Please run: python -m spacy download en_core_web_sm")
-        # Fallback to basic processing if spaCy fails
-        nlp = None
+# Bump whenever extraction or evaluation changes so cached analyses are discarded
+EXTRACTOR_VERSION = 2
 
 class ResumeProcessor:
     def __init__(self, file_path):
@@ -40,7 +16,8 @@ class ResumeProcessor:
         
     def extract_text(self):
         """Extract text from resume file"""
-        self.text = extract_text(self.file_path)
+        # Parsing runs in the shared process pool with a per-file timeout
+        self.text = get_extraction_service().extract(self.file_path)
         # Preprocess text (lowercase, remove extra whitespace)
         if self.text:
             self.text = self.preprocess_text(self.text)
@@ -58,35 +35,16 @@ class ResumeProcessor:
     
     def remove_stopwords(self, text):
         """Remove common stopwords from text"""
-        stop_words = set(stopwords.words('english'))
+        # NLTK resources are loaded on first use rather than at import time
+        stop_words = get_stopwords()
         word_tokens = word_tokenize(text)
         filtered_text = [w for w in word_tokens if not w in stop_words]
         return ' '.join(filtered_text)
     
     def extract_skills(self):
         """Extract potential skills from resume text"""
-        # Common programming languages and technologies
-        common_skills = [
-            'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'ruby', 'php',
-            'html', 'css', 'sql', 'nosql', 'react', 'angular', 'vue', 'node', 'express',
-            'django', 'flask', 'spring', 'asp.net', 'jquery', 'bootstrap', 'tailwind',
-            'mongodb', 'mysql', 'postgresql', 'oracle', 'aws', 'azure', 'gcp', 'docker',
-            'kubernetes', 'jenkins', 'git', 'github', 'gitlab', 'jira', 'agile', 'scrum',
-            'machine learning', 'artificial intelligence', 'data science', 'nlp', 'neural networks',
-            'tensorflow', 'pytorch', 'keras', 'scikit-learn', 'pandas', 'numpy', 'tableau',
-            'power bi', 'excel', 'word', 'powerpoint', 'photoshop', 'illustrator', 'figma',
-            'ui/ux', 'mobile development', 'ios', 'android', 'react native', 'flutter', 'swift',
-            'kotlin', 'objective-c', 'devops', 'ci/cd', 'linux', 'windows', 'macos', 'unix',
-            'rest api', 'graphql', 'soap', 'microservices', 'testing', 'junit', 'selenium',
-            'cypress', 'jest', 'mocha', 'chai'
-        ]
-        
-        # Look for skills in resume text
-        skills = []
-        if self.text:
-            for skill in common_skills:
-                if re.search(r'\b' + re.escape(skill) + r'\b', self.text, re.IGNORECASE):
-                    skills.append(skill)
+        # Single pass over the text with the compiled skill taxonomy
+        skills = get_skill_matcher().extract(self.text) if self.text else []
                     
         self.skills = skills
         return skills
@@ -0,0 +1,115 @@
+import re
+import numpy as np
+from app.models.skill_index import normalize_skill
+from app.utils.job_features import degree_level
+
+# Relative weight of each score component; MATCH_WEIGHTS overrides any of them
+DEFAULT_WEIGHTS = {
+    'text': 0.45,
+    'skills': 0.3,
+    'experience': 0.1,
+    'education': 0.05,
+    'location': 0.1,
+}
+
+COMPONENTS = tuple(DEFAULT_WEIGHTS)
+
+LOCATION_WORD = re.compile(r'[a-z]+')
+REMOTE_TERM = 'remote'
+
+def location_terms(location):
+    """Lowercase words of a location, e.g. 'San Francisco, CA' -> {'san', 'francisco', 'ca'}"""
+    return set(LOCATION_WORD.findall((location or '').lower()))
+
+class ScoringEngine:
+    """Scores candidate jobs for a resume from several components at once.
+
+    Each component is an array over the whole candidate set, in [0, 1]:
+
+    - text: TF-IDF cosine similarity between resume and description
+    - skills: IDF-weighted Jaccard overlap of resume and job skills
+    - experience: 1 when the resume meets the stated requirement, decaying
+      with each missing year; jobs stating none count as met
+    - education: 1 when the resume's highest degree meets the job's, halving
+      for each level short; jobs asking for no degree count as met
+    - location: 1 for remote jobs, otherwise the share of the resume's
+      location words found in the job's location
+
+    The total is the weighted mean of the components that apply; experience,
+    education and location drop out when the resume does not state them.
+    Job-side inputs are read from arrays precomputed at ingestion time.
+    """
+
+    def __init__(self, index, weights=None):
+        self.index = index
+        self.weights = dict(DEFAULT_WEIGHTS)
+        self.weights.update(weights or {})
+
+    def score(self, rows, text_scores, resume_features=None):
+        """Return ({component: scores}, total) for index row positions"""
+        features = resume_features or {}
+        components = {'text': np.clip(np.asarray(text_scores, dtype=np.float64), 0.0, 1.0)}
+        components['skills'] = self.skill_scores(rows, features.get('skills') or [])
+        if features.get('years_of_experience'):
+            components['experience'] = self.experience_scores(rows, features['years_of_experience'])
+        if features.get('education'):
+            resume_degree = degree_level(' '.join(features['education']), highest=True)
+            if resume_degree:
+                components['education'] = self.education_scores(rows, resume_degree)
+        if features.get('location'):
+            components['location'] = self.location_scores(rows, features['location'])
+
+        total = np.zeros(len(rows))
+        weight_sum = 0.0
+        for name, scores in components.items():
+            weight = self.weights.get(name, 0.0)
+            if weight > 0:
+                total += weight * scores
+                weight_sum += weight
+        if weight_sum > 0:
+            total /= weight_sum
+        return components, total
+
+    def skill_scores(self, rows, skills):
+        skill_index = self.index.skills
+        weights = skill_index.idf()
+        wanted = {normalize_skill(skill) for skill in skills} - {''}
+        columns = [skill_index.vocabulary[skill] for skill in wanted if skill in skill_index.vocabulary]
+        if not wanted:
+            return np.zeros(len(rows))
+
+        # Skills no job lists get the highest weight, as if they appeared once
+        unseen_weight = skill_index.unseen_idf()
+        resume_weight = weights[columns].sum() + (len(wanted) - len(columns)) * unseen_weight
+        job_weight = skill_index.row_weights()[rows]
+        if columns:
+            shared = skill_index.matrix[rows][:, columns] @ weights[columns]
+        else:
+            shared = np.zeros(len(rows))
+        union = job_weight + resume_weight - shared
+        return np.divide(shared, union, out=np.zeros(len(rows)), where=union > 0)
+
+    def experience_scores(self, rows, years):
+        required = self.index.required_years[rows]
+        shortfall = np.clip(np.nan_to_num(required, nan=0.0) - float(years), 0.0, None)
+        return np.exp(-0.5 * shortfall)
+
+    def education_scores(self, rows, level):
+        shortfall = np.clip(self.index.degree_levels[rows].astype(np.float64) - level, 0.0, None)
+        return 0.5 ** shortfall
+    
+    def location_scores(self, rows, location):
+        locations = self.index.locations
+        wanted = location_terms(location)
+        columns = [locations.vocabulary[term] for term in wanted if term in locations.vocabulary]
+        if not wanted:
+            return np.zeros(len(rows))
+        matrix = locations.matrix[rows]
+        if columns:
+            scores = np.asarray(matrix[:, columns].sum(axis=1), dtype=np.float64).ravel() / len(wanted)
+        else:
+            scores = np.zeros(len(rows))
+        remote = locations.vocabulary.get(REMOTE_TERM)
+        if remote is not None:
+            scores = np.maximum(scores, matrix[:, remote].toarray().ravel())
+        return np.clip(scores, 0.0, 1.0)
@@ -0,0 +1,95 @@
+import re
+import numpy as np
+import scipy.sparse as sp
+from app.utils.skill_matcher import get_skill_matcher
+
+def normalize_skill(skill):
+    """Lowercase a skill name and collapse internal whitespace"""
+    return re.sub(r'\s+', ' ', skill or '').strip().lower()
+
+def extract_job_skills(description, skills_required=None):
+    """Skills listed in skills_required plus taxonomy skills found in the description"""
+    skills = set(get_skill_matcher().extract(description or ''))
+    for skill in (skills_required or '').split(','):
+        skill = normalize_skill(skill)
+        if skill:
+            skills.add(skill)
+    return skills
+
+class SkillIndex:
+    """Inverted index from normalised skills to job rows.
+
+    Rows are aligned with the rows of the owning JobIndex; columns are skills.
+    New skills simply add columns, so it never needs refitting.
+    """
+
+    def __init__(self, terms=None, matrix=None):
+        self.terms = list(terms or [])
+        self.vocabulary = {term: i for i, term in enumerate(self.terms)}
+        self.matrix = matrix if matrix is not None else sp.csr_matrix((0, len(self.terms)), dtype=np.int8)
+        self._by_skill = None
+        self._idf = None
+        self._row_weights = None
+
+    @classmethod
+    def build(cls, skill_sets):
+        index = cls()
+        index.append(skill_sets)
+        return index
+
+    def append(self, skill_sets):
+        """Add one row per skill set, growing the vocabulary as needed"""
+        indptr = [0]
+        indices = []
+        for skills in skill_sets:
+            for skill in skills:
+                column = self.vocabulary.get(skill)
+                if column is None:
+                    column = self.vocabulary[skill] = len(self.terms)
+                    self.terms.append(skill)
+                indices.append(column)
+            indptr.append(len(indices))
+
+        new_rows = sp.csr_matrix(
+            (np.ones(len(indices), dtype=np.int8), indices, indptr),
+            shape=(len(indptr) - 1, len(self.terms))
+        )
+        matrix = self.matrix.tocsr(copy=True)
+        matrix.resize((matrix.shape[0], len(self.terms)))
+        self.matrix = sp.vstack([matrix, new_rows], format='csr')
+        self._by_skill = None
+        self._idf = None
+        self._row_weights = None
+
+    def copy(self):
+        return SkillIndex(self.terms, self.matrix)
+
+    def select_rows(self, mask):
+        return SkillIndex(self.terms, self.matrix[mask])
+
+    def idf(self):
+        """Smoothed inverse document frequency of each term, rarer terms weighing more"""
+        if self._idf is None:
+            document_frequency = np.asarray(self.matrix.getnnz(axis=0), dtype=np.float64)
+            self._idf = np.log((self.matrix.shape[0] + 1) / (document_frequency + 1)) + 1
+        return self._idf
+
+    def unseen_idf(self):
+        """IDF of a term that no row has"""
+        return np.log(self.matrix.shape[0] + 1) + 1
+
+    def row_weights(self):
+        """Summed IDF of each row's terms"""
+        if self._row_weights is None:
+            self._row_weights = self.matrix @ self.idf()
+        return self._row_weights
+
+    def lookup(self, skills):
+        """Row positions of jobs sharing at least one of skills"""
+        columns = [self.vocabulary[skill] for skill in {normalize_skill(s) for s in skills} if skill in self.vocabulary]
+        if not columns:
+            return np.empty(0, dtype=np.intp)
+        if self._by_skill is None:
+            # Column-major copy so each skill's posting list is a contiguous slice
+            self._by_skill = self.matrix.tocsc()
+        return np.unique(self._by_skill[:, columns].indices).astype(np.intp)
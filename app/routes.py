@@ -1,14 +1,19 @@
 import os
 import uuid
 from flask import (
-    Blueprint, flash, redirect, render_template, request, url_for, current_app, session
+    Blueprint, flash, redirect, render_template, request, url_for, current_app, session, jsonify
 )
 from werkzeug.utils import secure_filename
 from flask_login import login_required, current_user
 
 from app.utils import db_utils
-from app.models.resume_processor import ResumeProcessor
 from app.models.job_matcher import JobMatcher
+from app.models.job_index import update_job_index
+from app.models.match_store import save_match_results, load_match_jobs
+from app.models.job_search import search_jobs, get_sources
+from app.utils.job_ingest import ingest_jobs
+from app.utils.cache import cached, cache_stats
+from app.utils.task_queue import get_task_queue
 from app.auth import admin_required
 
 bp = Blueprint('main', __name__)
@@ -55,27 +60,12 @@ def upload_resume():
                 
                 current_app.logger.info(f"File saved at: {file_path}")
                 
-                # Process resume
-                resume_processor = ResumeProcessor(file_path)
-                resume_text = resume_processor.extract_text()
-                resume_features = resume_processor.extract_features()
-                
-                # Evaluate resume quality
-                resume_quality = resume_processor.evaluate_resume()
-                
-                # Store in session
+                # Analysis and matching run on a task worker; the dashboard waits for them
+                task_id = get_task_queue().enqueue(
+                    'process_resume', {'file_path': file_path, 'user_id': current_user.id}, user_id=current_user.id
+                )
                 session.permanent = True
-                session['resume_text'] = resume_text
-                session['resume_features'] = resume_features
-                session['resume_path'] = file_path
-                session['resume_quality'] = resume_quality
-                
-                # Match with jobs
-                job_matcher = JobMatcher()
-                job_matches = job_matcher.find_matches(resume_text, resume_features)
-                
-                # Store match results in session
-                session['job_matches'] = job_matches
+                session['resume_task_id'] = task_id
                 
                 return redirect(url_for('main.dashboard'))
                 
@@ -103,6 +93,7 @@ def manual_entry():
                 'years_of_experience': int(request.form.get('years_experience', 0)),
                 'job_title': request.form.get('job_title', ''),
                 'industry': request.form.get('industry', ''),
+                'location': request.form.get('location', ''),
                 'summary': request.form.get('summary', '')
             }
             
@@ -117,15 +108,15 @@ def manual_entry():
             
             # Store in session
             session.permanent = True
-            session['resume_text'] = resume_text
             session['resume_features'] = resume_features
             session['data_source'] = 'manual'
+            session.pop('resume_task_id', None)
             session['resume_quality'] = resume_quality
             
             # Match with jobs
             job_matcher = JobMatcher()
-            job_matches = job_matcher.find_matches(resume_text, resume_features)
-            session['job_matches'] = job_matches
+            job_matches = job_matcher.rank_jobs(resume_text, resume_features, explain=True)
+            session['match_id'] = save_match_results(db_utils.get_db(), current_user.id, job_matches)
             
             return redirect(url_for('main.dashboard'))
             
@@ -139,12 +130,25 @@ def manual_entry():
 @bp.route('/dashboard')
 @login_required
 def dashboard():
-    # Retrieve saved job matches from session
-    job_matches = session.get('job_matches', [])
+    # A resume upload still being processed shows a progress page until it finishes
+    task_id = session.get('resume_task_id')
+    if task_id:
+        resume_task = _own_task(task_id)
+        if resume_task and resume_task['status'] in ('queued', 'running'):
+            return render_template('processing.html', task_id=task_id)
+        session.pop('resume_task_id', None)
+        if resume_task is None or resume_task['status'] == 'failed':
+            error = resume_task['error'] if resume_task else 'task not found'
+            flash(f"Error processing resume: {error}")
+            return redirect(url_for('main.upload_resume'))
+        _apply_resume_result(resume_task['result'])
+    
+    # Retrieve saved job matches referenced from the session
+    job_matches = load_match_jobs(db_utils.get_db(), session.get('match_id'), current_user.id)
     resume_features = session.get('resume_features', {})
     resume_quality = session.get('resume_quality', None)
     
-    current_app.logger.info(f"Dashboard accessed. Found {len(job_matches)} job matches in session")
+    current_app.logger.info(f"Dashboard accessed. Found {len(job_matches)} job matches for session")
     
     if not job_matches:
         flash('Please upload your resume first')
@@ -152,11 +156,37 @@ def dashboard():
         
     return render_template('dashboard.html', job_matches=job_matches, resume_features=resume_features, resume_quality=resume_quality)
 
+def _own_task(task_id):
+    resume_task = get_task_queue().get(task_id)
+    if resume_task is None or resume_task['user_id'] != current_user.id:
+        return None
+    return resume_task
+
+def _apply_resume_result(result):
+    # Store in session
+    session.permanent = True
+    session['resume_features'] = result['resume_features']
+    session['resume_path'] = result['resume_path']
+    session['resume_quality'] = result['resume_quality']
+    session['match_id'] = result['match_id']
+
+@bp.route('/tasks/<task_id>')
+@login_required
+def task_status(task_id):
+    """Status of a background task, polled by the processing page"""
+    resume_task = _own_task(task_id)
+    if resume_task is None:
+        return jsonify(error='Task not found'), 404
+    return jsonify(id=resume_task['id'], status=resume_task['status'], error=resume_task['error'])
+
 @bp.route('/job/<int:job_id>')
 @login_required
 def job_detail(job_id):
-    db = db_utils.get_db()
-    job = db.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+    def load_job():
+        row = db_utils.get_db().execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return dict(row) if row else None
+    
+    job = cached('jobs', job_id, load_job)
     
     if job is None:
         flash('Job not found')
@@ -167,6 +197,36 @@ def job_detail(job_id):
     
     return render_template('job_detail.html', job=job, resume_features=resume_features)
 
+@bp.route('/search')
+@login_required
+def search():
+    """Full-text job search with source, location and date filters"""
+    query = request.args.get('q', '').strip()
+    source = request.args.get('source') or None
+    location = request.args.get('location', '').strip() or None
+    days = request.args.get('days', type=int)
+    skill = request.args.get('skill', '').strip() or None
+    max_years = request.args.get('max_years', type=int)
+    after = request.args.get('after')
+    
+    db = db_utils.get_db()
+    jobs, next_cursor = search_jobs(
+        db, query, source=source, location=location, days=days,
+        limit=current_app.config.get('SEARCH_PAGE_SIZE', 20), after=after,
+        skill=skill, max_years=max_years
+    )
+    
+    if request.args.get('format') == 'json':
+        for job in jobs:
+            job['snippet'] = str(job['snippet'])
+        return jsonify(jobs=jobs, next=next_cursor)
+    
+    filters = {'q': query, 'source': source, 'location': location, 'days': days, 'skill': skill, 'max_years': max_years}
+    next_url = None
+    if next_cursor:
+        next_url = url_for('main.search', after=next_cursor, **{k: v for k, v in filters.items() if v is not None and v != ''})
+    return render_template('search.html', jobs=jobs, filters=filters, sources=get_sources(db), next_url=next_url)
+
 @bp.route('/admin/upload_jobs', methods=('GET', 'POST'))
 @login_required
 @admin_required
@@ -192,13 +252,22 @@ def upload_jobs():
             flash(error)
         else:
             db = db_utils.get_db()
-            db.execute(
-                'INSERT INTO jobs (title, company, description, location, skills_required, application_link)'
-                ' VALUES (?, ?, ?, ?, ?, ?)',
-                (title, company, description, location, skills_required, application_link)
-            )
-            db.commit()
-            flash('Job added successfully!')
+            result = ingest_jobs(db, [{
+                'title': title,
+                'company': company,
+                'description': description,
+                'location': location,
+                'skills_required': skills_required,
+                'application_link': application_link,
+            }])
+            # A refit, if one is due, runs on the task queue instead of in this request
+            update_job_index(result.changed_ids, db=db, defer_refit=True)
+            if result.inserted:
+                flash('Job added successfully!')
+            elif result.updated:
+                flash('Job already listed; its details were updated.')
+            else:
+                flash('Job is already listed.')
             return redirect(url_for('main.upload_jobs'))
             
     # Get a list of existing jobs to display
@@ -206,6 +275,13 @@ def upload_jobs():
     jobs = db.execute('SELECT id, title, company FROM jobs ORDER BY id DESC').fetchall()
     return render_template('admin/upload_jobs.html', jobs=jobs)
 
+@bp.route('/admin/cache_stats')
+@login_required
+@admin_required
+def cache_stats_view():
+    """Hit and miss counters of this process's caches"""
+    return jsonify(cache_stats())
+
 @bp.route('/profile')
 @login_required
 def profile():
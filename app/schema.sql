@@ -1,11 +1,8 @@
 -- Schema for FitHire AI database
-
--- Drop existing tables (if they exist)
-DROP TABLE IF EXISTS jobs;
-DROP TABLE IF EXISTS users;
+-- This is migration 1; later changes live in app/utils/migrations.py
 
 -- Create users table
-CREATE TABLE users (
+CREATE TABLE IF NOT EXISTS users (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     username TEXT UNIQUE NOT NULL,
     email TEXT UNIQUE NOT NULL,
@@ -15,7 +12,7 @@ CREATE TABLE users (
 );
 
 -- Create jobs table
-CREATE TABLE jobs (
+CREATE TABLE IF NOT EXISTS jobs (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     title TEXT NOT NULL,
     company TEXT,
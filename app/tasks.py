@@ -0,0 +1,55 @@
+from flask import current_app
+from app.utils.db_utils import get_db
+from app.utils.task_queue import task
+from app.utils.resume_cache import get_resume_cache, file_content_hash
+from app.models.resume_processor import ResumeProcessor
+from app.models.job_matcher import JobMatcher
+from app.models.match_store import save_match_results
+from app.models.job_index import build_job_index, get_job_index, index_needs_refit, index_write_lock
+
+@task('process_resume')
+def process_resume(payload):
+    """Analyse an uploaded resume and store its job matches"""
+    file_path = payload['file_path']
+
+    # Reuse the analysis of a previous upload with identical content
+    db = get_db()
+    resume_cache = get_resume_cache()
+    content_hash = file_content_hash(file_path)
+    analysis = resume_cache.get(content_hash, db)
+
+    if analysis is None:
+        resume_processor = ResumeProcessor(file_path)
+        analysis = {
+            'text': resume_processor.extract_text(),
+            'features': resume_processor.extract_features(),
+            # Evaluate resume quality
+            'quality': resume_processor.evaluate_resume()
+        }
+        resume_cache.put(content_hash, analysis, db)
+    else:
+        current_app.logger.info(f"Resume cache hit for {content_hash}")
+
+    # Match with jobs
+    job_matcher = JobMatcher()
+    job_matches = job_matcher.rank_jobs(analysis['text'], analysis['features'], explain=True)
+
+    # The session is only reachable from a request, so the caller copies these into it
+    return {
+        'match_id': save_match_results(db, payload['user_id'], job_matches),
+        'resume_features': analysis['features'],
+        'resume_quality': analysis['quality'],
+        'resume_path': file_path,
+    }
+
+@task('refit_job_index')
+def refit_job_index(payload):
+    """Refit the job index queued by an update that found too much drift"""
+    with index_write_lock():
+        index = get_job_index()
+        # Another refit may have run since this one was queued; an index
+        # without a vocabulary is one whose file was missing or unreadable
+        if index.vectorizer is not None and not index_needs_refit(index):
+            return {'refitted': False, 'jobs': len(index.job_ids)}
+        index = build_job_index()
+    return {'refitted': True, 'jobs': len(index.job_ids)}
@@ -1,60 +1,139 @@
+import random
+import threading
 import requests
 from abc import ABC, abstractmethod
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 import time
+from .rate_limiter import HostRateLimiter
+from .browser_pool import get_browser_pool, DEFAULT_USER_AGENT
+
+# Concrete scrapers by source name, filled in as subclasses are defined
+SCRAPERS = {}
 
 class BaseScraper(ABC):
-    def __init__(self):
+    # Stored in jobs.source and used to key scrape checkpoints and the registry
+    source_name = None
+    
+    # Concurrency and politeness defaults; subclasses or callers may override
+    requires_browser = False  # Plain HTTP unless the source only renders with JavaScript
+    max_parallel_queries = 2  # Keyword queries run at once against this source
+    job_budget = None  # Most result cards read from this source per scheduler run
+    max_workers = 8
+    requests_per_second = 2.0
+    burst = 2
+    max_retries = 3
+    request_timeout = 15
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Any subclass declaring its own source name becomes available to the registry
+        if 'source_name' in cls.__dict__ and cls.source_name:
+            SCRAPERS[cls.source_name] = cls
+    
+    def __init__(self, max_workers=None, requests_per_second=None, browser_pool=None):
         self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            'User-Agent': DEFAULT_USER_AGENT
         }
-        self.driver = None
-    
-    def setup_driver(self):
-        """Setup Selenium WebDriver with proper options"""
-        chrome_options = Options()
-        chrome_options.add_argument('--headless')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument(f'user-agent={self.headers["User-Agent"]}')
+        # Browser sessions come from a shared pool, and only when a source asks for one
+        self.browser_pool = browser_pool
+        if max_workers is not None:
+            self.max_workers = max_workers
+        if requests_per_second is not None:
+            self.requests_per_second = requests_per_second
         
-        try:
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            return True
-        except Exception as e:
-            print(f"Error setting up WebDriver: {e}")
-            return False
+        # One pooled session shared by every worker thread
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # Requests are throttled per host, not per job card
+        self.rate_limiter = HostRateLimiter(self.requests_per_second, self.burst)
+        
+        # Request counters, shared by every thread using this scraper
+        self.stats = {'requests': 0, 'request_errors': 0, 'known_skipped': 0}
+        self._stats_lock = threading.Lock()
+        
+        # Set to a KnownPostings to skip postings that are already stored
+        self.known_postings = None
     
-    def quit_driver(self):
-        """Safely quit WebDriver"""
-        if self.driver:
-            try:
-                self.driver.quit()
-            except:
-                pass
-            self.driver = None
+    @contextmanager
+    def browser(self):
+        """Borrow a browser session from the pool for pages that need JavaScript"""
+        if not self.requires_browser:
+            raise RuntimeError(f"{type(self).__name__} does not declare requires_browser")
+        pool = self.browser_pool or get_browser_pool()
+        with pool.session() as driver:
+            yield driver
     
     def make_request(self, url, params=None):
-        """Make HTTP request with retry logic"""
-        max_retries = 3
-        for attempt in range(max_retries):
+        """Make HTTP request through the pooled session with retry and jitter"""
+        for attempt in range(self.max_retries):
+            self.rate_limiter.acquire(url)
+            self._count('requests')
             try:
-                response = requests.get(url, params=params, headers=self.headers)
+                response = self.session.get(url, params=params, timeout=self.request_timeout)
                 response.raise_for_status()
                 return response
             except Exception as e:
-                if attempt == max_retries - 1:
+                self._count('request_errors')
+                if attempt == self.max_retries - 1 or not self._is_retryable(e):
                     raise e
-                time.sleep(2 ** attempt)
+                # Full jitter keeps concurrent workers from retrying in lockstep
+                time.sleep(random.uniform(0, 2 ** attempt))
+    
+    def _count(self, key, amount=1):
+        with self._stats_lock:
+            self.stats[key] += amount
+    
+    def result_order(self):
+        """How search results are sorted; checkpoints only resume a query in the same order"""
+        return None
+    
+    def filter_known(self, jobs):
+        """Drop jobs whose posting is already stored, before their details are fetched"""
+        if self.known_postings is None:
+            return jobs
+        # Links are only recorded once their jobs are ingested, so a failed fetch is retried next run
+        new_jobs = [job for job in jobs if job.get('application_link') not in self.known_postings]
+        self._count('known_skipped', len(jobs) - len(new_jobs))
+        return new_jobs
+    
+    @staticmethod
+    def _is_retryable(error):
+        # Client errors other than rate limiting will not succeed on a retry
+        response = getattr(error, 'response', None)
+        if response is not None and 400 <= response.status_code < 500:
+            return response.status_code == 429
+        return True
+    
+    def map_concurrently(self, func, items):
+        """Apply func to items on a bounded thread pool, preserving order"""
+        items = list(items)
+        if not items:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as executor:
+            return list(executor.map(func, items))
     
     @abstractmethod
-    def scrape_jobs(self, keywords, location, num_jobs=10):
+    def iter_pages(self, keywords, location, num_jobs=10, start_offset=0):
+        """Yield (next_offset, jobs) per results page, starting at start_offset.
+        
+        num_jobs and the offsets count result cards consumed, including cards
+        that failed to parse or were skipped as known, so next_offset minus
+        the previous offset is the progress a page made towards num_jobs.
+        """
         pass
     
-    def __del__(self):
-        self.quit_driver()
+    def scrape_jobs(self, keywords, location, num_jobs=10):
+        """Collect every page into one list; prefer iter_pages for long scrapes"""
+        jobs = []
+        try:
+            for _, page_jobs in self.iter_pages(keywords, location, num_jobs):
+                jobs.extend(page_jobs)
+        except Exception as e:
+            print(f"Error in {self.source_name} scraping: {e}")
+        return jobs
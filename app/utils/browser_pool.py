@@ -0,0 +1,173 @@
+import os
+import time
+import atexit
+import logging
+import threading
+from contextlib import contextmanager
+from flask import current_app, has_app_context
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+class BrowserPoolClosed(RuntimeError):
+    pass
+
+class ChromeDriverFactory:
+    """Starts headless Chrome sessions, resolving the chromedriver binary only once.
+
+    The binary is taken from driver_path or CHROMEDRIVER_PATH when set;
+    otherwise webdriver-manager downloads it on first use and the path is
+    reused by every later session in the process.
+    """
+
+    _resolved_path = None
+    _resolve_lock = threading.Lock()
+
+    def __init__(self, driver_path=None, user_agent=DEFAULT_USER_AGENT):
+        self.driver_path = driver_path or os.environ.get('CHROMEDRIVER_PATH')
+        self.user_agent = user_agent
+
+    def resolve_driver_path(self):
+        if self.driver_path:
+            return self.driver_path
+        with ChromeDriverFactory._resolve_lock:
+            if ChromeDriverFactory._resolved_path is None:
+                from webdriver_manager.chrome import ChromeDriverManager
+                ChromeDriverFactory._resolved_path = ChromeDriverManager().install()
+            return ChromeDriverFactory._resolved_path
+
+    def __call__(self):
+        # Selenium is only imported by sources that really render pages
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver.chrome.options import Options
+
+        chrome_options = Options()
+        chrome_options.add_argument('--headless')
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+        chrome_options.add_argument('--disable-gpu')
+        chrome_options.add_argument(f'user-agent={self.user_agent}')
+        return webdriver.Chrome(service=Service(self.resolve_driver_path()), options=chrome_options)
+
+class BrowserPool:
+    """Bounded pool of browser sessions, started lazily and reused across scrapers.
+
+    factory is any callable returning an object with quit(), so tests can
+    pass a fake driver. Sessions are only started when acquired and no idle
+    one is available; at most max_size exist at once and further callers
+    wait. close() quits idle sessions immediately and busy ones as they are
+    released.
+    """
+
+    def __init__(self, factory=None, max_size=2, acquire_timeout=120):
+        self.factory = factory or ChromeDriverFactory()
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self._idle = []
+        self._created = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    @property
+    def size(self):
+        """Sessions currently started, idle or in use"""
+        return self._created
+
+    @property
+    def idle_count(self):
+        return len(self._idle)
+
+    def acquire(self, timeout=None):
+        timeout = self.acquire_timeout if timeout is None else timeout
+        # One deadline for the whole call; wakeups that find no free session must not restart the wait
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise BrowserPoolClosed('Browser pool is closed')
+                if self._idle:
+                    return self._idle.pop()
+                if self._created < self.max_size:
+                    # Reserve the slot, then start the browser outside the lock
+                    self._created += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._condition.wait(remaining):
+                    raise TimeoutError(f'No browser session became free within {timeout}s')
+
+        try:
+            return self.factory()
+        except Exception:
+            with self._condition:
+                self._created -= 1
+                self._condition.notify()
+            raise
+
+    def release(self, driver, discard=False):
+        """Return a session to the pool; discard it when it may be in a bad state"""
+        with self._condition:
+            if not discard and not self._closed:
+                self._idle.append(driver)
+                self._condition.notify()
+                return
+            self._created -= 1
+            self._condition.notify()
+        self._quit(driver)
+
+    @contextmanager
+    def session(self, timeout=None):
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        except Exception:
+            self.release(driver, discard=True)
+            raise
+        else:
+            self.release(driver)
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+            self._condition.notify_all()
+        for driver in idle:
+            self._quit(driver)
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"Error quitting browser session: {e}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_browser_pool():
+    """Process-wide pool shared by every scraper that needs a browser"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            size = current_app.config.get('BROWSER_POOL_SIZE', 2) if has_app_context() else 2
+            driver_path = current_app.config.get('CHROMEDRIVER_PATH') if has_app_context() else None
+            _pool = BrowserPool(ChromeDriverFactory(driver_path), max_size=size)
+            # A safety net only; owners should call shutdown_browser_pool explicitly
+            atexit.register(shutdown_browser_pool)
+        return _pool
+
+def shutdown_browser_pool():
+    """Quit every pooled browser; the next get_browser_pool starts a fresh pool"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
@@ -0,0 +1,260 @@
+import os
+import time
+import pickle
+import sqlite3
+import logging
+import threading
+import click
+from collections import OrderedDict
+from flask import current_app, has_app_context
+from flask.cli import with_appcontext
+from .db_pool import ConnectionPool
+
+logger = logging.getLogger(__name__)
+
+MISSING = object()
+
+class MemoryBackend:
+    """Per-process LRU store with per-entry expiry"""
+
+    shared = False
+
+    def __init__(self, max_items=10000):
+        self.max_items = max_items
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            value, expires = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_items:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self, prefix=''):
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
+
+class SQLiteBackend:
+    """Store shared by every process on the host through one SQLite file.
+
+    A local stand-in for Redis: an invalidation from any process (a web
+    worker, the scraper) is seen by all the others. Values are pickled, so
+    only point it at a file this app owns. Hits stay read-only, which makes
+    eviction oldest-written first rather than strictly least recently used.
+    """
+
+    shared = True
+
+    def __init__(self, path, max_items=10000):
+        self.path = path
+        self.max_items = max_items
+        self.evictions = 0
+        self._pool = ConnectionPool(path, busy_timeout=2.0)
+        self._writes = 0
+        db = self._pool.connection()
+        db.execute(
+            'CREATE TABLE IF NOT EXISTS cache_entries ('
+            ' key TEXT PRIMARY KEY,'
+            ' value BLOB NOT NULL,'
+            ' expires REAL NOT NULL,'
+            ' stored REAL NOT NULL)'
+        )
+        db.execute('CREATE INDEX IF NOT EXISTS idx_cache_entries_stored ON cache_entries(stored)')
+        db.commit()
+
+    def get(self, key):
+        row = self._pool.connection().execute(
+            'SELECT value, expires FROM cache_entries WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None or row['expires'] <= time.time():
+            return MISSING
+        return pickle.loads(row['value'])
+
+    def set(self, key, value, ttl):
+        now = time.time()
+        db = self._pool.connection()
+        db.execute(
+            'INSERT OR REPLACE INTO cache_entries (key, value, expires, stored) VALUES (?, ?, ?, ?)',
+            (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), now + ttl, now)
+        )
+        # Trim now and then rather than on every write
+        self._writes += 1
+        if self._writes % 100 == 0:
+            self._trim(db, now)
+        db.commit()
+
+    def _trim(self, db, now):
+        db.execute('DELETE FROM cache_entries WHERE expires <= ?', (now,))
+        excess = db.execute('SELECT COUNT(*) FROM cache_entries').fetchone()[0] - self.max_items
+        if excess > 0:
+            db.execute(
+                'DELETE FROM cache_entries WHERE key IN'
+                ' (SELECT key FROM cache_entries ORDER BY stored LIMIT ?)', (excess,)
+            )
+            self.evictions += excess
+
+    def delete(self, keys):
+        db = self._pool.connection()
+        db.executemany('DELETE FROM cache_entries WHERE key = ?', [(key,) for key in keys])
+        db.commit()
+
+    def clear(self, prefix=''):
+        db = self._pool.connection()
+        db.execute("DELETE FROM cache_entries WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+        db.commit()
+
+    def __len__(self):
+        return self._pool.connection().execute('SELECT COUNT(*) FROM cache_entries').fetchone()[0]
+
+class Cache:
+    """Read-through cache for one kind of record, in its own key namespace.
+
+    Loader results of None are not cached, so a missing row is looked up
+    again next time instead of hiding a later insert. Backend errors are
+    logged and fall through to the loader; the cache never breaks a request.
+    """
+
+    def __init__(self, name, backend, ttl=300):
+        self.name = name
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def _key(self, key):
+        return f'{self.name}:{key}'
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get_or_load(self, key, loader):
+        try:
+            value = self.backend.get(self._key(key))
+        except sqlite3.Error as e:
+            logger.warning(f"Error reading {self.name} cache: {e}")
+            self._count('errors')
+            value = MISSING
+        if value is not MISSING:
+            self._count('hits')
+            return value
+
+        self._count('misses')
+        value = loader()
+        if value is not None:
+            try:
+                self.backend.set(self._key(key), value, self.ttl)
+            except sqlite3.Error as e:
+                logger.warning(f"Error writing {self.name} cache: {e}")
+                self._count('errors')
+        return value
+
+    def invalidate(self, keys):
+        keys = [self._key(key) for key in keys]
+        if keys:
+            self.backend.delete(keys)
+
+    def clear(self):
+        self.backend.clear(self._key(''))
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'errors': self.errors,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+            'ttl_seconds': self.ttl,
+        }
+
+# Caches created for every app: job rows by id and users by id
+CACHE_NAMES = ('jobs', 'users')
+
+def create_backend(config):
+    kind = config.get('CACHE_BACKEND', 'memory')
+    max_items = config.get('CACHE_MAX_ITEMS', 10000)
+    if kind == 'memory':
+        return MemoryBackend(max_items)
+    if kind == 'sqlite':
+        path = config.get('CACHE_PATH') or os.path.splitext(config['DATABASE'])[0] + '.cache.db'
+        return SQLiteBackend(path, max_items)
+    raise ValueError(f"Unknown CACHE_BACKEND {kind!r}; expected 'memory' or 'sqlite'")
+
+def cached(name, key, loader):
+    """loader() through the current app's cache called name, or directly when caching is off"""
+    cache = current_app.extensions.get('caches', {}).get(name)
+    if cache is None:
+        return loader()
+    return cache.get_or_load(key, loader)
+
+def invalidate(name, keys):
+    """Drop entries from a named cache; a no-op outside an app with caching set up"""
+    if not has_app_context():
+        return
+    cache = current_app.extensions.get('caches', {}).get(name)
+    if cache is not None:
+        try:
+            cache.invalidate(list(keys))
+        except sqlite3.Error as e:
+            logger.error(f"Error invalidating {name} cache: {e}")
+
+def clear_caches():
+    """Empty every cache of the current app"""
+    for cache in current_app.extensions.get('caches', {}).values():
+        cache.clear()
+
+def cache_stats(app=None):
+    app = app or current_app
+    caches = app.extensions.get('caches', {})
+    if not caches:
+        return {}
+    backend = next(iter(caches.values())).backend
+    return {
+        'backend': type(backend).__name__,
+        'shared': backend.shared,
+        'entries': len(backend),
+        'evictions': backend.evictions,
+        'caches': {name: cache.stats() for name, cache in caches.items()},
+    }
+
+@click.command('cache-clear')
+@with_appcontext
+def cache_clear_command():
+    """Empty the job and user caches."""
+    clear_caches()
+    click.echo('Caches cleared.')
+
+def init_app(app):
+    """Create the app's caches; every cache shares one backend"""
+    app.cli.add_command(cache_clear_command)
+    if not app.config.get('CACHE_ENABLED', True):
+        return
+    backend = create_backend(app.config)
+    ttl = app.config.get('CACHE_TTL', 300)
+    app.extensions['caches'] = {name: Cache(name, backend, ttl) for name in CACHE_NAMES}
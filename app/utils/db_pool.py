@@ -0,0 +1,68 @@
+import sqlite3
+import threading
+
+# Applied to every new connection. WAL lets readers run alongside a writer;
+# NORMAL sync is durable across application crashes in WAL mode.
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'temp_store': 'MEMORY',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -32000,  # Negative values are KiB, so about 32MB of page cache
+}
+
+def connect(database, pragmas=None, busy_timeout=5.0, cached_statements=256):
+    """Open a tuned SQLite connection returning sqlite3.Row rows"""
+    # The timeout doubles as SQLite's busy timeout: wait for a writer's lock instead of failing
+    db = sqlite3.connect(
+        database,
+        detect_types=sqlite3.PARSE_DECLTYPES,
+        timeout=busy_timeout,
+        cached_statements=cached_statements
+    )
+    db.row_factory = sqlite3.Row
+    for name, value in (DEFAULT_PRAGMAS if pragmas is None else pragmas).items():
+        db.execute(f'PRAGMA {name} = {value}')
+    return db
+
+class ConnectionPool:
+    """One long-lived connection per thread for a database file.
+
+    Connections are reused across requests, so pragmas are applied once and
+    sqlite3's per-connection statement cache keeps frequent queries
+    prepared. SQLite connections may not cross threads, which is why the
+    pool is thread-local rather than a shared queue.
+    """
+
+    def __init__(self, database, pragmas=None, busy_timeout=5.0, cached_statements=256):
+        self.database = database
+        self.pragmas = pragmas
+        self.busy_timeout = busy_timeout
+        self.cached_statements = cached_statements
+        # Thread-local, so a connection is closed when its thread goes away
+        self._local = threading.local()
+
+    def connection(self):
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = connect(self.database, self.pragmas, self.busy_timeout, self.cached_statements)
+            self._local.db = db
+        return db
+
+    def release(self, db):
+        """Hand a connection back after a request; unfinished transactions are rolled back"""
+        if db.in_transaction:
+            db.rollback()
+
+    def discard(self):
+        """Close this thread's connection, e.g. after an error left it unusable"""
+        db = getattr(self._local, 'db', None)
+        if db is not None:
+            self._local.db = None
+            db.close()
+
+    def close_all(self):
+        """Close this thread's connection and drop every other thread's"""
+        self.discard()
+        # Connections of other threads cannot be closed from here; they close when collected
+        self._local = threading.local()
@@ -1,19 +1,45 @@
-import sqlite3
 import click
 from flask import current_app, g
 from flask.cli import with_appcontext
 import os
 from datetime import datetime, timedelta
 from .job_scraper import JobScraper
+from .job_ingest import ingest_jobs
+from .db_pool import ConnectionPool, connect
+from .cache import invalidate, clear_caches
+from . import migrations
 from werkzeug.security import generate_password_hash
 
+# (title, company, description, location, skills_required, application_link)
+FALLBACK_SAMPLE_JOBS = [
+    ('Software Engineer', 'TechCorp Inc.', 'We are looking for an experienced software engineer familiar with Python, Flask, and SQL. The candidate should have strong problem-solving skills and be able to work in a team environment.', 'San Francisco, CA', 'Python, Flask, SQL, Git', None),
+    ('Data Scientist', 'DataAnalytics Co.', 'Seeking a data scientist with expertise in machine learning and natural language processing. The ideal candidate will have experience with Python, PyTorch, and SQL.', 'Remote', 'Python, ML, NLP, PyTorch, SQL', None),
+    ('Full Stack Developer', 'WebSolutions LLC', 'Looking for a full stack developer with experience in React and Node.js. Should be familiar with modern web development practices and RESTful APIs.', 'New York, NY', 'JavaScript, React, Node.js, Express, MongoDB', None),
+    ('DevOps Engineer', 'CloudTech Systems', 'Seeking a DevOps engineer to help manage our cloud infrastructure. Experience with AWS, Docker, and Kubernetes is required.', 'Seattle, WA', 'AWS, Docker, Kubernetes, Terraform, Linux', None),
+    ('UI/UX Designer', 'CreativeWorks Agency', 'Looking for a talented UI/UX designer to create beautiful and intuitive user interfaces. Experience with Figma and Adobe Creative Suite is a plus.', 'Los Angeles, CA', 'UI/UX, Figma, Adobe XD, Photoshop, Illustrator', None)
+]
+
+def get_connection_pool(app=None):
+    """The app's per-thread SQLite connection pool"""
+    app = app or current_app
+    pool = app.extensions.get('sqlite_pool')
+    if pool is None:
+        pool = app.extensions['sqlite_pool'] = ConnectionPool(
+            app.config['DATABASE'],
+            pragmas=app.config.get('SQLITE_PRAGMAS'),
+            busy_timeout=app.config.get('SQLITE_BUSY_TIMEOUT', 5.0),
+            cached_statements=app.config.get('SQLITE_CACHED_STATEMENTS', 256)
+        )
+    return pool
+
 def get_db():
     if 'db' not in g:
-        g.db = sqlite3.connect(
-            current_app.config['DATABASE'],
-            detect_types=sqlite3.PARSE_DECLTYPES
-        )
-        g.db.row_factory = sqlite3.Row
+        if current_app.config.get('SQLITE_REUSE_CONNECTIONS', True):
+            # Reuse this thread's tuned connection instead of reconnecting per request
+            g.db = get_connection_pool().connection()
+        else:
+            pool = get_connection_pool()
+            g.db = connect(current_app.config['DATABASE'], pool.pragmas, pool.busy_timeout, pool.cached_statements)
 
     return g.db
 
@@ -21,22 +47,29 @@ def close_db(e=None):
     db = g.pop('db', None)
 
     if db is not None:
-        db.close()
+        if current_app.config.get('SQLITE_REUSE_CONNECTIONS', True):
+            get_connection_pool().release(db)
+        else:
+            db.close()
 
 def init_db():
-    """Initialize the database."""
+    """Drop every table and recreate the database at the latest schema version."""
     db = get_db()
     
     try:
-        # Read schema from file
-        with current_app.open_resource('schema.sql') as f:
-            db.executescript(f.read().decode('utf8'))
+        migrations.drop_all(db)
+        migrations.upgrade(db)
             
         # Add sample jobs if none exist
         if not db.execute('SELECT 1 FROM jobs LIMIT 1').fetchone():
             add_fallback_sample_jobs(db)
             
         db.commit()
+        clear_caches()
+        
+        # The jobs table was recreated, so the matching index must be refitted
+        from app.models.job_index import build_job_index
+        build_job_index(db)
         current_app.logger.info("Database initialized successfully")
     except Exception as e:
         current_app.logger.error(f"Error initializing database: {e}")
@@ -54,8 +87,8 @@ def get_filtered_jobs(source=None, days=None):
         params.append(source)
     
     if days:
-        query += ' AND date(posted_date) >= date("now", "-? days")'
-        params.append(days)
+        query += " AND date(posted_date) >= date('now', ?)"
+        params.append(f'-{int(days)} days')
     
     query += ' ORDER BY posted_date DESC'
     
@@ -74,21 +107,22 @@ def add_sample_jobs(db):
             num_jobs=20
         )
         
-        # Insert jobs
-        for job in jobs:
-            if all([job.get('title'), job.get('company'), job.get('description'), job.get('application_link')]):
-                db.execute(
-                    'INSERT INTO jobs (title, company, description, location, application_link, posted_date, source)'
-                    ' VALUES (?, ?, ?, ?, ?, ?, ?)',
-                    (job['title'], job['company'], job['description'], 
-                     job['location'], job['application_link'], job['posted_date'], job['source'])
-                )
-        db.commit()
-        print(f"Added {len(jobs)} jobs from multiple sources")
+        # Upsert jobs in one transaction
+        jobs = [
+            job for job in jobs
+            if all([job.get('title'), job.get('company'), job.get('description'), job.get('application_link')])
+        ]
+        result = ingest_jobs(db, jobs)
+        new_ids = result.changed_ids
+        print(f"Added {result.inserted} and updated {result.updated} jobs from multiple sources")
             
     except Exception as e:
         print(f"Error adding jobs: {e}")
-        add_fallback_sample_jobs(db)
+        new_ids = add_fallback_sample_jobs(db)
+    
+    # Vectorise only the new rows against the existing index
+    from app.models.job_index import update_job_index
+    update_job_index(new_ids, db=db)
 
 def add_fallback_sample_jobs(db):
     def generate_search_link(title, company):
@@ -96,26 +130,23 @@ def add_fallback_sample_jobs(db):
         search_query = f"{title} {company}".replace(' ', '%20')
         return f"https://www.linkedin.com/jobs/search/?keywords={search_query}"
 
-    sample_jobs = [
-        ('Software Engineer', 'TechCorp Inc.', 'We are looking for an experienced software engineer familiar with Python, Flask, and SQL. The candidate should have strong problem-solving skills and be able to work in a team environment.', 'San Francisco, CA', 'Python, Flask, SQL, Git', None),
-        ('Data Scientist', 'DataAnalytics Co.', 'Seeking a data scientist with expertise in machine learning and natural language processing. The ideal candidate will have experience with Python, PyTorch, and SQL.', 'Remote', 'Python, ML, NLP, PyTorch, SQL', None),
-        ('Full Stack Developer', 'WebSolutions LLC', 'Looking for a full stack developer with experience in React and Node.js. Should be familiar with modern web development practices and RESTful APIs.', 'New York, NY', 'JavaScript, React, Node.js, Express, MongoDB', None),
-        ('DevOps Engineer', 'CloudTech Systems', 'Seeking a DevOps engineer to help manage our cloud infrastructure. Experience with AWS, Docker, and Kubernetes is required.', 'Seattle, WA', 'AWS, Docker, Kubernetes, Terraform, Linux', None),
-        ('UI/UX Designer', 'CreativeWorks Agency', 'Looking for a talented UI/UX designer to create beautiful and intuitive user interfaces. Experience with Figma and Adobe Creative Suite is a plus.', 'Los Angeles, CA', 'UI/UX, Figma, Adobe XD, Photoshop, Illustrator', None)
-    ]
-    
-    for job in sample_jobs:
+    jobs = []
+    for job in FALLBACK_SAMPLE_JOBS:
         title, company, description, location, skills, _ = job
         # Generate a search link if no direct link is provided
         search_link = generate_search_link(title, company)
         
-        db.execute(
-            'INSERT INTO jobs (title, company, description, location, skills_required, application_link, posted_date, source)'
-            ' VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
-            (title, company, description, location, skills, search_link, 
-             datetime.now().strftime('%Y-%m-%d'), 'sample')
-        )
-    db.commit()
+        jobs.append({
+            'title': title,
+            'company': company,
+            'description': description,
+            'location': location,
+            'skills_required': skills,
+            'application_link': search_link,
+            'posted_date': datetime.now().strftime('%Y-%m-%d'),
+            'source': 'sample'
+        })
+    return ingest_jobs(db, jobs).changed_ids
 
 @click.command('init-db')
 @with_appcontext
@@ -134,7 +165,7 @@ def reset_admin_command(password):
     
     try:
         # Check if admin exists
-        admin = db.execute('SELECT 1 FROM users WHERE username = ?', ('admin',)).fetchone()
+        admin = db.execute('SELECT id FROM users WHERE username = ?', ('admin',)).fetchone()
         
         if admin:
             # Update existing admin
@@ -150,29 +181,45 @@ def reset_admin_command(password):
             click.echo(f'Admin user created. Username: admin, Password: {password}')
         
         db.commit()
+        if admin:
+            invalidate('users', [admin['id']])
     except Exception as e:
         click.echo(f'Error resetting admin password: {e}')
         db.rollback()
 
-def verify_db_tables():
-    """Verify that required tables exist or reinitialize if they don't."""
+def upgrade_db():
+    """Apply pending schema migrations without touching existing data."""
     db = get_db()
-    try:
-        # Check if essential tables exist
-        db.execute('SELECT 1 FROM users LIMIT 1')
-        db.execute('SELECT 1 FROM jobs LIMIT 1')
-        return True
-    except sqlite3.OperationalError:
-        # Tables don't exist, initialize database
-        init_db()
-        return False
+    version = migrations.get_schema_version(db)
+    db.commit()
+    if version == migrations.LATEST_VERSION:
+        return version
+    
+    fresh = version == 0 and not db.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs'"
+    ).fetchone()
+    version = migrations.upgrade(db)
+    current_app.logger.info(f"Database upgraded to schema version {version}")
+    
+    # A brand new database gets the sample jobs so matching works out of the box
+    if fresh:
+        add_fallback_sample_jobs(db)
+    return version
+
+@click.command('db-upgrade')
+@with_appcontext
+def db_upgrade_command():
+    """Apply pending schema migrations."""
+    version = upgrade_db()
+    click.echo(f'Database is at schema version {version}.')
 
 def init_app(app):
     """Register database functions with the Flask app."""
     app.teardown_appcontext(close_db)
     app.cli.add_command(init_db_command)
     app.cli.add_command(reset_admin_command)
+    app.cli.add_command(db_upgrade_command)
     
-    # Initialize database when app starts
+    # Bring the schema up to date when the app starts; usually a single version check
     with app.app_context():
-        verify_db_tables()
\ No newline at end of file
+        upgrade_db()
\ No newline at end of file
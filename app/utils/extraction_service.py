@@ -0,0 +1,232 @@
+import os
+import time
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError, CancelledError, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from flask import current_app, has_app_context
+from app.utils.text_extractor import extract_text
+
+logger = logging.getLogger(__name__)
+
+class ExtractionTimeout(Exception):
+    """Raised when a file takes longer than the per-file timeout to extract"""
+
+# What a file's future raises when its pool was recycled or broke under it, through no fault of its own
+POOL_LOST = (BrokenProcessPool, CancelledError)
+
+class ExtractionService:
+    """Runs text extraction in a process pool so CPU-bound parsing stays off request threads.
+
+    Workers are spawned rather than forked, since the web process has
+    threads of its own. A file past its timeout is killed by recycling the
+    pool; files of other callers that were in flight in that pool are
+    resubmitted to the new one (up to max_resubmits times) instead of
+    failing with it. extract and iter_extract share one bound of
+    max_pending files queued or running.
+
+    Spawned workers re-import the main module, so a script without an
+    `if __name__ == '__main__':` guard starts itself again in every worker
+    and the pool never comes up. The first pool is checked with a no-op
+    task; if no worker answers within startup_timeout, files are extracted
+    in the calling thread from then on, without the per-file timeout.
+    """
+
+    def __init__(self, max_workers=None, timeout=60, max_pending=None, max_resubmits=2, func=extract_text,
+                 startup_timeout=10):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.timeout = timeout
+        # Bounds how many files may be queued or running at once
+        self.max_pending = max_pending or self.max_workers * 2
+        self.max_resubmits = max_resubmits
+        # Must be importable by the spawned workers; swappable in tests
+        self.func = func
+        self.startup_timeout = startup_timeout
+        # Set once the first pool failed to start; extraction then runs in-process
+        self.in_process = False
+        self._started = False
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        """Return the current pool, starting one if needed; None once extraction fell back in-process"""
+        with self._lock:
+            if self._executor is None and not self.in_process:
+                executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context('spawn')
+                )
+                if self._started or self._handshake(executor):
+                    self._started = True
+                    self._executor = executor
+                else:
+                    self.in_process = True
+            return self._executor
+
+    def _handshake(self, executor):
+        """Check that the first pool's workers start and answer a no-op task"""
+        try:
+            executor.submit(os.getpid).result(timeout=self.startup_timeout)
+            return True
+        except Exception as e:
+            self._terminate(executor)
+            logger.error(
+                f"Extraction workers did not start within {self.startup_timeout}s ({type(e).__name__}); "
+                "extracting in-process instead. Scripts that extract resumes need an `if __name__ == '__main__':` guard."
+            )
+            return False
+
+    def _terminate(self, executor):
+        # ProcessPoolExecutor cannot cancel a running task, so terminate its workers
+        processes = list((getattr(executor, '_processes', None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            try:
+                process.terminate()
+            except Exception:
+                pass
+
+    def _submit(self, path):
+        """Submit a file to the current pool, returning (executor, future)"""
+        while True:
+            executor = self._get_executor()
+            try:
+                return executor, executor.submit(self.func, path)
+            except (RuntimeError, BrokenProcessPool):
+                # Recycled or broken between lookup and submit; start a fresh pool
+                self._recycle(executor, 'it stopped accepting work')
+
+    def _recycle(self, executor, reason):
+        """Kill a pool whose worker is stuck or dead; the next submit starts a fresh one"""
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        self._terminate(executor)
+        logger.warning(f"Extraction pool recycled because {reason}")
+
+    def extract(self, file_path, timeout=None):
+        """Extract text from one file, waiting at most timeout seconds per attempt"""
+        timeout = timeout or self.timeout
+        if not self._slots.acquire(timeout=timeout):
+            raise ExtractionTimeout(f"Extraction queue is full, gave up on {file_path}")
+        try:
+            if self._get_executor() is None:
+                return self.func(file_path)
+            for attempt in range(self.max_resubmits + 1):
+                executor, future = self._submit(file_path)
+                try:
+                    return future.result(timeout=timeout)
+                except TimeoutError:
+                    self._recycle(executor, f"{file_path} took longer than {timeout}s")
+                    raise ExtractionTimeout(f"Extracting {file_path} took longer than {timeout}s")
+                except POOL_LOST:
+                    # Another file's timeout or crash took the pool down; run this one again
+                    self._recycle(executor, 'a worker died')
+                    if attempt == self.max_resubmits:
+                        raise
+        finally:
+            self._slots.release()
+
+    def iter_extract(self, paths, timeout=None):
+        """Yield (path, text, error) for each path as soon as its extraction finishes"""
+        timeout = timeout or self.timeout
+        if self._get_executor() is None:
+            for path in paths:
+                try:
+                    yield path, self.func(path), None
+                except Exception as e:
+                    yield path, '', str(e)
+            return
+        paths = iter(paths)
+        pending = {}  # future -> (path, executor, deadline, resubmits)
+        waiting = None  # Next path, held until a queue slot is free
+        exhausted = False
+
+        def submit(path, resubmits=0):
+            executor, future = self._submit(path)
+            pending[future] = (path, executor, time.monotonic() + timeout, resubmits)
+
+        try:
+            while True:
+                while not exhausted and len(pending) < self.max_pending:
+                    if waiting is None:
+                        try:
+                            waiting = next(paths)
+                        except StopIteration:
+                            exhausted = True
+                            break
+                    # Slots are shared with extract(); only block for one when none of ours is in flight
+                    if not (self._slots.acquire(blocking=False) if pending else self._slots.acquire(timeout=timeout)):
+                        if pending:
+                            break
+                        path, waiting = waiting, None
+                        yield path, '', f"Extraction queue is full, gave up on {path}"
+                        continue
+                    path, waiting = waiting, None
+                    submit(path)
+
+                if not pending:
+                    return
+
+                next_deadline = min(deadline for _, _, deadline, _ in pending.values())
+                done, _ = wait(pending, timeout=max(0, next_deadline - time.monotonic()),
+                               return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    path, executor, _, resubmits = pending.pop(future)
+                    try:
+                        text = future.result()
+                    except POOL_LOST:
+                        self._recycle(executor, 'a worker died')
+                        if resubmits < self.max_resubmits:
+                            # Lost with a recycled pool; keeps its slot and starts over
+                            submit(path, resubmits + 1)
+                            continue
+                        self._slots.release()
+                        yield path, '', 'Extraction worker died'
+                    except Exception as e:
+                        self._slots.release()
+                        yield path, '', str(e)
+                    else:
+                        self._slots.release()
+                        yield path, text, None
+
+                now = time.monotonic()
+                expired = [future for future, (_, _, deadline, _) in pending.items() if deadline <= now]
+                for future in expired:
+                    path, executor, _, _ = pending.pop(future)
+                    self._slots.release()
+                    # The other files in this pool come back as lost and are resubmitted above
+                    self._recycle(executor, f"{path} took longer than {timeout}s")
+                    yield path, '', f"Extraction took longer than {timeout}s"
+        finally:
+            # Abandoned part way; give back the slots of files still in flight
+            for future in pending:
+                future.cancel()
+                self._slots.release()
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+_service = None
+_service_lock = threading.Lock()
+
+def get_extraction_service():
+    """Return the process-wide extraction service, configured from the app if available"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                config = current_app.config if has_app_context() else {}
+                _service = ExtractionService(
+                    max_workers=config.get('EXTRACTION_WORKERS'),
+                    timeout=config.get('EXTRACTION_TIMEOUT', 60),
+                    max_pending=config.get('EXTRACTION_MAX_PENDING'),
+                    startup_timeout=config.get('EXTRACTION_STARTUP_TIMEOUT', 10),
+                )
+    return _service
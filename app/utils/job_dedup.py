@@ -0,0 +1,287 @@
+import re
+import zlib
+import hashlib
+import logging
+import click
+import numpy as np
+from flask import current_app, has_app_context
+from flask.cli import with_appcontext
+
+logger = logging.getLogger(__name__)
+
+# 128 permutations split into 16 bands of 8 rows: pairs above ~0.7 Jaccard
+# similarity are likely to share a band, pairs below ~0.4 rarely do
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 5
+DEFAULT_THRESHOLD = 0.8
+
+# Fixed seed: stored signatures must stay comparable across processes and runs
+_rng = np.random.default_rng(20240601)
+_MULTIPLIERS = _rng.integers(1, 2 ** 63, NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_OFFSETS = _rng.integers(0, 2 ** 63, NUM_PERM, dtype=np.uint64)
+_SHIFT = np.uint64(32)
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+def job_text(job):
+    """Text a posting is fingerprinted on"""
+    return ' '.join(job[field] or '' for field in ('title', 'company', 'description'))
+
+def shingles(text):
+    """Word k-grams of the lowercased text"""
+    tokens = TOKEN_PATTERN.findall((text or '').lower())
+    if not tokens:
+        return set()
+    size = min(SHINGLE_SIZE, len(tokens))
+    return {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+def minhash_signature(text):
+    """MinHash signature of the text's shingles, or None when it has no words"""
+    grams = shingles(text)
+    if not grams:
+        return None
+    hashes = np.fromiter((zlib.crc32(gram.encode('utf8')) for gram in grams), dtype=np.uint64, count=len(grams))
+    # Multiply-shift hashing; uint64 products wrap, which is what we want
+    with np.errstate(over='ignore'):
+        permuted = (_MULTIPLIERS[:, None] * hashes[None, :] + _OFFSETS[:, None]) >> _SHIFT
+    return permuted.min(axis=1).astype(np.uint32)
+
+def band_keys(signature):
+    """One bucket key per band; jobs sharing any key are duplicate candidates"""
+    keys = []
+    for band in range(BANDS):
+        digest = hashlib.blake2b(signature[band * ROWS:(band + 1) * ROWS].tobytes(), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, 'little', signed=True))
+    return keys
+
+def similarity(a, b):
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.mean(a == b))
+
+def get_threshold(threshold=None):
+    if threshold is not None:
+        return threshold
+    if has_app_context():
+        return current_app.config.get('DEDUP_THRESHOLD', DEFAULT_THRESHOLD)
+    return DEFAULT_THRESHOLD
+
+def _load_signatures(db, job_ids):
+    signatures = {}
+    job_ids = list(job_ids)
+    for start in range(0, len(job_ids), 500):
+        chunk = job_ids[start:start + 500]
+        placeholders = ','.join('?' * len(chunk))
+        for row in db.execute(
+            f'SELECT job_id, signature FROM job_minhash WHERE job_id IN ({placeholders})', chunk
+        ):
+            signatures[row[0]] = np.frombuffer(row[1], dtype=np.uint32)
+    return signatures
+
+def _store_signatures(db, job_ids, signatures, keys):
+    # Replace the fingerprints of job_ids; signatures and keys are None for jobs without words
+    for chunk in _chunks(job_ids):
+        db.execute(f'DELETE FROM job_lsh_bands WHERE job_id IN ({",".join("?" * len(chunk))})', chunk)
+    db.executemany(
+        'DELETE FROM job_minhash WHERE job_id = ?',
+        [(job_id,) for job_id, signature in zip(job_ids, signatures) if signature is None]
+    )
+    db.executemany(
+        'INSERT OR REPLACE INTO job_minhash (job_id, signature) VALUES (?, ?)',
+        [(job_id, signature.tobytes()) for job_id, signature in zip(job_ids, signatures) if signature is not None]
+    )
+    db.executemany(
+        'INSERT OR IGNORE INTO job_lsh_bands (band, bucket, job_id) VALUES (?, ?, ?)',
+        [(band, key, job_id) for job_id, job_keys in zip(job_ids, keys) if job_keys for band, key in enumerate(job_keys)]
+    )
+
+def _load_buckets(db, keys, exclude=()):
+    # Stored members of every bucket in keys, with one query per band instead of one per job
+    members = {}
+    for band in range(BANDS):
+        buckets = sorted({job_keys[band] for job_keys in keys if job_keys})
+        for chunk in _chunks(buckets):
+            for bucket, job_id in db.execute(
+                f'SELECT bucket, job_id FROM job_lsh_bands WHERE band = ? AND bucket IN ({",".join("?" * len(chunk))})',
+                [band] + chunk
+            ):
+                if job_id not in exclude:
+                    members.setdefault((band, bucket), []).append(job_id)
+    return members
+
+def _chunks(items, size=500):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def assign_clusters(db, job_ids, threshold=None):
+    """Fingerprint freshly written jobs and attach each to its duplicate cluster.
+
+    Runs inside the caller's transaction. A cluster is identified by the
+    smallest job id in it; a job that bridges two clusters merges them.
+    Candidate buckets, signatures and clusters are loaded once per call;
+    each job is then compared with stored jobs and the jobs before it in
+    job_ids. Returns the number of jobs that joined an existing cluster.
+    """
+    threshold = get_threshold(threshold)
+    jobs = {}
+    for chunk in _chunks(job_ids):
+        jobs.update((row['id'], row) for row in db.execute(
+            f'SELECT id, title, company, description FROM jobs WHERE id IN ({",".join("?" * len(chunk))})', chunk
+        ))
+    job_ids = [job_id for job_id in dict.fromkeys(job_ids) if job_id in jobs]
+    signatures = [minhash_signature(job_text(jobs[job_id])) for job_id in job_ids]
+    keys = [None if signature is None else band_keys(signature) for signature in signatures]
+
+    # Candidates share at least one band bucket. Stored ones are looked up before the batch's
+    # own fingerprints are replaced, and loaded with their signatures and clusters up front
+    position = {job_id: i for i, job_id in enumerate(job_ids)}
+    members = _load_buckets(db, keys, exclude=position)
+    _store_signatures(db, job_ids, signatures, keys)
+    for job_id, job_keys in zip(job_ids, keys):
+        for band, key in enumerate(job_keys or ()):
+            members.setdefault((band, key), []).append(job_id)
+    stored = {job_id for bucket in members.values() for job_id in bucket} - set(position)
+    candidate_signatures = _load_signatures(db, stored)
+    cluster_of = {}
+    for chunk in _chunks(candidate_signatures):
+        cluster_of.update(db.execute(
+            f'SELECT id, COALESCE(cluster_id, id) FROM jobs WHERE id IN ({",".join("?" * len(chunk))})', chunk
+        ).fetchall())
+    candidate_signatures.update((job_id, signature) for job_id, signature in zip(job_ids, signatures))
+
+    duplicates = 0
+    for i, (job_id, signature, job_keys) in enumerate(zip(job_ids, signatures, keys)):
+        if signature is None:
+            cluster_of[job_id] = job_id
+            continue
+        candidates = {
+            candidate for band, key in enumerate(job_keys) for candidate in members.get((band, key), ())
+            # Jobs later in the batch are compared when their own turn comes
+            if position.get(candidate, -1) < i and candidate in cluster_of
+        }
+        # Confirm on the full signature
+        clusters = {
+            cluster_of[candidate] for candidate in candidates
+            if similarity(signature, candidate_signatures[candidate]) >= threshold
+        }
+
+        if not clusters:
+            cluster_of[job_id] = job_id
+            continue
+        duplicates += 1
+        target = min(clusters | {job_id})
+        placeholders = ','.join('?' * len(clusters))
+        db.execute(f'UPDATE jobs SET cluster_id = ? WHERE cluster_id IN ({placeholders})', [target] + list(clusters))
+        for candidate, cluster_id in cluster_of.items():
+            if cluster_id in clusters:
+                cluster_of[candidate] = target
+        cluster_of[job_id] = target
+
+    db.executemany('UPDATE jobs SET cluster_id = ? WHERE id = ?', [(cluster_of[job_id], job_id) for job_id in job_ids])
+    return duplicates
+
+def dedupe_all_jobs(db, threshold=None, batch_size=1000):
+    """Rebuild fingerprints and clusters for the whole jobs table.
+
+    Only jobs sharing an LSH bucket are ever compared, so the pass stays
+    sub-quadratic in the number of jobs. Returns (jobs hashed, duplicates,
+    clusters with more than one member).
+    """
+    threshold = get_threshold(threshold)
+    try:
+        db.execute('DELETE FROM job_lsh_bands')
+        db.execute('DELETE FROM job_minhash')
+
+        hashed = 0
+        cursor = db.execute('SELECT id, title, company, description FROM jobs ORDER BY id')
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            signatures, bands = [], []
+            for row in rows:
+                signature = minhash_signature(job_text(row))
+                if signature is None:
+                    continue
+                signatures.append((row['id'], signature.tobytes()))
+                bands.extend((band, key, row['id']) for band, key in enumerate(band_keys(signature)))
+            db.executemany('INSERT INTO job_minhash (job_id, signature) VALUES (?, ?)', signatures)
+            db.executemany('INSERT OR IGNORE INTO job_lsh_bands (band, bucket, job_id) VALUES (?, ?, ?)', bands)
+            hashed += len(rows)
+
+        # Union-find over verified pairs; the smallest id becomes the cluster id
+        parent = {}
+
+        def find(job_id):
+            root = job_id
+            while parent.get(root, root) != root:
+                root = parent[root]
+            while job_id != root:
+                parent[job_id], job_id = root, parent.get(job_id, job_id)
+            return root
+
+        buckets = db.execute(
+            'SELECT group_concat(job_id) FROM job_lsh_bands GROUP BY band, bucket HAVING count(*) > 1'
+        ).fetchall()
+        for (members,) in buckets:
+            job_ids = sorted(int(job_id) for job_id in members.split(','))
+            signatures = _load_signatures(db, job_ids)
+            # Compare each member with the bucket's cluster leaders only
+            leaders = []
+            for job_id in job_ids:
+                for leader in leaders:
+                    if similarity(signatures[job_id], signatures[leader]) >= threshold:
+                        a, b = find(job_id), find(leader)
+                        if a != b:
+                            parent[max(a, b)] = min(a, b)
+                        break
+                else:
+                    leaders.append(job_id)
+
+        db.execute('UPDATE jobs SET cluster_id = id')
+        moved = [(find(job_id), job_id) for job_id in list(parent) if find(job_id) != job_id]
+        db.executemany('UPDATE jobs SET cluster_id = ? WHERE id = ?', moved)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    clusters = len({cluster_id for cluster_id, _ in moved})
+    logger.info(f"Deduplicated {hashed} jobs: {len(moved)} duplicates in {clusters} clusters")
+    return hashed, len(moved), clusters
+
+def collapse_duplicates(db, matches, top_n):
+    """Keep the best-scoring job of each duplicate cluster from (job_id, score, ...) matches"""
+    if not matches:
+        return []
+    job_ids = [match[0] for match in matches]
+    placeholders = ','.join('?' * len(job_ids))
+    cluster_of = dict(db.execute(
+        f'SELECT id, COALESCE(cluster_id, id) FROM jobs WHERE id IN ({placeholders})', job_ids
+    ).fetchall())
+
+    seen, collapsed = set(), []
+    for match in matches:
+        cluster_id = cluster_of.get(match[0], match[0])
+        if cluster_id in seen:
+            continue
+        seen.add(cluster_id)
+        collapsed.append(match)
+        if len(collapsed) == top_n:
+            break
+    return collapsed
+
+@click.command('dedupe-jobs')
+@click.option('--threshold', type=float, default=None, help='Minimum estimated Jaccard similarity (default DEDUP_THRESHOLD)')
+@with_appcontext
+def dedupe_jobs_command(threshold):
+    """Recompute near-duplicate clusters for every stored job."""
+    from app.utils.db_utils import get_db
+    hashed, duplicates, clusters = dedupe_all_jobs(get_db(), threshold)
+    click.echo(f'Hashed {hashed} jobs; {duplicates} near-duplicates in {clusters} clusters.')
+
+def init_app(app):
+    """Register the offline deduplication command."""
+    app.cli.add_command(dedupe_jobs_command)
@@ -0,0 +1,126 @@
+import re
+import math
+from app.models.skill_index import extract_job_skills
+
+# Degree levels, ordered so a higher level satisfies a lower requirement
+NO_DEGREE, BACHELOR, MASTER, DOCTORATE = 0, 1, 2, 3
+DEGREE_NAMES = {NO_DEGREE: None, BACHELOR: 'bachelor', MASTER: 'master', DOCTORATE: 'doctorate'}
+
+# Spelled-out degrees match in any case; abbreviations only as written, so 'ms' or 'ba' in prose do not count.
+# Each pattern opens with a literal so the regex engine can skip ahead to it; the lookbehind after
+# the literal stands in for a leading \b, which would make it try every position of the text
+DEGREE_PATTERNS = [
+    (DOCTORATE, re.compile(r"doctor(?<!\wdoctor)(?:ate|al| of philosophy)\b", re.IGNORECASE)),
+    (DOCTORATE, re.compile(r"Ph(?<!\wPh)\.?D\b")),
+    (MASTER, re.compile(r"master(?<!\wmaster)(?:'?s?| of \w+)\b", re.IGNORECASE)),
+    (MASTER, re.compile(r"M(?<!\wM)(?:\.?S\.?c?|\.S|\.?B\.?A|\.?Eng)\b")),
+    (BACHELOR, re.compile(
+        r"(?:bachelor(?<!\wbachelor)(?:'?s?| of \w+)|undergraduate(?<!\wundergraduate) degree)\b", re.IGNORECASE
+    )),
+    (BACHELOR, re.compile(r"B(?<!\wB)(?:\.?S\.?c?|\.S|\.?A|\.?Eng|\.?Tech)\b")),
+]
+
+REQUIRED_YEARS = re.compile(
+    r'(\d{1,2})\s*\+?\s*(?:-\s*\d{1,2}\s*)?(?:years?|yrs?)\b(?:\s+of)?(?:\s+\w+){0,3}?\s+experience',
+    re.IGNORECASE
+)
+
+WORD = re.compile(r'\w+')
+
+def parse_required_years(description):
+    """Smallest years-of-experience requirement stated in a description, NaN if none"""
+    years = [int(match) for match in REQUIRED_YEARS.findall(description or '')]
+    return float(min(years)) if years else math.nan
+
+def degree_level(text, highest=False):
+    """Degree level mentioned in text: the lowest (a job's entry requirement) or, with highest, the top one"""
+    levels = {level for level, pattern in DEGREE_PATTERNS if pattern.search(text or '')}
+    if not levels:
+        return NO_DEGREE
+    return max(levels) if highest else min(levels)
+
+def extract_job_features(description, skills_required=None):
+    """Skills, required years, degree level and token count of a posting"""
+    return {
+        'skills': extract_job_skills(description, skills_required),
+        'required_years': parse_required_years(description),
+        'degree_level': degree_level(description),
+        'token_count': len(WORD.findall(description or '')),
+    }
+
+def _chunks(items, size=500):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def get_skill_ids(db, names):
+    """Ids of skill names, adding names not seen before"""
+    names = sorted(set(names))
+    db.executemany('INSERT OR IGNORE INTO skills (name) VALUES (?)', [(name,) for name in names])
+    ids = {}
+    for chunk in _chunks(names):
+        placeholders = ','.join('?' * len(chunk))
+        ids.update((row[1], row[0]) for row in db.execute(
+            f'SELECT id, name FROM skills WHERE name IN ({placeholders})', chunk
+        ))
+    return ids
+
+def store_job_features(db, job_ids):
+    """Extract and store the features of freshly written jobs.
+
+    Runs inside the caller's transaction. Features are recomputed from the
+    stored row, so an update that keeps old values (see ingest_jobs) is
+    still described correctly.
+    """
+    job_ids = list(job_ids)
+    for chunk in _chunks(job_ids):
+        placeholders = ','.join('?' * len(chunk))
+        rows = db.execute(
+            f'SELECT id, description, skills_required FROM jobs WHERE id IN ({placeholders})', chunk
+        ).fetchall()
+        features = {row[0]: extract_job_features(row[1], row[2]) for row in rows}
+
+        db.executemany(
+            'UPDATE jobs SET required_years = ?, degree_level = ?, token_count = ? WHERE id = ?',
+            [
+                (None if math.isnan(f['required_years']) else f['required_years'],
+                 f['degree_level'], f['token_count'], job_id)
+                for job_id, f in features.items()
+            ]
+        )
+        skill_ids = get_skill_ids(db, {skill for f in features.values() for skill in f['skills']})
+        db.execute(f'DELETE FROM job_skills WHERE job_id IN ({placeholders})', chunk)
+        db.executemany(
+            'INSERT INTO job_skills (job_id, skill_id) VALUES (?, ?)',
+            [(job_id, skill_ids[skill]) for job_id, f in features.items() for skill in f['skills']]
+        )
+    return len(job_ids)
+
+def load_job_features(db, job_ids=None):
+    """Stored features by job id, for every job or only job_ids.
+
+    Jobs written before features were stored are missing from the result.
+    """
+    if job_ids is None:
+        chunks = [None]
+    else:
+        chunks = list(_chunks(list(job_ids)))
+
+    features = {}
+    for chunk in chunks:
+        where, params = 'WHERE token_count IS NOT NULL', []
+        if chunk is not None:
+            where += f' AND id IN ({",".join("?" * len(chunk))})'
+            params = chunk
+        for row in db.execute(f'SELECT id, required_years, degree_level FROM jobs {where}', params):
+            features[row[0]] = {
+                'skills': set(),
+                'required_years': math.nan if row[1] is None else row[1],
+                'degree_level': row[2] or NO_DEGREE,
+            }
+        skill_where = '' if chunk is None else f'WHERE js.job_id IN ({",".join("?" * len(chunk))})'
+        for job_id, name in db.execute(
+            f'SELECT js.job_id, s.name FROM job_skills js JOIN skills s ON s.id = js.skill_id {skill_where}', params
+        ):
+            if job_id in features:
+                features[job_id]['skills'].add(name)
+    return features
@@ -0,0 +1,238 @@
+import re
+import logging
+import threading
+from datetime import datetime
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from .job_dedup import assign_clusters
+from .job_features import store_job_features
+from .cache import invalidate
+
+logger = logging.getLogger(__name__)
+
+# Columns compared to decide whether an existing posting changed
+CONTENT_FIELDS = ('title', 'company', 'description', 'location', 'skills_required')
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    'trk', 'trkinfo', 'refid', 'trackingid', 'position', 'pagenum', 'originalsubdomain',
+    'currentjobid', 'eblast', 'lipi', 'src', 'ref', 'gclid', 'fbclid',
+}
+
+LINKEDIN_JOB_PATH = re.compile(r'^/jobs/view/(?:[^/]*-)?(\d+)/?$')
+
+def canonical_job_url(url):
+    """Normalise a posting URL so the same job from different links compares equal"""
+    if not url or not url.strip():
+        return None
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    path = parts.path or '/'
+
+    # LinkedIn serves the same posting from country subdomains and slugged paths
+    if host == 'linkedin.com' or host.endswith('.linkedin.com'):
+        host = 'www.linkedin.com'
+        match = LINKEDIN_JOB_PATH.match(path)
+        if match:
+            return f'https://www.linkedin.com/jobs/view/{match.group(1)}'
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith('utm_')
+    )
+    if len(path) > 1:
+        path = path.rstrip('/')
+    return urlunsplit(((parts.scheme or 'https').lower(), host, path, urlencode(query), ''))
+
+class KnownPostings:
+    """Thread-safe set of canonical posting URLs already stored in the jobs table"""
+
+    def __init__(self, links=()):
+        self._links = set(links)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, db):
+        return cls(row[0] for row in db.execute('SELECT canonical_link FROM jobs WHERE canonical_link IS NOT NULL'))
+
+    def __contains__(self, url):
+        return canonical_job_url(url) in self._links
+
+    def __len__(self):
+        return len(self._links)
+
+    def update(self, links):
+        """Remember canonical links that are now stored"""
+        links = [link for link in links if link is not None]
+        with self._lock:
+            self._links.update(links)
+
+class IngestResult:
+    """Counts from one ingestion run, plus the ids whose rows were written"""
+
+    def __init__(self):
+        self.inserted = 0
+        self.updated = 0
+        self.skipped = 0
+        self.duplicates = 0
+        self.inserted_ids = []
+        self.updated_ids = []
+
+    @property
+    def changed_ids(self):
+        return list(dict.fromkeys(self.inserted_ids + self.updated_ids))
+
+    def extend(self, other):
+        """Add the counts and ids of another run to this one"""
+        self.inserted += other.inserted
+        self.updated += other.updated
+        self.skipped += other.skipped
+        self.duplicates += other.duplicates
+        self.inserted_ids.extend(other.inserted_ids)
+        self.updated_ids.extend(other.updated_ids)
+        return self
+
+    def __repr__(self):
+        return f"IngestResult(inserted={self.inserted}, updated={self.updated}, skipped={self.skipped}, duplicates={self.duplicates})"
+
+# Columns a scraped job is mapped onto before it is written
+JOB_FIELDS = CONTENT_FIELDS + ('application_link', 'posted_date', 'source')
+
+def normalize_job(job, source=None):
+    """Map a job from any source onto the jobs columns, tidying text and filling defaults"""
+    normalized = {}
+    for field in JOB_FIELDS:
+        value = job.get(field)
+        if isinstance(value, str):
+            # Descriptions keep their line breaks; short fields are collapsed to single spaces
+            value = value.strip() if field == 'description' else ' '.join(value.split())
+        normalized[field] = value if value not in ('', None) else None
+    normalized['source'] = normalized['source'] or source
+    normalized['posted_date'] = normalized['posted_date'] or datetime.now().strftime('%Y-%m-%d')
+    return normalized
+
+def _normalise(job):
+    """Normalise a job for writing; returns None for unusable jobs"""
+    job = normalize_job(job)
+    if not job['title']:
+        return None
+    job['canonical_link'] = canonical_job_url(job['application_link'])
+    return job
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def ingest_jobs(db, jobs, batch_size=500, known_postings=None):
+    """Upsert jobs on their canonical URL in one transaction.
+
+    Jobs already stored with identical content are skipped; changed ones are
+    updated in place. Fields a source does not provide (None) never overwrite
+    stored values. Written rows have their features extracted, and are
+    fingerprinted and assigned to their near-duplicate cluster. Cached copies
+    of updated jobs are dropped; the caller is responsible for refreshing the
+    job index with result.changed_ids. Once the transaction commits, the
+    postings' links are added to known_postings, if given.
+    """
+    result = IngestResult()
+    prepared = []
+    for job in jobs:
+        job = _normalise(job)
+        if job is None:
+            result.skipped += 1
+        else:
+            prepared.append(job)
+
+    try:
+        for batch in _chunks(prepared, batch_size):
+            inserted_before = len(result.inserted_ids)
+            # Within a batch the last occurrence of a posting wins
+            by_link = {}
+            unlinked = []
+            for job in batch:
+                if job['canonical_link'] is None:
+                    unlinked.append(job)
+                else:
+                    if job['canonical_link'] in by_link:
+                        result.skipped += 1
+                    by_link[job['canonical_link']] = job
+
+            existing = {}
+            if by_link:
+                placeholders = ','.join('?' * len(by_link))
+                for row in db.execute(
+                    f'SELECT id, canonical_link, {", ".join(CONTENT_FIELDS)} FROM jobs'
+                    f' WHERE canonical_link IN ({placeholders})', list(by_link)
+                ):
+                    existing[row['canonical_link']] = row
+
+            to_write, new_links, changed_ids = [], [], []
+            for link, job in by_link.items():
+                row = existing.get(link)
+                if row is None:
+                    new_links.append(link)
+                elif any(job.get(field) is not None and job.get(field) != row[field] for field in CONTENT_FIELDS):
+                    changed_ids.append(row['id'])
+                else:
+                    result.skipped += 1
+                    continue
+                to_write.append(job)
+
+            db.executemany(
+                'INSERT INTO jobs (title, company, description, location, skills_required,'
+                ' application_link, canonical_link, posted_date, source)'
+                ' VALUES (:title, :company, :description, :location, :skills_required,'
+                ' :application_link, :canonical_link, :posted_date, :source)'
+                ' ON CONFLICT(canonical_link) DO UPDATE SET'
+                ' title = excluded.title,'
+                ' company = COALESCE(excluded.company, jobs.company),'
+                ' description = COALESCE(excluded.description, jobs.description),'
+                ' location = COALESCE(excluded.location, jobs.location),'
+                ' skills_required = COALESCE(excluded.skills_required, jobs.skills_required),'
+                ' application_link = excluded.application_link',
+                [_row_params(job) for job in to_write]
+            )
+            for job in unlinked:
+                cursor = db.execute(
+                    'INSERT INTO jobs (title, company, description, location, skills_required,'
+                    ' application_link, canonical_link, posted_date, source)'
+                    ' VALUES (:title, :company, :description, :location, :skills_required,'
+                    ' :application_link, :canonical_link, :posted_date, :source)',
+                    _row_params(job)
+                )
+                result.inserted_ids.append(cursor.lastrowid)
+
+            if new_links:
+                placeholders = ','.join('?' * len(new_links))
+                result.inserted_ids.extend(row[0] for row in db.execute(
+                    f'SELECT id FROM jobs WHERE canonical_link IN ({placeholders})', new_links
+                ))
+            result.updated_ids.extend(changed_ids)
+
+            # Feature extraction and near-duplicate detection run on every row this batch wrote
+            batch_ids = result.inserted_ids[inserted_before:] + changed_ids
+            store_job_features(db, batch_ids)
+            result.duplicates += assign_clusters(db, batch_ids)
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    if known_postings is not None:
+        known_postings.update(job['canonical_link'] for job in prepared)
+
+    result.inserted = len(result.inserted_ids)
+    result.updated = len(result.updated_ids)
+    invalidate('jobs', result.changed_ids)
+    logger.info(f"Ingested jobs: {result}")
+    return result
+
+def _row_params(job):
+    params = {field: job.get(field) for field in CONTENT_FIELDS}
+    params.update(
+        application_link=job.get('application_link'),
+        canonical_link=job['canonical_link'],
+        posted_date=job.get('posted_date'),
+        source=job.get('source'),
+    )
+    return params
@@ -1,15 +1,23 @@
-from .linkedin_scraper import LinkedInScraper
-from datetime import datetime, timedelta
+from .scraper_registry import create_scrapers
+from .job_ingest import normalize_job
 
 class JobScraper:
-    def __init__(self):
-        self.scraper = LinkedInScraper()
+    def __init__(self, sources=None, **kwargs):
+        # Every registered source unless a subset is requested
+        self.scrapers = create_scrapers(sources, **kwargs)
+    
+    def iter_jobs(self, keywords, location, num_jobs=10):
+        """Yield normalised jobs from every source as each results page arrives"""
+        for scraper in self.scrapers:
+            count = 0
+            try:
+                for _, page_jobs in scraper.iter_pages(keywords, location, num_jobs):
+                    count += len(page_jobs)
+                    for job in page_jobs:
+                        yield normalize_job(job, scraper.source_name)
+            except Exception as e:
+                print(f"Error scraping {scraper.source_name}: {e}")
+            print(f"Got {count} jobs from {scraper.source_name}")
     
     def scrape_all_sources(self, keywords, location, num_jobs=10):
-        try:
-            jobs = self.scraper.scrape_jobs(keywords, location, num_jobs)
-            print(f"Got {len(jobs)} jobs from LinkedIn")
-            return jobs
-        except Exception as e:
-            print(f"Error scraping LinkedIn: {e}")
-            return []
+        return list(self.iter_jobs(keywords, location, num_jobs))
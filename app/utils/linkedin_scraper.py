@@ -1,66 +1,79 @@
 from bs4 import BeautifulSoup
 from datetime import datetime
-import requests
-from time import sleep
 from .base_scraper import BaseScraper
 
 class LinkedInScraper(BaseScraper):
-    def __init__(self):
-        super().__init__()
-        self.session = requests.Session()
-        self.base_url = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
+    source_name = 'linkedin'
+    DEFAULT_BASE_URL = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
+    
+    def __init__(self, base_url=None, **kwargs):
+        super().__init__(**kwargs)
+        # Overridable so the scraper can be pointed at a local stub server
+        self.base_url = base_url or self.DEFAULT_BASE_URL
+        
+    def result_order(self):
+        # Newest first when skipping known postings, so a page of known jobs means the rest are older
+        return 'DD' if self.known_postings is not None else 'R'
         
-    def scrape_jobs(self, keywords, location, num_jobs=10):
-        jobs = []
-        offset = 0
+    def iter_pages(self, keywords, location, num_jobs=10, start_offset=0):
+        """Yield (next_offset, jobs) one results page at a time, descriptions included"""
+        offset = start_offset
+        consumed = 0
         limit = min(num_jobs, 25)  # LinkedIn's max per page is 25
         
-        try:
-            while len(jobs) < num_jobs:
-                params = {
-                    'keywords': keywords,
-                    'location': location,
-                    'pageSize': limit,
-                    'start': offset,
-                    'sortBy': 'R'  # Sort by relevance
-                }
+        while consumed < num_jobs:
+            params = {
+                'keywords': keywords,
+                'location': location,
+                'pageSize': limit,
+                'start': offset,
+                'sortBy': self.result_order()
+            }
                 
-                response = self.make_request(self.base_url, params)
-                if not response or response.status_code != 200:
-                    break
+            response = self.make_request(self.base_url, params)
+            if not response or response.status_code != 200:
+                break
                     
-                soup = BeautifulSoup(response.text, 'html.parser')
-                job_cards = soup.find_all('div', {'class': 'job-search-card'})
+            soup = BeautifulSoup(response.text, 'html.parser')
+            job_cards = soup.find_all('div', {'class': 'job-search-card'})
                 
-                if not job_cards:
-                    break
+            if not job_cards:
+                break
                 
-                for card in job_cards:
-                    if len(jobs) >= num_jobs:
-                        break
-                        
-                    try:
-                        job = self._parse_job_card(card)
-                        if job:
-                            jobs.append(job)
-                    except Exception as e:
-                        print(f"Error parsing job card: {e}")
-                        continue
+            # Progress is counted in result cards, parsed or not, so offsets and num_jobs agree
+            cards = job_cards[:num_jobs - consumed]
+            page_jobs = []
+            for card in cards:
+                try:
+                    job = self._parse_job_card(card)
+                    if job:
+                        page_jobs.append(job)
+                except Exception as e:
+                    print(f"Error parsing job card: {e}")
+                    continue
                     
-                    # Respect rate limits
-                    sleep(1)
+            # Only postings not already stored need their description page
+            new_jobs = self.filter_known(page_jobs)
+            
+            # Fetch descriptions in parallel; the rate limiter spaces out requests per host
+            descriptions = self.map_concurrently(
+                self._get_job_description, [job['application_link'] for job in new_jobs]
+            )
+            for job, description in zip(new_jobs, descriptions):
+                job['description'] = description
                 
-                offset += len(job_cards)
-                if len(job_cards) < limit:
-                    break
+            offset += len(cards)
+            consumed += len(cards)
+            yield offset, new_jobs
                     
-        except Exception as e:
-            print(f"Error in LinkedIn scraping: {e}")
-            
-        return jobs
+            if len(job_cards) < limit:
+                break
+            if page_jobs and not new_jobs:
+                # Everything further down is older and already stored
+                break
     
     def _parse_job_card(self, card):
-        """Extract job information from a job card"""
+        """Extract job information from a job card; the description is fetched separately"""
         try:
             title_elem = card.find('h3', {'class': 'base-search-card__title'})
             company_elem = card.find('h4', {'class': 'base-search-card__subtitle'})
@@ -75,7 +88,7 @@ class LinkedInScraper(BaseScraper):
                 'title': title_elem.text.strip(),
                 'company': company_elem.text.strip(),
                 'location': card.find('span', {'class': 'job-search-card__location'}).text.strip(),
-                'description': self._get_job_description(job_url),
+                'description': '',
                 'application_link': job_url,
                 'posted_date': datetime.now().strftime('%Y-%m-%d'),
                 'source': 'linkedin'
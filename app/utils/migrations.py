@@ -0,0 +1,250 @@
+import sqlite3
+import logging
+from flask import current_app
+from .job_ingest import canonical_job_url
+from .job_features import store_job_features
+
+logger = logging.getLogger(__name__)
+
+# Each migration is (version, description, step). A step is either SQL text
+# or a function taking the connection. Steps must be idempotent: databases
+# created before versioning already have some of these objects, and a step
+# may be re-run if the process dies mid-upgrade.
+
+def _column_names(db, table):
+    return {row[1] for row in db.execute(f'PRAGMA table_info({table})')}
+
+def _add_column(db, table, column, declaration):
+    if column not in _column_names(db, table):
+        db.execute(f'ALTER TABLE {table} ADD COLUMN {column} {declaration}')
+
+def _baseline(db):
+    # Users and jobs as originally shipped in schema.sql
+    with current_app.open_resource('schema.sql') as f:
+        _execute_script(db, f.read().decode('utf8'))
+
+def _canonical_links(db):
+    _add_column(db, 'jobs', 'canonical_link', 'TEXT')
+    # Backfill from application_link; the oldest copy of a posting keeps the link
+    seen = {row[0] for row in db.execute('SELECT canonical_link FROM jobs WHERE canonical_link IS NOT NULL')}
+    updates = []
+    for job_id, application_link in db.execute(
+        'SELECT id, application_link FROM jobs WHERE canonical_link IS NULL ORDER BY id'
+    ).fetchall():
+        link = canonical_job_url(application_link)
+        if link and link not in seen:
+            seen.add(link)
+            updates.append((link, job_id))
+    db.executemany('UPDATE jobs SET canonical_link = ? WHERE id = ?', updates)
+    db.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_canonical_link ON jobs(canonical_link)')
+
+def _near_duplicates(db):
+    _add_column(db, 'jobs', 'cluster_id', 'INTEGER')
+    _execute_script(db, '''
+        CREATE INDEX IF NOT EXISTS idx_jobs_cluster_id ON jobs(cluster_id);
+
+        CREATE TABLE IF NOT EXISTS job_minhash (
+            job_id INTEGER PRIMARY KEY,
+            signature BLOB NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS job_lsh_bands (
+            band INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            job_id INTEGER NOT NULL,
+            PRIMARY KEY (band, bucket, job_id)
+        ) WITHOUT ROWID;
+
+        CREATE INDEX IF NOT EXISTS idx_job_lsh_bands_job_id ON job_lsh_bands(job_id);
+    ''')
+
+def _job_search(db):
+    # External-content FTS5 index over jobs, kept in sync by triggers
+    _execute_script(db, '''
+        CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+            title, company, description, location, skills_required,
+            content='jobs', content_rowid='id',
+            tokenize='porter unicode61'
+        );
+        
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+            INSERT INTO jobs_fts (rowid, title, company, description, location, skills_required)
+            VALUES (new.id, new.title, new.company, new.description, new.location, new.skills_required);
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+            INSERT INTO jobs_fts (jobs_fts, rowid, title, company, description, location, skills_required)
+            VALUES ('delete', old.id, old.title, old.company, old.description, old.location, old.skills_required);
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_update
+        AFTER UPDATE OF title, company, description, location, skills_required ON jobs BEGIN
+            INSERT INTO jobs_fts (jobs_fts, rowid, title, company, description, location, skills_required)
+            VALUES ('delete', old.id, old.title, old.company, old.description, old.location, old.skills_required);
+            INSERT INTO jobs_fts (rowid, title, company, description, location, skills_required)
+            VALUES (new.id, new.title, new.company, new.description, new.location, new.skills_required);
+        END;
+    ''')
+    # Index the jobs that are already stored
+    db.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild')")
+
+def _job_features(db):
+    _add_column(db, 'jobs', 'required_years', 'REAL')
+    _add_column(db, 'jobs', 'degree_level', 'INTEGER')
+    _add_column(db, 'jobs', 'token_count', 'INTEGER')
+    _execute_script(db, '''
+        CREATE INDEX IF NOT EXISTS idx_jobs_required_years ON jobs(required_years);
+        CREATE INDEX IF NOT EXISTS idx_jobs_degree_level ON jobs(degree_level);
+        
+        CREATE TABLE IF NOT EXISTS skills (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        );
+        
+        CREATE TABLE IF NOT EXISTS job_skills (
+            job_id INTEGER NOT NULL,
+            skill_id INTEGER NOT NULL,
+            PRIMARY KEY (job_id, skill_id)
+        ) WITHOUT ROWID;
+        
+        CREATE INDEX IF NOT EXISTS idx_job_skills_skill_id ON job_skills(skill_id, job_id);
+        
+        CREATE TRIGGER IF NOT EXISTS job_skills_delete AFTER DELETE ON jobs BEGIN
+            DELETE FROM job_skills WHERE job_id = old.id;
+        END;
+    ''')
+    # Extract features of the jobs that are already stored
+    store_job_features(db, [row[0] for row in db.execute('SELECT id FROM jobs WHERE token_count IS NULL')])
+
+def _checkpoint_order(db):
+    # Offsets are only valid for the result order they were taken in
+    _add_column(db, 'scrape_checkpoints', 'result_order', 'TEXT')
+
+MIGRATIONS = [
+    (1, 'users and jobs tables', _baseline),
+    (2, 'resume cache and stored match results', '''
+        CREATE TABLE IF NOT EXISTS resume_cache (
+            content_hash TEXT PRIMARY KEY,
+            extractor_version TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            created TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            last_used TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE INDEX IF NOT EXISTS idx_resume_cache_last_used ON resume_cache(last_used);
+
+        CREATE TABLE IF NOT EXISTS match_results (
+            id TEXT PRIMARY KEY,
+            user_id INTEGER NOT NULL,
+            matches TEXT NOT NULL,
+            created TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE INDEX IF NOT EXISTS idx_match_results_created ON match_results(created);
+    '''),
+    (3, 'canonical posting links', _canonical_links),
+    (4, 'near-duplicate signatures and clusters', _near_duplicates),
+    (5, 'scrape checkpoints', '''
+        CREATE TABLE IF NOT EXISTS scrape_checkpoints (
+            source TEXT NOT NULL,
+            keywords TEXT NOT NULL,
+            location TEXT NOT NULL,
+            next_offset INTEGER NOT NULL DEFAULT 0,
+            jobs_seen INTEGER NOT NULL DEFAULT 0,
+            completed INTEGER NOT NULL DEFAULT 0,
+            updated TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (source, keywords, location)
+        );
+    '''),
+    (6, 'application link index', '''
+        CREATE INDEX IF NOT EXISTS idx_jobs_application_link ON jobs(application_link);
+    '''),
+    (7, 'full-text job search', _job_search),
+    (8, 'background task queue', '''
+        CREATE TABLE IF NOT EXISTS tasks (
+            id TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            user_id INTEGER,
+            status TEXT NOT NULL DEFAULT 'queued',
+            result TEXT,
+            error TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            created TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            started TIMESTAMP,
+            finished TIMESTAMP
+        );
+        CREATE INDEX IF NOT EXISTS idx_tasks_status_created ON tasks(status, created);
+    '''),
+    (9, 'precomputed job features', _job_features),
+    (10, 'scrape checkpoint result order', _checkpoint_order),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+def _execute_script(db, script):
+    # executescript() would commit the surrounding transaction, so run statements one by one
+    statement = ''
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            db.execute(statement)
+            statement = ''
+    if statement.strip():
+        db.execute(statement)
+
+def get_schema_version(db):
+    """Highest applied migration, 0 for a database that was never versioned"""
+    db.execute(
+        'CREATE TABLE IF NOT EXISTS schema_version ('
+        ' version INTEGER PRIMARY KEY,'
+        ' description TEXT,'
+        ' applied TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)'
+    )
+    return db.execute('SELECT COALESCE(MAX(version), 0) FROM schema_version').fetchone()[0]
+
+def upgrade(db, target=None):
+    """Apply pending migrations up to target (default: latest); returns the new version.
+
+    Each migration runs in its own write transaction and re-checks the
+    version inside it, so concurrent app processes apply it only once.
+    """
+    target = LATEST_VERSION if target is None else target
+    version = get_schema_version(db)
+    db.commit()
+    if version >= target:
+        return version
+
+    for number, description, step in MIGRATIONS:
+        if number <= version or number > target:
+            continue
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            if db.execute('SELECT 1 FROM schema_version WHERE version = ?', (number,)).fetchone():
+                db.rollback()
+                continue
+            logger.info(f"Applying migration {number}: {description}")
+            if callable(step):
+                step(db)
+            else:
+                _execute_script(db, step)
+            db.execute('INSERT INTO schema_version (version, description) VALUES (?, ?)', (number, description))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        version = number
+    return version
+
+def drop_all(db):
+    """Drop every table, leaving an empty database"""
+    db.commit()
+    # Virtual tables first; dropping them also drops their shadow tables
+    for (name,) in db.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND sql LIKE 'CREATE VIRTUAL TABLE%'"
+    ).fetchall():
+        db.execute(f'DROP TABLE IF EXISTS "{name}"')
+    for (name,) in db.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+    ).fetchall():
+        db.execute(f'DROP TABLE IF EXISTS "{name}"')
+    db.commit()
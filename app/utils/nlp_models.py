@@ -0,0 +1,88 @@
+import logging
+import threading
+import click
+from flask.cli import with_appcontext
+
+logger = logging.getLogger(__name__)
+
+SPACY_MODEL = 'en_core_web_sm'
+NLTK_RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'stopwords': 'corpora/stopwords',
+}
+
+_lock = threading.RLock()
+_spacy_models = {}
+_nltk_ready = set()
+_stopwords = {}
+
+def get_spacy_model(name=SPACY_MODEL):
+    """Load a spaCy pipeline on first use; returns None if it is not installed"""
+    if name in _spacy_models:
+        return _spacy_models[name]
+    with _lock:
+        if name not in _spacy_models:
+            import spacy
+            try:
+                _spacy_models[name] = spacy.load(name)
+            except OSError:
+                logger.warning(f"spaCy model {name} is not installed. Please run: python -m spacy download {name}")
+                # Fallback to basic processing if spaCy fails
+                _spacy_models[name] = None
+    return _spacy_models[name]
+
+def ensure_nltk_resource(name):
+    """Make sure an NLTK data package is available, downloading it if needed"""
+    if name in _nltk_ready:
+        return
+    with _lock:
+        if name in _nltk_ready:
+            return
+        import nltk
+        try:
+            nltk.data.find(NLTK_RESOURCES[name])
+        except LookupError:
+            nltk.download(name, quiet=True)
+        _nltk_ready.add(name)
+
+def get_stopwords(language='english'):
+    if language not in _stopwords:
+        ensure_nltk_resource('stopwords')
+        from nltk.corpus import stopwords
+        _stopwords[language] = frozenset(stopwords.words(language))
+    return _stopwords[language]
+
+def word_tokenize(text):
+    ensure_nltk_resource('punkt')
+    from nltk.tokenize import word_tokenize as nltk_word_tokenize
+    return nltk_word_tokenize(text)
+
+def preload():
+    """Load every model now, e.g. before forking workers so they share pages copy-on-write"""
+    for name in NLTK_RESOURCES:
+        ensure_nltk_resource(name)
+    get_stopwords()
+    get_spacy_model()
+
+def warm_up():
+    """Preload the models and run a short text through them so first requests are fast"""
+    preload()
+    sample = 'Experienced Python developer with 5 years of experience in machine learning.'
+    word_tokenize(sample)
+    nlp = get_spacy_model()
+    if nlp is not None:
+        nlp(sample)
+    logger.info("NLP models warmed up")
+
+@click.command('nlp-warmup')
+@with_appcontext
+def nlp_warmup_command():
+    """Load and warm up the NLP models."""
+    warm_up()
+    click.echo('NLP models loaded.')
+
+def init_app(app):
+    """Register the warm-up command and optionally preload models at app start."""
+    app.cli.add_command(nlp_warmup_command)
+    if app.config.get('NLP_PRELOAD'):
+        warm_up()
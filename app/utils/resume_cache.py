@@ -0,0 +1,130 @@
+import json
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from flask import current_app, has_app_context
+
+logger = logging.getLogger(__name__)
+
+def file_content_hash(file_path, chunk_size=1024 * 1024):
+    """SHA-256 of a file's bytes, read in chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ResumeCache:
+    """Two-tier cache of resume analysis keyed on content hash.
+
+    An in-process LRU sits in front of the resume_cache table. Entries written
+    by a different extractor version are treated as misses and dropped.
+    """
+
+    def __init__(self, version, max_memory_items=128, max_db_bytes=64 * 1024 * 1024):
+        self.version = str(version)
+        self.max_memory_items = max_memory_items
+        self.max_db_bytes = max_db_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, content_hash, db):
+        """Return the cached analysis for content_hash, or None"""
+        with self._lock:
+            entry = self._memory.get(content_hash)
+            if entry is not None:
+                self._memory.move_to_end(content_hash)
+                return entry
+
+        try:
+            row = db.execute(
+                'SELECT extractor_version, payload FROM resume_cache WHERE content_hash = ?',
+                (content_hash,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row['extractor_version'] != self.version:
+                db.execute('DELETE FROM resume_cache WHERE content_hash = ?', (content_hash,))
+                db.commit()
+                return None
+            db.execute(
+                'UPDATE resume_cache SET last_used = CURRENT_TIMESTAMP WHERE content_hash = ?',
+                (content_hash,)
+            )
+            db.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Error reading resume cache: {e}")
+            return None
+
+        entry = json.loads(row['payload'])
+        self._remember(content_hash, entry)
+        return entry
+
+    def put(self, content_hash, entry, db):
+        """Store an analysis in both tiers, evicting old rows past the size limit"""
+        self._remember(content_hash, entry)
+        payload = json.dumps(entry)
+        try:
+            db.execute(
+                'INSERT OR REPLACE INTO resume_cache (content_hash, extractor_version, payload, size)'
+                ' VALUES (?, ?, ?, ?)',
+                (content_hash, self.version, payload, len(payload))
+            )
+            self._evict(db)
+            db.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Error writing resume cache: {e}")
+            db.rollback()
+
+    def _remember(self, content_hash, entry):
+        with self._lock:
+            self._memory[content_hash] = entry
+            self._memory.move_to_end(content_hash)
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+
+    def _evict(self, db):
+        # Stale versions go first, then least recently used rows until under the size limit
+        db.execute('DELETE FROM resume_cache WHERE extractor_version != ?', (self.version,))
+        total = db.execute('SELECT COALESCE(SUM(size), 0) FROM resume_cache').fetchone()[0]
+        if total <= self.max_db_bytes:
+            return
+
+        excess = total - self.max_db_bytes
+        freed = 0
+        victims = []
+        for row in db.execute('SELECT content_hash, size FROM resume_cache ORDER BY last_used, created'):
+            victims.append((row['content_hash'],))
+            freed += row['size']
+            if freed >= excess:
+                break
+        db.executemany('DELETE FROM resume_cache WHERE content_hash = ?', victims)
+        with self._lock:
+            for (content_hash,) in victims:
+                self._memory.pop(content_hash, None)
+
+    def clear(self, db):
+        with self._lock:
+            self._memory.clear()
+        db.execute('DELETE FROM resume_cache')
+        db.commit()
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_resume_cache():
+    """Return the process-wide resume cache, configured from the app if available"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                from app.models.resume_processor import EXTRACTOR_VERSION
+                config = current_app.config if has_app_context() else {}
+                _cache = ResumeCache(
+                    EXTRACTOR_VERSION,
+                    max_memory_items=config.get('RESUME_CACHE_MEMORY_ITEMS', 128),
+                    max_db_bytes=config.get('RESUME_CACHE_MAX_BYTES', 64 * 1024 * 1024),
+                )
+    return _cache
@@ -0,0 +1,206 @@
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .job_ingest import ingest_jobs, normalize_job, IngestResult, KnownPostings
+
+logger = logging.getLogger(__name__)
+
+def get_checkpoint(db, source, keywords, location):
+    """Saved pagination state for one source/keyword/location, or None"""
+    return db.execute(
+        'SELECT next_offset, jobs_seen, completed, result_order FROM scrape_checkpoints'
+        ' WHERE source = ? AND keywords = ? AND location = ?',
+        (source, keywords, location)
+    ).fetchone()
+
+def save_checkpoint(db, source, keywords, location, next_offset, jobs_seen, completed=False, result_order=None):
+    db.execute(
+        'INSERT INTO scrape_checkpoints'
+        ' (source, keywords, location, next_offset, jobs_seen, completed, result_order, updated)'
+        ' VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)'
+        ' ON CONFLICT(source, keywords, location) DO UPDATE SET'
+        ' next_offset = excluded.next_offset, jobs_seen = excluded.jobs_seen,'
+        ' completed = excluded.completed, result_order = excluded.result_order, updated = excluded.updated',
+        (source, keywords, location, next_offset, jobs_seen, int(completed), result_order)
+    )
+    db.commit()
+
+class SourceMetrics:
+    """Throughput and error counts for one source during a scheduler run"""
+
+    def __init__(self, scraper):
+        self.scraper = scraper
+        self.queries = 0
+        self.pages = 0
+        self.jobs = 0
+        self.errors = 0
+        self.started = time.monotonic()
+        self.finished = None
+        self._stats_before = dict(scraper.stats)
+
+    def as_dict(self):
+        seconds = (self.finished or time.monotonic()) - self.started
+        stats = {key: value - self._stats_before.get(key, 0) for key, value in self.scraper.stats.items()}
+        return {
+            'source': self.scraper.source_name,
+            'queries': self.queries,
+            'pages': self.pages,
+            'jobs': self.jobs,
+            'errors': self.errors,
+            'requests': stats.get('requests', 0),
+            'request_errors': stats.get('request_errors', 0),
+            'known_skipped': stats.get('known_skipped', 0),
+            'seconds': round(seconds, 2),
+            'jobs_per_second': round(self.jobs / seconds, 2) if seconds else 0.0,
+        }
+
+class ScrapeScheduler:
+    """Run every (source, keyword) query in parallel, writing pages from one thread.
+
+    Each source gets its own thread pool sized by its max_parallel_queries,
+    so adding a source adds capacity instead of queueing behind the others,
+    and its own job budget. Worker threads only fetch and normalise; the
+    calling thread owns the database connection and ingests and checkpoints
+    each page as it arrives. The page queue is bounded, so memory stays flat
+    however many jobs are requested.
+    """
+
+    def __init__(self, scrapers, queue_size=8):
+        self.scrapers = list(scrapers)
+        self.queue_size = queue_size
+        self.metrics = {}
+        self._budgets = {}
+        self._budget_lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    def run(self, db, keywords, location, num_jobs=10, resume=False, budget=None, skip_known=True):
+        """Scrape num_jobs per source and keyword into the jobs table; returns an IngestResult.
+
+        With skip_known, postings already stored are recognised from their
+        card URL and their description pages are never fetched. A checkpoint
+        taken with results in another order is not resumed, since its offset
+        points somewhere else in the new order.
+        """
+        result = IngestResult()
+        known = KnownPostings.load(db) if skip_known else None
+        for scraper in self.scrapers:
+            scraper.known_postings = known
+        pages = queue.Queue(maxsize=self.queue_size)
+        self.metrics = {scraper.source_name: SourceMetrics(scraper) for scraper in self.scrapers}
+        self._stopping.clear()
+
+        # seen counts result cards consumed per query, the unit of offsets, num_jobs and budgets
+        executors, seen, offsets, pending = [], {}, {}, {}
+        for scraper in self.scrapers:
+            source = scraper.source_name
+            self._budgets[source] = budget if budget is not None else scraper.job_budget
+            executor = ThreadPoolExecutor(max_workers=scraper.max_parallel_queries, thread_name_prefix=f'scrape-{source}')
+            executors.append(executor)
+            pending[source] = 0
+            for keyword in keywords:
+                start_offset, seen[source, keyword] = 0, 0
+                checkpoint = get_checkpoint(db, source, keyword, location)
+                if resume and checkpoint is not None and not checkpoint['completed']:
+                    if checkpoint['result_order'] == scraper.result_order():
+                        start_offset, seen[source, keyword] = checkpoint['next_offset'], checkpoint['jobs_seen']
+                        logger.info(f"Resuming {source} '{keyword}' at offset {start_offset}")
+                    else:
+                        logger.info(f"Restarting {source} '{keyword}'; its results are now in a different order")
+                offsets[source, keyword] = start_offset
+                pending[source] += 1
+                executor.submit(
+                    self._fetch, pages, scraper, keyword, location,
+                    num_jobs - seen[source, keyword], start_offset
+                )
+
+        try:
+            while any(pending.values()):
+                kind, scraper, keyword, offset, payload = pages.get()
+                source = scraper.source_name
+                metrics = self.metrics[source]
+                if kind == 'page':
+                    result.extend(ingest_jobs(db, payload, known_postings=known))
+                    seen[source, keyword] += offset - offsets[source, keyword]
+                    offsets[source, keyword] = offset
+                    metrics.pages += 1
+                    metrics.jobs += len(payload)
+                    save_checkpoint(db, source, keyword, location, offset, seen[source, keyword],
+                                    result_order=scraper.result_order())
+                    continue
+
+                if kind == 'error':
+                    metrics.errors += 1
+                    logger.error(f"Error scraping {source} for '{keyword}': {payload}")
+                else:
+                    # Queries cut short by the budget stay open for a later resume
+                    save_checkpoint(db, source, keyword, location, offset, seen[source, keyword], completed=payload,
+                                    result_order=scraper.result_order())
+                metrics.queries += 1
+                pending[source] -= 1
+                if not pending[source]:
+                    metrics.finished = time.monotonic()
+        finally:
+            self._stopping.set()
+            for executor in executors:
+                executor.shutdown(wait=True)
+            for scraper in self.scrapers:
+                scraper.known_postings = None
+        return result
+
+    def report(self):
+        """Per-source metrics from the last run"""
+        return [metrics.as_dict() for metrics in self.metrics.values()]
+
+    def _budget_left(self, source):
+        with self._budget_lock:
+            remaining = self._budgets.get(source)
+            return remaining is None or remaining > 0
+
+    def _charge_budget(self, source, count):
+        with self._budget_lock:
+            if self._budgets.get(source) is not None:
+                self._budgets[source] -= count
+
+    def _put(self, pages, item):
+        # Give up once the run is aborting, instead of blocking on a full queue forever
+        while not self._stopping.is_set():
+            try:
+                pages.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _fetch(self, pages, scraper, keyword, location, num_jobs, start_offset):
+        source = scraper.source_name
+        offset = start_offset
+        completed = True
+        try:
+            if self._budget_left(source):
+                for next_offset, page_jobs in scraper.iter_pages(keyword, location, num_jobs, start_offset):
+                    # Charged in cards consumed, like the checkpoint, so a resumed run spends the same budget
+                    self._charge_budget(source, next_offset - offset)
+                    offset = next_offset
+                    page_jobs = [normalize_job(job, source) for job in page_jobs]
+                    if not self._put(pages, ('page', scraper, keyword, offset, page_jobs)):
+                        return
+                    # Stop before fetching the next page; a budget overshoots by at most one page per parallel query
+                    if not self._budget_left(source) or self._stopping.is_set():
+                        completed = False
+                        break
+            else:
+                completed = False
+            self._put(pages, ('done', scraper, keyword, offset, completed))
+        except Exception as e:
+            self._put(pages, ('error', scraper, keyword, offset, e))
+
+def scrape_to_db(db, job_scraper, keywords, location, num_jobs=10, resume=False, budget=None, skip_known=True):
+    """Scrape every source of a JobScraper for each keyword into the jobs table.
+
+    Returns the IngestResult and the per-source metrics.
+    """
+    scheduler = ScrapeScheduler(job_scraper.scrapers)
+    result = scheduler.run(db, keywords, location, num_jobs, resume, budget, skip_known)
+    return result, scheduler.report()
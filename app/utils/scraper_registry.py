@@ -0,0 +1,24 @@
+import pkgutil
+import importlib
+import logging
+from .base_scraper import SCRAPERS
+
+logger = logging.getLogger(__name__)
+
+def discover_scrapers():
+    """Import every app.utils *_scraper module so its scrapers register themselves"""
+    package = importlib.import_module('app.utils')
+    for module in pkgutil.iter_modules(package.__path__):
+        if module.name.endswith('_scraper') and module.name not in ('base_scraper', 'job_scraper'):
+            importlib.import_module(f'app.utils.{module.name}')
+    return dict(SCRAPERS)
+
+def create_scrapers(sources=None, **kwargs):
+    """Instantiate the named sources, or every registered source when none are given"""
+    available = discover_scrapers()
+    if sources is None:
+        sources = sorted(available)
+    unknown = [source for source in sources if source not in available]
+    if unknown:
+        raise ValueError(f"Unknown job sources: {', '.join(unknown)} (available: {', '.join(sorted(available))})")
+    return [available[source](**kwargs) for source in sources]
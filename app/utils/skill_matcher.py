@@ -0,0 +1,97 @@
+import os
+import re
+import functools
+from flask import current_app, has_app_context
+
+DEFAULT_SKILLS_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'skills.txt')
+
+def load_skills(path):
+    """Read a skill taxonomy file with one skill per line; lines starting with '#' are comments"""
+    skills = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            skill = line.strip().lower()
+            if skill and not skill.startswith('#'):
+                skills.append(skill)
+    return skills
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == '_'
+
+class SkillMatcher:
+    """Trie of taxonomy skills that finds every skill in one pass over the text.
+
+    A match only counts when it is not glued to a word character on either
+    side, so 'java' does not match inside 'javascript' while 'c++' and
+    'asp.net' still match. Overlapping skills such as 'react' and
+    'react native' are both reported.
+
+    The trie is also compiled into a single regex, which lets find() skip
+    to the positions where some skill starts; Python only walks the trie
+    from those positions.
+    """
+
+    def __init__(self, skills):
+        # Deduplicate while keeping taxonomy order, which is also the result order
+        self.skills = list(dict.fromkeys(skill.strip().lower() for skill in skills if skill.strip()))
+        self._goto = [{}]
+        self._skill_at = [None]  # Index of the skill that ends at each trie node
+        for skill_index, skill in enumerate(self.skills):
+            self._insert(skill, skill_index)
+        # Zero-width, so overlapping starts are all found
+        self._starts = re.compile(rf'(?<!\w)(?={self._trie_pattern(0)}(?!\w))') if self.skills else None
+
+    def _insert(self, skill, skill_index):
+        state = 0
+        for ch in skill:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._skill_at.append(None)
+            state = next_state
+        self._skill_at[state] = skill_index
+
+    def _trie_pattern(self, state):
+        # The trie as a regex, so the engine shares prefixes instead of trying each skill in turn
+        branches = [re.escape(ch) + self._trie_pattern(next_state) for ch, next_state in self._goto[state].items()]
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{pattern})?' if state and self._skill_at[state] is not None else pattern
+
+    def find(self, text):
+        """Return the taxonomy indices of every skill present in text"""
+        if not text or self._starts is None:
+            return []
+        text = text.lower()
+        goto, skill_at = self._goto, self._skill_at
+        end = len(text)
+        found = set()
+        for match in self._starts.finditer(text):
+            # Follow the trie from this start; every skill ending on the way starts here too
+            state, pos = 0, match.start()
+            while pos < end:
+                state = goto[state].get(text[pos])
+                if state is None:
+                    break
+                pos += 1
+                if skill_at[state] is not None and (pos == end or not _is_word_char(text[pos])):
+                    found.add(skill_at[state])
+        return sorted(found)
+
+    def extract(self, text):
+        """Return the skills present in text, in taxonomy order"""
+        return [self.skills[i] for i in self.find(text)]
+
+@functools.lru_cache(maxsize=None)
+def _load_skill_matcher(path):
+    return SkillMatcher(load_skills(path))
+
+def get_skill_matcher(path=None):
+    """Return the matcher for the configured taxonomy, compiled once per process"""
+    if path is None:
+        config = current_app.config if has_app_context() else {}
+        path = config.get('SKILLS_FILE') or DEFAULT_SKILLS_FILE
+    return _load_skill_matcher(path)
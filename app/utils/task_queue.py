@@ -0,0 +1,228 @@
+import json
+import uuid
+import atexit
+import logging
+import threading
+import traceback
+from flask import current_app
+from .db_utils import get_db
+
+logger = logging.getLogger(__name__)
+
+# Task kind -> handler(payload) returning a JSON-serialisable result
+TASK_HANDLERS = {}
+
+def task(kind):
+    """Register a function as the handler for tasks of this kind"""
+    def register(handler):
+        TASK_HANDLERS[kind] = handler
+        return handler
+    return register
+
+class SQLiteBroker:
+    """Durable task queue in the app database's tasks table.
+
+    Tasks survive restarts, and any process sharing the database can claim
+    them. A broker is anything with enqueue, claim, complete, fail, get and
+    requeue_stale; TaskQueue only talks to it through those, so another
+    backend (e.g. Redis) can replace this one without touching callers.
+    Methods run inside an app context and use its connection.
+    """
+
+    def enqueue(self, kind, payload, user_id=None, unique=False):
+        """Store a queued task and return its id.
+
+        With unique, a task of the same kind that is still queued or running
+        is returned instead of adding another.
+        """
+        task_id = uuid.uuid4().hex
+        db = get_db()
+        max_age = current_app.config.get('TASK_RESULTS_MAX_AGE_DAYS', 7)
+        # Drop old finished tasks so the table does not grow without bound.
+        # As a write, this also takes the database lock before the check below
+        db.execute(
+            "DELETE FROM tasks WHERE status IN ('done', 'failed') AND finished < datetime('now', ?)",
+            (f'-{int(max_age)} days',)
+        )
+        if unique:
+            pending = db.execute(
+                "SELECT id FROM tasks WHERE kind = ? AND status IN ('queued', 'running') ORDER BY created LIMIT 1",
+                (kind,)
+            ).fetchone()
+            if pending is not None:
+                db.commit()
+                return pending['id']
+        db.execute(
+            'INSERT INTO tasks (id, kind, payload, user_id) VALUES (?, ?, ?, ?)',
+            (task_id, kind, json.dumps(payload), user_id)
+        )
+        db.commit()
+        return task_id
+
+    def claim(self, task_id=None):
+        """Mark a queued task running and return it, or None; the oldest unless task_id is given"""
+        db = get_db()
+        if task_id is None:
+            where, params = "id = (SELECT id FROM tasks WHERE status = 'queued' ORDER BY created, rowid LIMIT 1)", ()
+        else:
+            where, params = "id = ? AND status = 'queued'", (task_id,)
+        # A single statement, so two workers can never claim the same task
+        row = db.execute(
+            "UPDATE tasks SET status = 'running', started = CURRENT_TIMESTAMP, attempts = attempts + 1"
+            f' WHERE {where} RETURNING id, kind, payload, user_id, attempts', params
+        ).fetchone()
+        db.commit()
+        if row is None:
+            return None
+        claimed = dict(row)
+        claimed['payload'] = json.loads(claimed['payload'])
+        return claimed
+
+    def complete(self, task_id, result):
+        self._finish(task_id, 'done', result=json.dumps(result))
+
+    def fail(self, task_id, error):
+        self._finish(task_id, 'failed', error=error)
+
+    def _finish(self, task_id, status, result=None, error=None):
+        db = get_db()
+        db.execute(
+            'UPDATE tasks SET status = ?, result = ?, error = ?, finished = CURRENT_TIMESTAMP WHERE id = ?',
+            (status, result, error, task_id)
+        )
+        db.commit()
+
+    def get(self, task_id):
+        row = get_db().execute(
+            'SELECT id, kind, user_id, status, result, error, attempts, created, started, finished'
+            ' FROM tasks WHERE id = ?', (task_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        found = dict(row)
+        found['result'] = json.loads(found['result']) if found['result'] else None
+        return found
+
+    def requeue_stale(self, stale_after, max_attempts):
+        """Put back tasks left running by a process that died; returns how many were requeued"""
+        db = get_db()
+        cutoff = f'-{int(stale_after)} seconds'
+        db.execute(
+            "UPDATE tasks SET status = 'failed', error = 'Gave up after repeated interruptions',"
+            " finished = CURRENT_TIMESTAMP"
+            " WHERE status = 'running' AND started < datetime('now', ?) AND attempts >= ?",
+            (cutoff, max_attempts)
+        )
+        requeued = db.execute(
+            "UPDATE tasks SET status = 'queued', started = NULL"
+            " WHERE status = 'running' AND started < datetime('now', ?)",
+            (cutoff,)
+        ).rowcount
+        db.commit()
+        return requeued
+
+class TaskQueue:
+    """Background worker threads draining a broker.
+
+    Workers start on the first enqueue (or an explicit start()) rather than
+    at app creation, so CLI commands do not spin up threads. Each task runs
+    in its own app context. With zero workers, enqueue runs the task inline
+    before returning, which keeps the request flow synchronous.
+    """
+
+    def __init__(self, app, broker=None, workers=2, poll_interval=2.0):
+        self.app = app
+        self.broker = broker or SQLiteBroker()
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._threads = []
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def running(self):
+        return bool(self._threads)
+
+    def start(self):
+        with self._lock:
+            if self._threads or self.workers <= 0:
+                return
+            with self.app.app_context():
+                requeued = self.broker.requeue_stale(
+                    self.app.config.get('TASK_STALE_SECONDS', 600),
+                    self.app.config.get('TASK_MAX_ATTEMPTS', 3)
+                )
+            if requeued:
+                logger.info(f"Requeued {requeued} interrupted tasks")
+            self._stop.clear()
+            for number in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f'task-worker-{number}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        atexit.register(self.stop)
+
+    def stop(self, timeout=5.0):
+        """Stop the workers after their current task"""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        # start() registers this again, so a restarted queue has a single shutdown hook
+        atexit.unregister(self.stop)
+        self._stop.set()
+        self._wakeup.set()
+        for thread in threads:
+            thread.join(timeout)
+
+    def enqueue(self, kind, payload, user_id=None, unique=False):
+        """Queue a task and return its id; unique tasks are not queued again while one is pending"""
+        if kind not in TASK_HANDLERS:
+            raise ValueError(f"No handler registered for task kind {kind!r}")
+        task_id = self.broker.enqueue(kind, payload, user_id, unique)
+        if self.workers <= 0:
+            self.run_next(task_id)
+        else:
+            self.start()
+            self._wakeup.set()
+        return task_id
+
+    def get(self, task_id):
+        return self.broker.get(task_id)
+
+    def run_next(self, task_id=None):
+        """Claim and run one task; returns False when there was nothing to claim"""
+        claimed = self.broker.claim(task_id)
+        if claimed is None:
+            return False
+        try:
+            result = TASK_HANDLERS[claimed['kind']](claimed['payload'])
+        except Exception as e:
+            logger.error(f"Task {claimed['id']} ({claimed['kind']}) failed: {e}\n{traceback.format_exc()}")
+            self.broker.fail(claimed['id'], str(e))
+        else:
+            self.broker.complete(claimed['id'], result)
+        return True
+
+    def _work(self):
+        while not self._stop.is_set():
+            # Cleared before claiming, so an enqueue during the claim is not missed
+            self._wakeup.clear()
+            try:
+                with self.app.app_context():
+                    ran = self.run_next()
+            except Exception as e:
+                logger.error(f"Task worker error: {e}")
+                ran = False
+            if not ran:
+                # Woken early by a local enqueue; the timeout picks up tasks from other processes
+                self._wakeup.wait(self.poll_interval)
+
+def get_task_queue():
+    return current_app.extensions['task_queue']
+
+def init_app(app):
+    """Attach the app's task queue; workers start when the first task arrives"""
+    app.extensions['task_queue'] = TaskQueue(
+        app,
+        workers=app.config.get('TASK_WORKERS', 2),
+        poll_interval=app.config.get('TASK_POLL_INTERVAL', 2.0)
+    )
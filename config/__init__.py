@@ -5,10 +5,48 @@ class Config:
     """Base config."""
     SECRET_KEY = os.environ.get('SECRET_KEY', 'dev')
     DATABASE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'instance', 'jobs.db')
+    SQLITE_REUSE_CONNECTIONS = True  # Keep one connection per thread instead of one per request
+    SQLITE_PRAGMAS = None  # Pragmas for new connections; defaults to db_pool.DEFAULT_PRAGMAS (WAL, NORMAL sync, mmap)
+    SQLITE_BUSY_TIMEOUT = 5.0  # Seconds to wait for another connection's write lock
+    SQLITE_CACHED_STATEMENTS = 256  # Prepared statements kept per connection
+    JOB_INDEX_PATH = None  # Defaults to <DATABASE>.index.npz next to the database
+    JOB_INDEX_DRIFT_THRESHOLD = 0.1  # Refit once 10% of appended tokens are out of vocabulary
+    JOB_INDEX_REFIT_MIN_SHARE = 0.1  # Refit on drift only once appended jobs add up to 10% of the jobs fitted
+    JOB_INDEX_MAX_TOMBSTONES = 0.25  # Compact the index once 25% of its rows are deleted
+    MATCH_MIN_CANDIDATES = 200  # Score every job when the skill prefilter finds fewer candidates
+    MATCH_WEIGHTS = None  # Weights of the text, skills, experience, education and location scores; defaults to scoring.DEFAULT_WEIGHTS
+    MATCH_COLLAPSE_DUPLICATES = True  # Show one job per near-duplicate cluster
+    SEARCH_PAGE_SIZE = 20  # Results per page on /search
+    DEDUP_THRESHOLD = 0.8  # Estimated Jaccard similarity above which two postings are duplicates
+    CACHE_ENABLED = True  # Cache job and user lookups
+    CACHE_BACKEND = 'memory'  # 'memory' per process, or 'sqlite' for one cache file shared by every process
+    CACHE_PATH = None  # File for the sqlite backend; defaults to <DATABASE>.cache.db next to the database
+    CACHE_TTL = 300  # Seconds an entry may be served before it is reloaded
+    CACHE_MAX_ITEMS = 10000  # Entries kept before the least recently used are evicted
     UPLOAD_FOLDER = 'uploads'
+    TASK_WORKERS = 2  # Background threads processing uploaded resumes; 0 runs tasks inside the request
+    TASK_POLL_INTERVAL = 2.0  # Seconds idle workers wait before checking for tasks queued by other processes
+    TASK_STALE_SECONDS = 600  # Running tasks older than this are requeued when workers start
+    TASK_MAX_ATTEMPTS = 3  # A task interrupted this many times is marked failed
+    TASK_RESULTS_MAX_AGE_DAYS = 7  # Finished tasks older than this are deleted
+    # Extraction workers are spawned and re-import the main module, so any script that
+    # extracts resumes (run.py, scripts/*) must keep its entry point under an
+    # `if __name__ == '__main__':` guard. Without one the workers never start and
+    # extraction falls back to the request thread, with no per-file timeout.
+    EXTRACTION_WORKERS = None  # Resume parsing processes; defaults to the CPU count
+    EXTRACTION_TIMEOUT = 60  # Seconds allowed to extract text from a single file
+    EXTRACTION_MAX_PENDING = None  # Files queued or running at once; defaults to twice the workers
+    EXTRACTION_STARTUP_TIMEOUT = 10  # Seconds the first worker has to start before extraction runs in-process
+    NLP_PRELOAD = False  # Load spaCy/NLTK at app start instead of on first use
+    SKILLS_FILE = None  # Skill taxonomy, one skill per line; defaults to app/data/skills.txt
+    RESUME_CACHE_MEMORY_ITEMS = 128  # Parsed resumes kept in process memory
+    RESUME_CACHE_MAX_BYTES = 64 * 1024 * 1024  # Size limit of the resume_cache table
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     PERMANENT_SESSION_LIFETIME = timedelta(minutes=30)
     SESSION_TYPE = 'filesystem'
+    MATCH_RESULTS_MAX_AGE_DAYS = 7  # Stored match results older than this are deleted
+    BROWSER_POOL_SIZE = 2  # Headless browsers shared by scrapers that need JavaScript rendering
+    CHROMEDRIVER_PATH = os.environ.get('CHROMEDRIVER_PATH')  # Skips the webdriver-manager download when set
     LOG_FILE = 'logs/app.log'
 
 class DevelopmentConfig(Config):
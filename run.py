@@ -36,12 +36,12 @@ def run(env, reset_admin, admin_password):
     app = create_app(config_class)
     setup_logging(app)
     
-    # Initialize database on startup
+    # Apply pending migrations on startup; existing data is kept
     with app.app_context():
-        from app.utils.db_utils import init_db
+        from app.utils.db_utils import upgrade_db
         try:
-            init_db()
-            app.logger.info('Database initialized successfully')
+            version = upgrade_db()
+            app.logger.info(f'Database ready at schema version {version}')
             
             # Reset admin if requested
             if reset_admin:
@@ -72,6 +72,9 @@ def run(env, reset_admin, admin_password):
         except Exception as e:
             app.logger.error(f'Error initializing database: {e}')
     
+    # Start the task workers now so uploads interrupted by a restart are picked up again
+    app.extensions['task_queue'].start()
+    
     if env == 'production':
         from waitress import serve
         app.logger.info('Starting production server...')
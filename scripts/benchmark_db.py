@@ -0,0 +1,128 @@
+import os
+import sys
+import time
+import random
+import tempfile
+import threading
+import click
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.db_utils import get_db
+from app.utils.job_ingest import ingest_jobs
+from app.models.match_store import save_match_results
+from werkzeug.security import generate_password_hash
+from synthetic_data import generate_jobs, generate_resumes
+from benchmark_utils import make_app, percentiles, environment, write_results
+
+# Connection-per-request with SQLite's stock rollback journal, as before the pool
+MODES = {
+    'tuned': {},
+    'default': {
+        'SQLITE_REUSE_CONNECTIONS': False,
+        'SQLITE_PRAGMAS': {'journal_mode': 'DELETE', 'synchronous': 'FULL'},
+    },
+}
+
+def run_mode(mode, jobs, readers, duration, write_batch, seed):
+    workdir = tempfile.mkdtemp(prefix=f'fithire-bench-{mode}-')
+    app = make_app(workdir, MODES[mode])
+
+    with app.app_context():
+        db = get_db()
+        job_ids = ingest_jobs(db, generate_jobs(jobs, seed)).inserted_ids
+        cursor = db.execute(
+            'INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)',
+            ('bench', 'bench@example.com', generate_password_hash('benchmark'))
+        )
+        db.commit()
+        match_id = save_match_results(db, cursor.lastrowid, [(job_id, 0.5) for job_id in job_ids[:10]])
+
+    # The dashboard renders the uploaded resume's features next to the matches
+    _, _, features = next(generate_resumes(1, seed))
+
+    stop = threading.Event()
+    latencies = {'job_detail': [], 'dashboard': []}
+    errors = []
+    written = []
+    lock = threading.Lock()
+
+    def reader(worker):
+        rng = random.Random(worker)
+        client = app.test_client()
+        client.post('/auth/login', data={'email': 'bench@example.com', 'password': 'benchmark'})
+        with client.session_transaction() as session:
+            session['match_id'] = match_id
+            session['resume_features'] = features
+        while not stop.is_set():
+            if rng.random() < 0.5:
+                endpoint, url = 'job_detail', f'/job/{rng.choice(job_ids)}'
+            else:
+                endpoint, url = 'dashboard', '/dashboard'
+            started = time.perf_counter()
+            try:
+                status = client.get(url).status_code
+            except Exception as e:
+                status = repr(e)
+            elapsed = time.perf_counter() - started
+            with lock:
+                if status == 200:
+                    latencies[endpoint].append(elapsed)
+                else:
+                    errors.append(status)
+
+    def writer():
+        # Same write path as scrape_jobs: one ingest transaction per results page
+        batch = 0
+        with app.app_context():
+            db = get_db()
+            while not stop.is_set():
+                batch += 1
+                started = time.perf_counter()
+                result = ingest_jobs(db, generate_jobs(write_batch, seed + 1000 + batch))
+                written.append((time.perf_counter() - started, result.inserted))
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    reads = sum(len(samples) for samples in latencies.values())
+    return {
+        'reads': reads,
+        'reads_per_second': round(reads / duration, 1),
+        'read_errors': len(errors),
+        'job_detail_ms': percentiles(latencies['job_detail']),
+        'dashboard_ms': percentiles(latencies['dashboard']),
+        'jobs_written': sum(count for _, count in written),
+        'write_batch_ms': percentiles([seconds for seconds, _ in written]),
+    }
+
+@click.command()
+@click.option('--jobs', '-j', default=5000, help='Jobs loaded before the run')
+@click.option('--readers', '-r', default=8, help='Concurrent reader threads')
+@click.option('--duration', '-d', default=10.0, help='Seconds to run each mode')
+@click.option('--write-batch', default=25, help='Jobs per write transaction, like one scraped page')
+@click.option('--mode', type=click.Choice(['both'] + list(MODES)), default='both')
+@click.option('--seed', default=0, help='Random seed for the synthetic corpus')
+@click.option('--output', '-o', default='-', help='JSON results file (default: stdout)')
+def benchmark_db(jobs, readers, duration, write_batch, mode, seed, output):
+    """Measure read throughput on /job/<id> and /dashboard while jobs are being written."""
+    modes = list(MODES) if mode == 'both' else [mode]
+    results = {
+        'environment': environment(),
+        'jobs': jobs,
+        'readers': readers,
+        'duration_seconds': duration,
+    }
+    for name in modes:
+        results[name] = run_mode(name, jobs, readers, duration, write_batch, seed)
+    write_results(results, output)
+
+if __name__ == '__main__':
+    benchmark_db()
@@ -0,0 +1,159 @@
+import os
+import sys
+import json
+import time
+import shutil
+import itertools
+import tempfile
+import multiprocessing
+import click
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.db_utils import get_db
+from app.utils.job_ingest import ingest_jobs
+from app.models.job_index import build_job_index, get_index_path
+from app.models.job_matcher import JobMatcher
+from app.models.batch_matcher import BatchMatcher
+from synthetic_data import generate_jobs, generate_resumes
+from benchmark_utils import make_app, percentiles, peak_rss_mb, environment, write_results
+
+DEFAULT_SIZES = '1000,10000,100000'
+
+# Metric -> True when higher is better; compared against --baseline
+TRACKED_METRICS = {
+    'build_seconds': False,
+    'find_matches_ms.p95': False,
+    'batch_resumes_per_second': True,
+    'peak_rss_mb': False,
+}
+
+def load_jobs(db, count, seed, chunk_size=10000):
+    """Ingest count synthetic jobs a chunk at a time, so the corpus is never held in memory at once"""
+    jobs = generate_jobs(count, seed)
+    while True:
+        chunk = list(itertools.islice(jobs, chunk_size))
+        if not chunk:
+            break
+        ingest_jobs(db, chunk)
+
+def run_size(jobs, queries, batch_resumes, top_n, seed):
+    """Benchmark one corpus size in a fresh database; meant to run in its own process"""
+    workdir = tempfile.mkdtemp(prefix=f'fithire-bench-match-{jobs}-')
+    # No caches or background workers, so only the matching path is measured
+    app = make_app(workdir, {'CACHE_ENABLED': False, 'TASK_WORKERS': 0})
+    try:
+        with app.app_context():
+            db = get_db()
+            started = time.perf_counter()
+            load_jobs(db, jobs, seed)
+            ingest_seconds = time.perf_counter() - started
+            ingest_rss = peak_rss_mb()
+
+            started = time.perf_counter()
+            index = build_job_index(db)
+            build_seconds = time.perf_counter() - started
+            build_rss = peak_rss_mb()
+
+            matcher = JobMatcher(index=index)
+            resumes = list(generate_resumes(queries, seed + 1))
+            # The first call pays for lazy loads (skill taxonomy, vectoriser caches)
+            matcher.find_matches(resumes[0][1], resumes[0][2], top_n)
+            latencies = []
+            for _, text, features in resumes:
+                started = time.perf_counter()
+                matcher.find_matches(text, features, top_n)
+                latencies.append(time.perf_counter() - started)
+
+            # With features, as find_matches gets them, so both paths rank the same way
+            batch = list(generate_resumes(batch_resumes, seed + 2))
+            started = time.perf_counter()
+            matched = sum(1 for _ in BatchMatcher(index, top_n).match(batch))
+            batch_seconds = time.perf_counter() - started
+            index_bytes = os.path.getsize(get_index_path())
+
+            return {
+                'jobs': jobs,
+                'indexed_jobs': len(index.job_ids),
+                'ingest_seconds': round(ingest_seconds, 3),
+                'ingest_jobs_per_second': round(jobs / ingest_seconds, 1),
+                'build_seconds': round(build_seconds, 3),
+                'index_mb': round(index_bytes / (1024 * 1024), 1),
+                'find_matches_ms': percentiles(latencies),
+                'find_matches_per_second': round(len(latencies) / sum(latencies), 1),
+                'batch_resumes': matched,
+                'batch_seconds': round(batch_seconds, 3),
+                'batch_resumes_per_second': round(matched / batch_seconds, 1),
+                'peak_rss_after_ingest_mb': ingest_rss,
+                'peak_rss_after_build_mb': build_rss,
+                'peak_rss_mb': peak_rss_mb(),
+            }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def _metric(result, name):
+    value = result
+    for part in name.split('.'):
+        value = (value or {}).get(part)
+    return value
+
+def compare(results, baseline, tolerance):
+    """Return a message for each tracked metric more than tolerance worse than the baseline"""
+    previous = {result['jobs']: result for result in baseline.get('results', [])}
+    regressions = []
+    for result in results:
+        before = previous.get(result['jobs'])
+        if before is None:
+            continue
+        for name, higher_is_better in TRACKED_METRICS.items():
+            old, new = _metric(before, name), _metric(result, name)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append(f"{result['jobs']} jobs: {name} {old} -> {new} ({change:+.0%})")
+    return regressions
+
+@click.command()
+@click.option('--sizes', '-s', default=DEFAULT_SIZES, help='Comma-separated corpus sizes to benchmark')
+@click.option('--queries', '-q', default=200, help='Synthetic resumes timed through find_matches')
+@click.option('--batch-resumes', '-b', default=500, help='Synthetic resumes matched in one batch run')
+@click.option('--top-n', '-n', default=10, help='Matches kept per resume')
+@click.option('--seed', default=0, help='Random seed for the synthetic corpus')
+@click.option('--output', '-o', default='-', help='JSON results file (default: stdout)')
+@click.option('--baseline', type=click.Path(exists=True), default=None,
+              help='Earlier results file; exit non-zero when a tracked metric regressed')
+@click.option('--tolerance', default=0.2, help='Allowed relative regression against --baseline')
+def benchmark_matching(sizes, queries, batch_resumes, top_n, seed, output, baseline, tolerance):
+    """Benchmark ingestion, index build, find_matches and batch matching on synthetic corpora."""
+    sizes = [int(size) for size in sizes.split(',') if size.strip()]
+    results = []
+    # A fresh process per size, so peak RSS belongs to that size alone
+    context = multiprocessing.get_context('spawn')
+    for size in sizes:
+        click.echo(f'Benchmarking {size} jobs...', err=True)
+        with context.Pool(1) as pool:
+            results.append(pool.apply(run_size, (size, queries, batch_resumes, top_n, seed)))
+
+    write_results({
+        'environment': environment(),
+        'settings': {
+            'queries': queries,
+            'batch_resumes': batch_resumes,
+            'top_n': top_n,
+            'seed': seed,
+        },
+        'results': results,
+    }, output)
+
+    if baseline:
+        with open(baseline) as f:
+            regressions = compare(results, json.load(f), tolerance)
+        for message in regressions:
+            click.echo(f'Regression: {message}', err=True)
+        if regressions:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    benchmark_matching()
@@ -0,0 +1,71 @@
+import os
+import sys
+import time
+import shutil
+import tempfile
+import click
+import numpy as np
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.db_utils import get_db
+from app.utils.job_ingest import ingest_jobs
+from app.models.job_index import build_job_index
+from app.models.job_matcher import JobMatcher
+from synthetic_data import generate_jobs, generate_resumes
+from benchmark_utils import make_app, percentiles, environment, write_results
+
+@click.command()
+@click.option('--jobs', '-j', default=10000, help='Number of synthetic jobs to index')
+@click.option('--queries', '-q', default=200, help='Number of synthetic resumes to match')
+@click.option('--top-n', '-n', default=10, help='Matches kept per resume')
+@click.option('--min-candidates', default=200, help='Prefilter size below which every job is scored')
+@click.option('--seed', default=0, help='Random seed for the synthetic corpus')
+@click.option('--output', '-o', default='-', help='JSON results file (default: stdout)')
+def benchmark_retrieval(jobs, queries, top_n, min_candidates, seed, output):
+    """Compare skill-prefiltered matching against scoring every job, as find_matches ranks them."""
+    workdir = tempfile.mkdtemp(prefix='fithire-bench-retrieval-')
+    # The served ranking: every score component, with near-duplicates collapsed
+    app = make_app(workdir, {'CACHE_ENABLED': False, 'TASK_WORKERS': 0, 'MATCH_MIN_CANDIDATES': min_candidates})
+    try:
+        with app.app_context():
+            db = get_db()
+            ingest_jobs(db, generate_jobs(jobs, seed))
+            started = time.perf_counter()
+            index = build_job_index(db)
+            build_seconds = time.perf_counter() - started
+
+            exhaustive, hybrid = JobMatcher(index=index, hybrid=False), JobMatcher(index=index)
+            exhaustive_times, hybrid_times, recalls, candidate_counts = [], [], [], []
+            for _, text, features in generate_resumes(queries, seed + 1):
+                started = time.perf_counter()
+                exact = exhaustive.rank_jobs(text, features, top_n)
+                exhaustive_times.append(time.perf_counter() - started)
+
+                started = time.perf_counter()
+                ranked = hybrid.rank_jobs(text, features, top_n)
+                hybrid_times.append(time.perf_counter() - started)
+
+                candidate_counts.append(len(index.candidate_rows(features['skills'], min_candidates)))
+                if exact:
+                    exact_ids = {job_id for job_id, _ in exact}
+                    recalls.append(len(exact_ids & {job_id for job_id, _ in ranked}) / len(exact_ids))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    write_results({
+        'environment': environment(),
+        'jobs': jobs,
+        'indexed_jobs': len(index.job_ids),
+        'queries': queries,
+        'top_n': top_n,
+        'build_seconds': round(build_seconds, 3),
+        'exhaustive_ms': percentiles(exhaustive_times),
+        'hybrid_ms': percentiles(hybrid_times),
+        'mean_candidates': round(float(np.mean(candidate_counts)), 1),
+        'recall_at_n': round(float(np.mean(recalls)), 4) if recalls else None,
+    }, output)
+
+if __name__ == '__main__':
+    benchmark_retrieval()
@@ -0,0 +1,66 @@
+import os
+import sys
+import json
+import time
+import platform
+import resource
+import subprocess
+import numpy as np
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from config import Config
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def make_app(workdir, overrides=None):
+    """App with its database, index and sessions inside workdir"""
+    settings = dict(
+        DATABASE=os.path.join(workdir, 'jobs.db'),
+        SESSION_FILE_DIR=os.path.join(workdir, 'sessions'),
+        TESTING=True,
+        **(overrides or {})
+    )
+    return create_app(type('BenchmarkConfig', (Config,), settings))
+
+def percentiles(samples):
+    """p50/p95/p99 of durations in seconds, as milliseconds"""
+    if not samples:
+        return None
+    ms = np.array(samples) * 1000
+    return {f'p{p}': round(float(np.percentile(ms, p)), 3) for p in (50, 95, 99)}
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def environment():
+    """Where a run happened, so results from different machines are not compared blindly"""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+def write_results(results, output):
+    """Write results as JSON to a path, or stdout for '-'"""
+    text = json.dumps(results, indent=2)
+    if output == '-':
+        print(text)
+    else:
+        with open(output, 'w') as f:
+            f.write(text + '\n')
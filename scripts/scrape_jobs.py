@@ -9,6 +9,10 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app import create_app
 from app.utils.job_scraper import JobScraper
+from app.utils.db_utils import get_db
+from app.utils.scrape_pipeline import scrape_to_db
+from app.utils.browser_pool import shutdown_browser_pool
+from app.models.job_index import update_job_index
 
 logging.basicConfig(
     level=logging.INFO,
@@ -24,57 +28,49 @@ logging.basicConfig(
               help='Comma-separated job keywords to search for')
 @click.option('--location', '-l', default='United States', help='Job location')
 @click.option('--jobs-per-source', '-n', default=10, help='Number of jobs to fetch per source')
-def scrape_jobs(keywords, location, jobs_per_source):
-    """Scrape jobs from LinkedIn and save to database."""
+@click.option('--resume', is_flag=True, help='Continue interrupted scrapes from their last checkpoint')
+@click.option('--sources', '-s', default=None, help='Comma-separated job sources (default: all registered)')
+@click.option('--budget', type=int, default=None, help='Most result cards to read from each source across all keywords')
+@click.option('--refresh', is_flag=True, help='Re-fetch postings that are already stored, to pick up edits')
+def scrape_jobs(keywords, location, jobs_per_source, resume, sources, budget, refresh):
+    """Scrape jobs from every registered source and save to database."""
     logger = logging.getLogger(__name__)
-    logger.info(f"Starting LinkedIn job scraping for: {keywords} in {location}")
+    logger.info(f"Starting job scraping for: {keywords} in {location}")
     
     app = create_app()
     with app.app_context():
         try:
-            scraper = JobScraper()
-            total_jobs = 0
+            scraper = JobScraper(sources=[source.strip() for source in sources.split(',')] if sources else None)
+            db = get_db()
+            keyword_list = [keyword.strip() for keyword in keywords.split(',') if keyword.strip()]
             
-            # Split keywords and scrape for each keyword combination
-            for keyword in keywords.split(','):
-                keyword = keyword.strip()
-                logger.info(f"Searching for: {keyword}")
-                
-                jobs = scraper.scrape_all_sources(
-                    keywords=keyword,
-                    location=location,
-                    num_jobs=jobs_per_source
+            # All sources and keywords run in parallel; each page is upserted and checkpointed as it arrives
+            result, metrics = scrape_to_db(
+                db, scraper, keyword_list, location, jobs_per_source,
+                resume=resume, budget=budget, skip_known=not refresh
+            )
+            for source_metrics in metrics:
+                logger.info(
+                    f"{source_metrics['source']}: {source_metrics['jobs']} jobs in {source_metrics['pages']} pages "
+                    f"({source_metrics['jobs_per_second']} jobs/s), {source_metrics['requests']} requests, "
+                    f"{source_metrics['request_errors']} request errors, {source_metrics['errors']} failed queries, "
+                    f"{source_metrics['known_skipped']} known postings skipped"
                 )
                 
-                # Save jobs to database
-                from app.utils.db_utils import get_db
-                db = get_db()
-                
-                for job in jobs:
-                    try:
-                        db.execute('''
-                            INSERT INTO jobs (title, company, description, location, 
-                                           application_link, posted_date, source)
-                            VALUES (?, ?, ?, ?, ?, ?, ?)
-                            ON CONFLICT(application_link) DO NOTHING
-                        ''', (
-                            job['title'], job['company'], job['description'],
-                            job['location'], job['application_link'],
-                            job['posted_date'], job['source']
-                        ))
-                        total_jobs += 1
-                    except Exception as e:
-                        logger.error(f"Error saving job: {e}")
-                        continue
-                
-                db.commit()
-                logger.info(f"Saved {total_jobs} new jobs for keyword: {keyword}")
+            logger.info(
+                f"Scraping completed. {result.inserted} new, {result.updated} updated, "
+                f"{result.skipped} skipped, {result.duplicates} near-duplicates"
+            )
                 
-            logger.info(f"Scraping completed. Total new jobs saved: {total_jobs}")
+            # Refresh only the changed jobs in the matching index instead of refitting it
+            update_job_index(result.changed_ids, db=db)
             
         except Exception as e:
             logger.error(f"Scraping failed: {e}")
             raise
+        finally:
+            # Quit any browsers the sources started
+            shutdown_browser_pool()
 
 if __name__ == "__main__":
     # Create logs directory if it doesn't exist
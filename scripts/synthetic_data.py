@@ -0,0 +1,75 @@
+import os
+import sys
+import random
+from datetime import datetime, timedelta
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.db_utils import FALLBACK_SAMPLE_JOBS
+from app.utils.skill_matcher import load_skills, DEFAULT_SKILLS_FILE
+
+SENIORITY = ['Junior', 'Mid-level', 'Senior', 'Lead', 'Principal']
+EXTRA_LOCATIONS = ['Austin, TX', 'Boston, MA', 'Chicago, IL', 'Denver, CO', 'Remote']
+SKILL_SENTENCES = [
+    'Hands-on experience with {skill} is required.',
+    'You will build and maintain services using {skill}.',
+    'Familiarity with {skill} is a strong plus.',
+    'The team relies heavily on {skill} in production.',
+]
+
+def _filler_words():
+    # Vocabulary of the seed descriptions, used to pad generated text
+    words = set()
+    for _, _, description, _, _, _ in FALLBACK_SAMPLE_JOBS:
+        words.update(word.strip('.,').lower() for word in description.split())
+    return sorted(word for word in words if word.isalpha())
+
+def generate_jobs(count, seed=0):
+    """Yield synthetic job dicts shaped like rows of the jobs table"""
+    rng = random.Random(seed)
+    skills = load_skills(DEFAULT_SKILLS_FILE)
+    filler = _filler_words()
+    locations = [job[3] for job in FALLBACK_SAMPLE_JOBS] + EXTRA_LOCATIONS
+    today = datetime.now()
+
+    for i in range(count):
+        title, company, description, _, seed_skills, _ = rng.choice(FALLBACK_SAMPLE_JOBS)
+        job_skills = rng.sample(skills, rng.randint(3, 7))
+        years = rng.randint(0, 10)
+        sentences = [description]
+        sentences.extend(rng.choice(SKILL_SENTENCES).format(skill=skill) for skill in job_skills)
+        sentences.append(f'Requires {years}+ years of experience.')
+        sentences.append(' '.join(rng.choices(filler, k=rng.randint(20, 80))) + '.')
+        yield {
+            'title': f'{rng.choice(SENIORITY)} {title}',
+            'company': f'{company.split()[0]} {i % 997}',
+            'description': ' '.join(sentences),
+            'location': rng.choice(locations),
+            'skills_required': ', '.join(job_skills[:4] + seed_skills.split(', ')[:2]),
+            'application_link': f'https://jobs.example.com/view/{seed}-{i}',
+            'posted_date': (today - timedelta(days=rng.randint(0, 60))).strftime('%Y-%m-%d'),
+            'source': 'synthetic',
+        }
+
+def generate_resumes(count, seed=1):
+    """Yield (name, text, features) triples for synthetic candidates"""
+    rng = random.Random(seed)
+    skills = load_skills(DEFAULT_SKILLS_FILE)
+    filler = _filler_words()
+
+    for i in range(count):
+        title = rng.choice(FALLBACK_SAMPLE_JOBS)[0]
+        resume_skills = rng.sample(skills, rng.randint(3, 10))
+        years = rng.randint(0, 15)
+        text = ' '.join([
+            f'{title.lower()} with {years} years of experience.',
+            'skills: ' + ', '.join(resume_skills) + '.',
+            ' '.join(rng.choices(filler, k=rng.randint(30, 120))) + '.',
+        ])
+        features = {
+            'skills': resume_skills,
+            'education': [rng.choice(['Bachelor', 'Master', 'PhD'])],
+            'years_of_experience': years,
+        }
+        yield f'candidate-{i}', text, features
@@ -1,19 +1,24 @@
 import os
-import tempfile
+import time
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
 import pytest
 from app import create_app
+from config import TestingConfig
 from app.utils.db_utils import init_db, get_db
 
 @pytest.fixture
-def app():
+def app(tmp_path):
     """Create and configure a new app instance for each test."""
-    # Create a temporary file to isolate the database for each test
-    db_fd, db_path = tempfile.mkstemp()
-    
-    app = create_app({
-        'TESTING': True,
-        'DATABASE': db_path,
-    })
+    # create_app takes a config object, so the test settings go on a subclass
+    app = create_app(type('IsolatedTestingConfig', (TestingConfig,), {
+        # Isolate the database, index and sessions for each test
+        'DATABASE': str(tmp_path / 'jobs.db'),
+        'SESSION_FILE_DIR': str(tmp_path / 'sessions'),
+        # Tasks run inside the request instead of on background threads
+        'TASK_WORKERS': 0,
+    }))
 
     # Create the database and load test data
     with app.app_context():
@@ -21,10 +26,6 @@ def app():
     
     yield app
 
-    # Clean up the temporary file
-    os.close(db_fd)
-    os.unlink(db_path)
-
 @pytest.fixture
 def client(app):
     return app.test_client()
@@ -32,3 +33,102 @@ def client(app):
 @pytest.fixture
 def runner(app):
     return app.test_cli_runner()
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+class StubLinkedIn:
+    """Local stand-in for LinkedIn's guest jobs API, serving recorded HTML.
+    
+    Search pages come from fixtures/linkedin/search_page_<n>.html, 25 cards
+    each; starts past the last page get an empty body, as LinkedIn does. Job
+    pages all serve job_posting.html. Every request is logged, and fail()
+    queues error statuses for a path prefix.
+    """
+    
+    search_path = '/jobs-guest/jobs/api/seeMoreJobPostings/search'
+    page_size = 25
+    
+    def __init__(self):
+        self.requests = []
+        self.delay = 0.0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._failures = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self._server.server_port}'
+        self.search_url = self.url + self.search_path
+    
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+    
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def fail(self, path_prefix, statuses):
+        """Answer the next requests under path_prefix with these statuses, in order"""
+        with self._lock:
+            self._failures.extend((path_prefix, status) for status in statuses)
+    
+    def paths(self, prefix=''):
+        return [path for _, path, _ in self.requests if path.startswith(prefix)]
+    
+    def search_starts(self):
+        return [int(query['start'][0]) for _, path, query in self.requests if path == self.search_path]
+    
+    def _respond(self, path, query):
+        with self._lock:
+            for i, (prefix, status) in enumerate(self._failures):
+                if path.startswith(prefix):
+                    del self._failures[i]
+                    return status, ''
+        if path == self.search_path:
+            page = int(query.get('start', ['0'])[0]) // self.page_size + 1
+            fixture = os.path.join(FIXTURES_DIR, 'linkedin', f'search_page_{page}.html')
+            if not os.path.exists(fixture):
+                return 200, ''
+        elif path.startswith('/jobs/view/'):
+            fixture = os.path.join(FIXTURES_DIR, 'linkedin', 'job_posting.html')
+        else:
+            return 404, ''
+        with open(fixture, encoding='utf-8') as f:
+            return 200, f.read().replace('{base}', self.url)
+    
+    def _handler(self):
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                query = parse_qs(parsed.query)
+                with stub._lock:
+                    stub.requests.append((time.monotonic(), parsed.path, query))
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    if stub.delay:
+                        time.sleep(stub.delay)
+                    status, body = stub._respond(parsed.path, query)
+                    data = body.encode('utf-8')
+                    self.send_response(status)
+                    self.send_header('Content-Type', 'text/html; charset=utf-8')
+                    self.send_header('Content-Length', str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return Handler
+
+@pytest.fixture
+def linkedin_stub():
+    stub = StubLinkedIn().start()
+    yield stub
+    stub.stop()
@@ -0,0 +1,94 @@
+import random
+import pytest
+import scipy.sparse as sp
+from app.utils.db_utils import get_db
+from app.utils.job_ingest import ingest_jobs
+from app.models.job_index import build_job_index
+from app.models.job_matcher import JobMatcher
+from app.models.batch_matcher import BatchMatcher
+
+SKILLS = ['python', 'java', 'sql', 'docker', 'react', 'aws', 'flask', 'kubernetes', 'excel', 'tableau']
+LOCATIONS = ['Cairo, Egypt', 'Alexandria, Egypt', 'Remote', 'Berlin, Germany']
+FILLER = 'build ship maintain review design scale test deploy monitor improve services platform team product'.split()
+
+def make_jobs(count, seed=0):
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(count):
+        skills = rng.sample(SKILLS, 3)
+        years, degree = rng.randint(0, 8), rng.choice(['', "Bachelor's degree required.", 'MSc preferred.'])
+        jobs.append({
+            'title': f'Engineer {i}',
+            'company': f'Company {i % 7}',
+            'location': rng.choice(LOCATIONS),
+            'description': f"{' '.join(rng.choices(FILLER, k=30))} using {', '.join(skills)}. "
+                           f'{years}+ years of experience. {degree}',
+            'skills_required': ', '.join(skills),
+            'application_link': f'https://example.com/jobs/{i}',
+        })
+    # Reposts under another link, for collapse_duplicates to fold away
+    jobs += [dict(job, application_link=job['application_link'] + '?repost=1') for job in jobs[:count // 4]]
+    return jobs
+
+def make_resumes(count, seed=1):
+    rng = random.Random(seed)
+    for i in range(count):
+        skills = rng.sample(SKILLS, 3)
+        years = rng.randint(0, 10)
+        text = f"engineer with {years} years of experience in {', '.join(skills)}. {' '.join(rng.choices(FILLER, k=20))}"
+        yield f'resume-{i}', text, {'skills': skills, 'years_of_experience': years, 'education': ['Bachelor']}
+
+def assert_same_matches(batch, single):
+    assert [job_id for job_id, _ in batch] == [job_id for job_id, _ in single]
+    assert [score for _, score in batch] == pytest.approx([score for _, score in single])
+
+@pytest.mark.parametrize('min_candidates', [200, 5])
+def test_batch_matches_equal_rank_jobs(app, min_candidates):
+    # 5 lets the skill prefilter apply; 200 scores every job
+    app.config['MATCH_MIN_CANDIDATES'] = min_candidates
+    with app.app_context():
+        db = get_db()
+        ingest_jobs(db, make_jobs(80))
+        index = build_job_index(db)
+        resumes = list(make_resumes(20))
+
+        batch = dict(BatchMatcher(index, top_n=5, chunk_size=8).match(resumes))
+        for name, text, features in resumes:
+            assert_same_matches(batch[name], JobMatcher(index=index).rank_jobs(text, features, top_n=5))
+
+def test_batch_matches_collapse_reposts(app):
+    with app.app_context():
+        db = get_db()
+        ingest_jobs(db, make_jobs(40))
+        index = build_job_index(db)
+
+        for _, matches in BatchMatcher(index, top_n=10).match(make_resumes(10)):
+            job_ids = [job_id for job_id, _ in matches]
+            clusters = [db.execute('SELECT cluster_id FROM jobs WHERE id = ?', (job_id,)).fetchone()[0] for job_id in job_ids]
+            assert len(matches) == 10
+            assert len(set(clusters)) == len(clusters)
+
+def test_resumes_without_features_use_skills_from_text(app):
+    with app.app_context():
+        db = get_db()
+        ingest_jobs(db, make_jobs(40))
+        index = build_job_index(db)
+        resumes = [(name, text) for name, text, _ in make_resumes(5)]
+
+        for (name, text), (batch_name, matches) in zip(resumes, BatchMatcher(index, top_n=5).match(resumes)):
+            assert batch_name == name
+            assert_same_matches(matches, JobMatcher(index=index).rank_jobs(text, top_n=5))
+
+def test_score_matrix_stays_sparse(app):
+    with app.app_context():
+        db = get_db()
+        ingest_jobs(db, make_jobs(40))
+        index = build_job_index(db)
+        texts = ['python and docker engineer', 'nothing in common here']
+
+        scores = BatchMatcher(index).score_matrix(texts)
+
+        assert sp.issparse(scores) and scores.shape == (2, len(index.job_ids))
+        assert scores[1].nnz == 0
+        live = index.alive
+        assert scores[0].toarray().ravel()[live] == pytest.approx(index.query(texts[0])[live])
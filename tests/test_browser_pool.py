@@ -0,0 +1,158 @@
+import time
+import threading
+import pytest
+from app.utils.browser_pool import BrowserPool, BrowserPoolClosed
+
+class FakeDriver:
+    def __init__(self, number):
+        self.number = number
+        self.quit_calls = 0
+
+    def quit(self):
+        self.quit_calls += 1
+
+class FakeFactory:
+    """Stands in for ChromeDriverFactory, recording every session it starts"""
+
+    def __init__(self, fail=False):
+        self.drivers = []
+        self.fail = fail
+
+    def __call__(self):
+        if self.fail:
+            raise RuntimeError('chromedriver failed to start')
+        driver = FakeDriver(len(self.drivers))
+        self.drivers.append(driver)
+        return driver
+
+def test_sessions_start_lazily():
+    factory = FakeFactory()
+    pool = BrowserPool(factory, max_size=2)
+    assert factory.drivers == []
+    assert pool.size == 0
+
+    with pool.session() as driver:
+        assert factory.drivers == [driver]
+        assert pool.size == 1
+    assert pool.idle_count == 1
+
+def test_idle_sessions_are_reused():
+    factory = FakeFactory()
+    pool = BrowserPool(factory, max_size=2)
+    with pool.session() as first:
+        pass
+    with pool.session() as second:
+        pass
+
+    assert second is first
+    assert len(factory.drivers) == 1
+
+def test_never_starts_more_than_max_size():
+    factory = FakeFactory()
+    pool = BrowserPool(factory, max_size=2)
+    held = [pool.acquire(), pool.acquire()]
+
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.1)
+    assert len(factory.drivers) == 2
+    assert pool.size == 2
+
+    pool.release(held[0])
+    assert pool.acquire(timeout=0.1) is held[0]
+
+def test_waiter_gets_a_released_session():
+    pool = BrowserPool(FakeFactory(), max_size=1)
+    driver = pool.acquire()
+    acquired = []
+    waiter = threading.Thread(target=lambda: acquired.append(pool.acquire(timeout=2)))
+    waiter.start()
+    time.sleep(0.05)
+    pool.release(driver)
+    waiter.join()
+
+    assert acquired == [driver]
+
+def test_session_is_discarded_after_an_error():
+    factory = FakeFactory()
+    pool = BrowserPool(factory, max_size=1)
+    with pytest.raises(ValueError):
+        with pool.session():
+            raise ValueError('page crashed')
+
+    assert factory.drivers[0].quit_calls == 1
+    assert pool.size == 0
+    with pool.session() as driver:
+        assert driver is factory.drivers[1]
+
+def test_failed_start_frees_its_slot():
+    factory = FakeFactory(fail=True)
+    pool = BrowserPool(factory, max_size=1)
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+    assert pool.size == 0
+
+    factory.fail = False
+    assert pool.acquire(timeout=0.1) is factory.drivers[0]
+
+def test_acquire_timeout_is_a_deadline_across_wakeups():
+    pool = BrowserPool(FakeFactory(), max_size=1)
+    pool.acquire()
+    stop = threading.Event()
+
+    def wake_waiters():
+        # Wakeups that never free a session, as when another caller wins the race
+        while not stop.is_set():
+            with pool._condition:
+                pool._condition.notify_all()
+            time.sleep(0.02)
+
+    waker = threading.Thread(target=wake_waiters)
+    waker.start()
+    started = time.monotonic()
+    try:
+        with pytest.raises(TimeoutError):
+            pool.acquire(timeout=0.2)
+    finally:
+        stop.set()
+        waker.join()
+
+    assert time.monotonic() - started < 0.5
+
+def test_close_quits_idle_sessions_now_and_busy_ones_on_release():
+    factory = FakeFactory()
+    pool = BrowserPool(factory, max_size=2)
+    busy, idle = pool.acquire(), pool.acquire()
+    pool.release(idle)
+
+    pool.close()
+    assert idle.quit_calls == 1
+    assert busy.quit_calls == 0
+    assert pool.size == 1
+
+    with pytest.raises(BrowserPoolClosed):
+        pool.acquire()
+
+    pool.release(busy)
+    assert busy.quit_calls == 1
+    assert pool.size == 0
+    assert pool.idle_count == 0
+
+def test_close_wakes_waiting_callers():
+    pool = BrowserPool(FakeFactory(), max_size=1)
+    pool.acquire()
+    errors = []
+
+    def wait_for_session():
+        try:
+            pool.acquire(timeout=5)
+        except Exception as e:
+            errors.append(e)
+
+    waiter = threading.Thread(target=wait_for_session)
+    waiter.start()
+    time.sleep(0.05)
+    pool.close()
+    waiter.join(timeout=1)
+
+    assert not waiter.is_alive()
+    assert len(errors) == 1 and isinstance(errors[0], BrowserPoolClosed)
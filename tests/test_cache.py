@@ -0,0 +1,76 @@
+import pytest
+from app.utils import cache as cache_module
+from app.utils.cache import Cache, MemoryBackend, SQLiteBackend, cached, invalidate
+
+class Clock:
+    """Stands in for the time module, so entries can be aged without sleeping"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module, 'time', clock)
+    return clock
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def backend(request, tmp_path):
+    if request.param == 'memory':
+        return MemoryBackend()
+    return SQLiteBackend(str(tmp_path / 'cache.db'))
+
+def test_entries_expire_after_their_ttl(backend, clock):
+    cache = Cache('jobs', backend, ttl=60)
+    loads = []
+    load = lambda: loads.append(1) or {'id': 1}
+
+    cache.get_or_load(1, load)
+    clock.now += 59
+    cache.get_or_load(1, load)
+    clock.now += 2
+    cache.get_or_load(1, load)
+
+    assert len(loads) == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+def test_missing_rows_are_not_cached(backend, clock):
+    cache = Cache('jobs', backend)
+    assert cache.get_or_load(1, lambda: None) is None
+    assert cache.get_or_load(1, lambda: 'inserted later') == 'inserted later'
+
+def test_namespaces_keep_caches_apart(backend, clock):
+    jobs, users = Cache('jobs', backend), Cache('users', backend)
+    jobs.get_or_load(1, lambda: 'job')
+    users.get_or_load(1, lambda: 'user')
+    jobs.clear()
+
+    assert jobs.get_or_load(1, lambda: 'reloaded job') == 'reloaded job'
+    assert users.get_or_load(1, lambda: 'reloaded user') == 'user'
+
+def test_memory_backend_evicts_least_recently_used(clock):
+    backend = MemoryBackend(max_items=2)
+    backend.set('a', 1, 60)
+    backend.set('b', 2, 60)
+    backend.get('a')
+    backend.set('c', 3, 60)
+
+    assert backend.get('b') is cache_module.MISSING
+    assert (backend.get('a'), backend.get('c'), backend.evictions) == (1, 3, 1)
+
+def test_invalidate_drops_only_the_given_jobs(app):
+    with app.app_context():
+        for job_id in (1, 2, 3):
+            cached('jobs', job_id, lambda: 'old')
+        invalidate('jobs', [1, 3])
+
+        assert [cached('jobs', job_id, lambda: 'new') for job_id in (1, 2, 3)] == ['new', 'old', 'new']
+
+def test_invalidate_outside_an_app_is_a_no_op():
+    invalidate('jobs', [1])
@@ -0,0 +1,43 @@
+import sqlite3
+import threading
+import pytest
+from app.utils.db_pool import ConnectionPool
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(str(tmp_path / 'pool.db'))
+    yield pool
+    pool.close_all()
+
+def in_thread(func):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(func()))
+    thread.start()
+    thread.join()
+    return result[0]
+
+def test_a_thread_gets_its_own_connection_back(pool):
+    db = pool.connection()
+    pool.release(db)
+
+    assert pool.connection() is db
+    assert in_thread(pool.connection) is not db
+    assert db.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+def test_release_rolls_back_an_unfinished_transaction(pool):
+    db = pool.connection()
+    db.execute('CREATE TABLE items (name TEXT)')
+    db.commit()
+    db.execute("INSERT INTO items VALUES ('left open')")
+    pool.release(db)
+
+    assert not db.in_transaction
+    assert pool.connection().execute('SELECT COUNT(*) FROM items').fetchone()[0] == 0
+
+def test_discard_closes_the_connection_and_opens_a_new_one(pool):
+    db = pool.connection()
+    pool.discard()
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        db.execute('SELECT 1')
+    assert pool.connection() is not db
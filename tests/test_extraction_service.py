@@ -0,0 +1,100 @@
+import os
+import time
+import threading
+import pytest
+from app.utils.extraction_service import ExtractionService, ExtractionTimeout
+
+def fake_extract(path):
+    """Stands in for extract_text; the path says how the file behaves"""
+    name = os.path.basename(path)
+    if name == 'hang':
+        time.sleep(60)
+    if name.startswith('slow-'):
+        time.sleep(float(name[len('slow-'):]))
+    if name == 'unsupported':
+        raise ValueError('Unsupported file format')
+    return f'text of {name}'
+
+@pytest.fixture
+def service():
+    service = ExtractionService(max_workers=2, timeout=5, max_pending=4, func=fake_extract)
+    yield service
+    service.shutdown()
+
+def test_workers_are_spawned_not_forked(service):
+    assert service.extract('resume.pdf') == 'text of resume.pdf'
+    assert service._executor._mp_context.get_start_method() == 'spawn'
+
+def test_extraction_errors_reach_the_caller(service):
+    with pytest.raises(ValueError):
+        service.extract('unsupported')
+
+def test_timeout_does_not_fail_other_callers(service):
+    service.extract('warm-up')
+    results = {}
+
+    def extract(path, timeout):
+        try:
+            results[path] = service.extract(path, timeout=timeout)
+        except Exception as e:
+            results[path] = e
+
+    other = threading.Thread(target=extract, args=('slow-1.5', 10))
+    other.start()
+    time.sleep(0.2)
+    extract('hang', 0.5)
+    other.join()
+
+    assert isinstance(results['hang'], ExtractionTimeout)
+    # Killed with the recycled pool, then run again in the new one
+    assert results['slow-1.5'] == 'text of slow-1.5'
+
+def test_iter_extract_times_out_only_the_stuck_file(service):
+    # Start both workers first so spawn time does not count against the deadline
+    list(service.iter_extract(['warm-up-1', 'warm-up-2']))
+    results = {path: (text, error) for path, text, error in
+               service.iter_extract(['hang', 'slow-0.5', 'a', 'b'], timeout=2)}
+
+    assert results['hang'] == ('', 'Extraction took longer than 2s')
+    for path in ('slow-0.5', 'a', 'b'):
+        assert results[path] == (f'text of {path}', None)
+    assert service._slots._value == service.max_pending
+
+def test_iter_extract_shares_the_queue_bound_with_extract(service):
+    for _ in range(service.max_pending):
+        service._slots.acquire()
+    try:
+        results = list(service.iter_extract(['a'], timeout=0.2))
+    finally:
+        for _ in range(service.max_pending):
+            service._slots.release()
+
+    assert results == [('a', '', 'Extraction queue is full, gave up on a')]
+
+def test_abandoned_iteration_returns_its_slots(service):
+    results = service.iter_extract(['slow-0.2', 'slow-0.3', 'slow-0.4'])
+    next(results)
+    results.close()
+
+    assert service._slots._value == service.max_pending
+
+def test_falls_back_in_process_when_workers_do_not_start():
+    # No spawned worker can answer this fast, as with a script missing its __main__ guard
+    service = ExtractionService(max_workers=1, startup_timeout=0.001, func=fake_extract)
+    try:
+        assert service.extract('resume.pdf') == 'text of resume.pdf'
+        assert service.in_process and service._executor is None
+        assert list(service.iter_extract(['a', 'unsupported'])) == [
+            ('a', 'text of a', None), ('unsupported', '', 'Unsupported file format'),
+        ]
+    finally:
+        service.shutdown()
+
+def test_a_recycled_pool_is_not_checked_again(service):
+    service.extract('warm-up')
+    service.startup_timeout = 0.001
+    with pytest.raises(ExtractionTimeout):
+        service.extract('hang', timeout=0.5)
+
+    assert service.extract('a') == 'text of a'
+    assert not service.in_process
@@ -0,0 +1,69 @@
+from app.utils.db_utils import get_db
+from app.utils.job_ingest import ingest_jobs
+from app.utils.job_dedup import collapse_duplicates
+
+WORDS = ('design build ship operate review test document deploy monitor scale secure migrate '
+         'profile refactor automate integrate mentor plan estimate debug').split()
+
+def posting(number, description, link=None):
+    return {
+        'title': f'Engineer {number}',
+        'company': 'Acme',
+        'location': 'Cairo, Egypt',
+        'description': description,
+        'application_link': link or f'https://example.com/jobs/{number}',
+    }
+
+def description(seed, changed=0):
+    # Forty distinct words; changing the last few keeps postings near-duplicates
+    words = [f'{WORDS[(seed + i) % len(WORDS)]}{seed}x{i}' for i in range(40)]
+    for i in range(changed):
+        words[-1 - i] = f'changed{i}'
+    return ' '.join(words)
+
+def clusters(db):
+    return dict(db.execute('SELECT id, cluster_id FROM jobs WHERE company = ?', ('Acme',)).fetchall())
+
+def test_near_duplicates_in_one_batch_share_a_cluster(app):
+    with app.app_context():
+        db = get_db()
+        result = ingest_jobs(db, [
+            posting(1, description(1)), posting(2, description(2)), posting(3, description(1, changed=1)),
+        ])
+
+        first, second, copy = result.inserted_ids
+        assert result.duplicates == 1
+        assert clusters(db) == {first: first, second: second, copy: first}
+
+def test_batch_jobs_join_clusters_of_stored_jobs(app):
+    with app.app_context():
+        db = get_db()
+        stored = ingest_jobs(db, [posting(1, description(1)), posting(2, description(2))]).inserted_ids
+        result = ingest_jobs(db, [posting(3, description(2, changed=1)), posting(4, description(4))])
+
+        assert result.duplicates == 1
+        assert clusters(db) == {
+            stored[0]: stored[0], stored[1]: stored[1],
+            result.inserted_ids[0]: stored[1], result.inserted_ids[1]: result.inserted_ids[1],
+        }
+
+def test_updated_job_is_compared_on_its_new_text(app):
+    with app.app_context():
+        db = get_db()
+        ids = ingest_jobs(db, [posting(1, description(1)), posting(2, description(2))]).inserted_ids
+        result = ingest_jobs(db, [posting(2, description(1, changed=1), link='https://example.com/jobs/2')])
+
+        assert result.updated_ids == [ids[1]]
+        assert result.duplicates == 1
+        assert clusters(db) == {ids[0]: ids[0], ids[1]: ids[0]}
+
+def test_collapse_keeps_the_best_job_of_each_cluster(app):
+    with app.app_context():
+        db = get_db()
+        first, second, copy = ingest_jobs(db, [
+            posting(1, description(1)), posting(2, description(2)), posting(3, description(1, changed=1)),
+        ]).inserted_ids
+
+        matches = [(copy, 0.9), (second, 0.8), (first, 0.7)]
+        assert collapse_duplicates(db, matches, 10) == [(copy, 0.9), (second, 0.8)]
+        assert collapse_duplicates(db, matches, 1) == [(copy, 0.9)]
@@ -0,0 +1,43 @@
+import math
+import pytest
+from app.utils.db_utils import get_db
+from app.utils.job_ingest import ingest_jobs
+from app.utils.job_features import (
+    degree_level, extract_job_features, load_job_features, NO_DEGREE, BACHELOR, MASTER, DOCTORATE
+)
+
+@pytest.mark.parametrize('text, lowest, highest', [
+    ("Bachelor's or Master's in Computer Science", BACHELOR, MASTER),
+    ('PhD preferred, MSc accepted', MASTER, DOCTORATE),
+    ('B.Tech or M.Eng', BACHELOR, MASTER),
+    ('Doctor of Philosophy', DOCTORATE, DOCTORATE),
+    ('ms word and ba skills', NO_DEGREE, NO_DEGREE),
+    ('webmaster, headmasters and an MBAx', NO_DEGREE, NO_DEGREE),
+    ('undergraduate degree in physics', BACHELOR, BACHELOR),
+])
+def test_degree_level(text, lowest, highest):
+    assert degree_level(text) == lowest
+    assert degree_level(text, highest=True) == highest
+
+def test_ingested_jobs_store_what_extraction_finds(app):
+    description = "Python and SQL work, 3+ years of experience. Bachelor's degree required."
+    with app.app_context():
+        db = get_db()
+        job_id, = ingest_jobs(db, [{
+            'title': 'Engineer', 'company': 'Acme', 'description': description,
+            'skills_required': 'Docker', 'application_link': 'https://example.com/jobs/1',
+        }]).inserted_ids
+        stored = load_job_features(db, [job_id])[job_id]
+
+    extracted = extract_job_features(description, 'Docker')
+    assert stored['skills'] == set(extracted['skills']) >= {'python', 'sql', 'docker'}
+    assert stored['required_years'] == extracted['required_years'] == 3
+    assert stored['degree_level'] == extracted['degree_level'] == BACHELOR
+
+def test_jobs_without_stored_features_are_left_out(app):
+    with app.app_context():
+        db = get_db()
+        job_id = db.execute("INSERT INTO jobs (title, description) VALUES ('Legacy', 'no years stated')").lastrowid
+
+        assert job_id not in load_job_features(db)
+        assert math.isnan(extract_job_features('no years stated')['required_years'])
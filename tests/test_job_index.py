@@ -0,0 +1,175 @@
+import os
+import numpy as np
+import pytest
+from app import create_app
+from app.utils.db_utils import get_db
+from app.utils.task_queue import get_task_queue
+from app.models.job_index import JobIndex, build_job_index, get_job_index, get_index_path, update_job_index, top_k
+
+WORDS = ['python', 'flask', 'sql', 'docker', 'linux', 'testing', 'api', 'cloud']
+NOVEL = ['kubernetes', 'terraform', 'golang', 'rust', 'kafka', 'spark']
+
+def make_jobs(prefix, count, words=WORDS):
+    return [{
+        'title': f'{prefix} engineer {i}',
+        'company': f'{prefix} company {i}',
+        'location': 'Cairo, Egypt',
+        'description': ' '.join(words[(i + j) % len(words)] for j in range(6)) + f' {prefix}',
+        'skills_required': 'Python, SQL',
+        'application_link': f'https://example.com/jobs/{prefix}-{i}',
+    } for i in range(count)]
+
+def insert_jobs(db, jobs):
+    ids = [db.execute(
+        'INSERT INTO jobs (title, company, description, location, skills_required, application_link, posted_date, source)'
+        " VALUES (:title, :company, :description, :location, :skills_required, :application_link, '2024-01-01', 'test')",
+        job
+    ).lastrowid for job in jobs]
+    db.commit()
+    return ids
+
+def add_jobs(db, jobs, **kwargs):
+    return update_job_index(insert_jobs(db, jobs), db=db, **kwargs)
+
+def refit_tasks(db):
+    return [row['status'] for row in db.execute("SELECT status FROM tasks WHERE kind = 'refit_job_index'")]
+
+@pytest.fixture
+def held_tasks(app, monkeypatch):
+    """Keeps queued tasks queued, as if the workers were busy; returns the real run_next"""
+    queue = app.extensions['task_queue']
+    run_next = queue.run_next
+    monkeypatch.setattr(queue, 'run_next', lambda task_id=None: False)
+    return run_next
+
+def fitted_index(count=50):
+    # Fitted on these and the five sample jobs init_db loads
+    db = get_db()
+    insert_jobs(db, make_jobs('base', count))
+    return build_job_index(db)
+
+def test_saved_index_loads_back_unchanged(app):
+    with app.app_context():
+        index = build_job_index(get_db())
+        loaded = JobIndex.load(get_index_path())
+
+        assert loaded.job_ids.tolist() == index.job_ids.tolist()
+        assert loaded.vectorizer.vocabulary_ == index.vectorizer.vocabulary_
+        assert loaded.vectorizer.idf_ == pytest.approx(index.vectorizer.idf_)
+        assert (loaded.matrix != index.matrix).nnz == 0
+        text = 'python engineer with flask and sql'
+        assert loaded.query(text) == pytest.approx(index.query(text))
+
+def test_empty_index_round_trips(tmp_path):
+    path = str(tmp_path / 'empty.npz')
+    JobIndex.empty().save(path)
+
+    assert JobIndex.load(path).is_empty
+
+def test_top_k_orders_by_score_and_breaks_ties_by_position():
+    scores = np.array([0.2, 0.9, 0.5, 0.9, -np.inf, 0.5, 0.1])
+
+    assert top_k(scores, 3).tolist() == [1, 3, 2]
+    assert top_k(scores, 4).tolist() == [1, 3, 2, 5]
+    # Tombstoned rows score -inf and are never returned
+    assert top_k(scores, 10).tolist() == [1, 3, 2, 5, 0, 6]
+    assert top_k(scores, 0).tolist() == []
+
+def test_updates_append_and_tombstone_rows(app):
+    with app.app_context():
+        db = get_db()
+        fitted_index()
+        first, second = insert_jobs(db, make_jobs('new', 2))
+        db.execute('DELETE FROM jobs WHERE id = ?', (first,))
+        db.commit()
+        index = update_job_index([first, second], db=db)
+
+        assert second in index.live_ids()
+        assert first not in index.live_ids()
+        assert index.appended_docs == 1
+        assert JobIndex.load(get_index_path()).live_ids().tolist() == index.live_ids().tolist()
+
+def test_one_posting_of_new_words_does_not_refit(app):
+    with app.app_context():
+        fitted_index()
+        index = add_jobs(get_db(), make_jobs('novel', 1, NOVEL))
+
+        # Every appended token is new, but one posting is not worth a refit
+        assert index.drift > 0.5
+        assert index.appended_docs == 1
+        assert index.fit_docs == 55
+
+def test_refits_once_drifted_jobs_add_up(app):
+    with app.app_context():
+        fitted_index()
+        index = add_jobs(get_db(), make_jobs('novel', 6, NOVEL))
+
+        assert index.appended_docs == 0
+        assert index.fit_docs == 61
+        assert 'kubernetes' in index.vectorizer.vocabulary_
+
+def test_deferred_refit_runs_on_the_task_queue(app):
+    with app.app_context():
+        fitted_index()
+        index = add_jobs(get_db(), make_jobs('novel', 6, NOVEL), defer_refit=True)
+
+        # The caller gets the appended index back; the refit ran as a task
+        assert index.appended_docs == 6
+        task = get_db().execute("SELECT status FROM tasks WHERE kind = 'refit_job_index'").fetchone()
+        assert task['status'] == 'done'
+        assert get_job_index().appended_docs == 0
+
+def test_a_pending_refit_is_queued_once(app, held_tasks):
+    with app.app_context():
+        db = get_db()
+        fitted_index()
+        add_jobs(db, make_jobs('novel', 6, NOVEL), defer_refit=True)
+        add_jobs(db, make_jobs('newer', 6, NOVEL), defer_refit=True)
+        assert refit_tasks(db) == ['queued']
+
+        held_tasks()
+        assert refit_tasks(db) == ['done']
+        add_jobs(db, make_jobs('later', 1, NOVEL), defer_refit=True)
+        assert refit_tasks(db) == ['done']
+
+def test_a_missing_index_file_is_rebuilt_off_the_request(app, held_tasks):
+    with app.app_context():
+        db = get_db()
+        fitted_index()
+        os.remove(get_index_path())
+
+        # The request is served an empty index instead of waiting on a fit
+        assert get_job_index().is_empty
+        assert refit_tasks(db) == ['queued']
+
+        held_tasks()
+        assert len(get_job_index().live_ids()) == 55
+        assert os.path.exists(get_index_path())
+
+def test_an_unreadable_index_file_is_rebuilt_when_asked(app):
+    with app.app_context():
+        fitted_index()
+        with open(get_index_path(), 'wb') as f:
+            f.write(b'not an index')
+
+        assert len(get_job_index(rebuild=True).live_ids()) == 55
+        assert refit_tasks(get_db()) == []
+
+def test_writers_with_a_stale_index_keep_each_others_rows(app):
+    # A second app on the same database stands in for the scraper process
+    other = create_app(type('OtherProcessConfig', (), {
+        key: app.config[key] for key in ('TESTING', 'DATABASE', 'SESSION_FILE_DIR', 'TASK_WORKERS')
+    }))
+    with app.app_context():
+        fitted_index()
+        get_job_index()
+
+    with other.app_context():
+        first = add_jobs(get_db(), make_jobs('scraped', 2))
+    with app.app_context():
+        second = add_jobs(get_db(), make_jobs('uploaded', 1))
+        assert set(first.live_ids()) < set(second.live_ids())
+
+        saved = JobIndex.load(get_index_path())
+        assert len(saved.live_ids()) == 58
+        assert saved.appended_docs == 3
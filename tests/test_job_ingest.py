@@ -0,0 +1,90 @@
+import pytest
+from app.utils.db_utils import get_db
+from app.utils.job_ingest import ingest_jobs, canonical_job_url, KnownPostings
+
+def posting(number, description='Build Flask services in Python.', link=None):
+    return {
+        'title': f'Engineer {number}',
+        'company': 'Acme',
+        'location': 'Cairo, Egypt',
+        'description': description,
+        'application_link': link or f'https://example.com/jobs/{number}',
+    }
+
+def count_jobs(db):
+    return db.execute("SELECT COUNT(*) FROM jobs WHERE company = 'Acme'").fetchone()[0]
+
+@pytest.mark.parametrize('url, canonical', [
+    ('https://example.com/jobs/42', 'https://example.com/jobs/42'),
+    ('https://example.com/jobs/42/', 'https://example.com/jobs/42'),
+    ('HTTPS://Example.COM/jobs/42', 'https://example.com/jobs/42'),
+    ('https://example.com/jobs/42?utm_source=mail&trk=feed&refId=abc', 'https://example.com/jobs/42'),
+    ('https://example.com/jobs?id=42&page=2&gclid=x', 'https://example.com/jobs?id=42&page=2'),
+    ('https://example.com/jobs?page=2&id=42', 'https://example.com/jobs?id=42&page=2'),
+    ('https://eg.linkedin.com/jobs/view/python-developer-at-acme-3812345678/?trk=x',
+     'https://www.linkedin.com/jobs/view/3812345678'),
+    ('https://www.linkedin.com/jobs/view/3812345678', 'https://www.linkedin.com/jobs/view/3812345678'),
+    ('  ', None),
+    (None, None),
+])
+def test_canonical_job_url(url, canonical):
+    assert canonical_job_url(url) == canonical
+
+def test_reingesting_a_posting_skips_or_updates_it(app):
+    with app.app_context():
+        db = get_db()
+        first = ingest_jobs(db, [posting(1), posting(2)])
+        assert (first.inserted, first.updated, first.skipped) == (2, 0, 0)
+
+        # Same content behind a tracking link is the same posting
+        again = ingest_jobs(db, [posting(1, link='https://example.com/jobs/1/?utm_source=feed')])
+        assert (again.inserted, again.updated, again.skipped) == (0, 0, 1)
+        assert again.changed_ids == []
+
+        changed = ingest_jobs(db, [posting(2, description='Now also Kubernetes.')])
+        assert (changed.inserted, changed.updated, changed.skipped) == (0, 1, 0)
+        assert changed.updated_ids == [first.inserted_ids[1]]
+        assert count_jobs(db) == 2
+        assert db.execute(
+            'SELECT description FROM jobs WHERE id = ?', (first.inserted_ids[1],)
+        ).fetchone()[0] == 'Now also Kubernetes.'
+
+def test_duplicates_in_one_batch_keep_the_last_occurrence(app):
+    with app.app_context():
+        db = get_db()
+        result = ingest_jobs(db, [posting(1), posting(1, description='Second version.'), {'title': ''}])
+
+        assert (result.inserted, result.updated, result.skipped) == (1, 0, 2)
+        assert db.execute("SELECT description FROM jobs WHERE company = 'Acme'").fetchone()[0] == 'Second version.'
+
+def test_missing_fields_do_not_overwrite_stored_values(app):
+    with app.app_context():
+        db = get_db()
+        ingest_jobs(db, [posting(1)])
+        result = ingest_jobs(db, [dict(posting(1), description=None, location='Remote')])
+
+        assert result.updated == 1
+        row = db.execute("SELECT description, location FROM jobs WHERE company = 'Acme'").fetchone()
+        assert tuple(row) == ('Build Flask services in Python.', 'Remote')
+
+def test_a_failing_row_rolls_back_the_whole_run(app):
+    with app.app_context():
+        db = get_db()
+        # The unbindable description fails in the second batch, after the first was written
+        jobs = [posting(1), posting(2), posting(3, description=['not', 'text'])]
+        with pytest.raises(Exception):
+            ingest_jobs(db, jobs, batch_size=2)
+
+        assert count_jobs(db) == 0
+
+def test_known_postings_learn_only_committed_links(app):
+    with app.app_context():
+        db = get_db()
+        known = KnownPostings()
+        with pytest.raises(Exception):
+            ingest_jobs(db, [posting(1), posting(2, description=['not', 'text'])], known_postings=known)
+        assert len(known) == 0
+
+        ingest_jobs(db, [posting(1, link='https://example.com/jobs/1?utm_source=feed')], known_postings=known)
+        assert len(known) == 1
+        assert 'https://example.com/jobs/1/' in known
@@ -0,0 +1,70 @@
+from app.utils.db_utils import get_db
+from app.models.job_search import search_jobs, build_match_query
+
+def add_job(db, title, description='', posted_date=None, location='Cairo, Egypt', skills=''):
+    return db.execute(
+        'INSERT INTO jobs (title, company, description, location, skills_required, posted_date, source)'
+        " VALUES (?, 'Acme', ?, ?, ?, ?, 'test')",
+        (title, description, location, skills, posted_date)
+    ).lastrowid
+
+def all_pages(db, text=None, limit=3):
+    ids, after = [], None
+    while True:
+        jobs, after = search_jobs(db, text, source='test', limit=limit, after=after)
+        ids += [job['id'] for job in jobs]
+        if after is None:
+            return ids
+
+def test_build_match_query_quotes_words_and_prefixes_the_last():
+    assert build_match_query('python dev') == '"python" "dev"*'
+    assert build_match_query('c++ "OR" -x') == '"c" "OR" "x"*'
+    assert build_match_query('  !! ') is None
+
+def test_text_search_ranks_title_matches_first(app):
+    with app.app_context():
+        db = get_db()
+        in_description = add_job(db, 'Engineer', 'We use kubernetes daily')
+        in_title = add_job(db, 'Kubernetes Engineer', 'Run our clusters')
+        in_skills = add_job(db, 'Engineer', 'Run our clusters', skills='Kubernetes')
+
+        jobs, after = search_jobs(db, 'kubernetes', source='test')
+
+        assert [job['id'] for job in jobs] == [in_title, in_skills, in_description]
+        assert after is None
+
+def test_text_search_pages_through_tied_scores_without_gaps(app):
+    with app.app_context():
+        db = get_db()
+        # Identical postings tie on score, so paging relies on the id tiebreak
+        ids = [add_job(db, 'Rust developer', 'rust services') for _ in range(8)]
+
+        found = all_pages(db, 'rust')
+
+        assert found == ids
+
+def test_listing_pages_newest_first_with_undated_jobs_last(app):
+    with app.app_context():
+        db = get_db()
+        dated = [add_job(db, f'Job {i}', posted_date=date)
+                 for i, date in enumerate(['2024-01-02', '2024-01-03', '2024-01-03', '2024-01-01'])]
+        undated = [add_job(db, f'Undated {i}') for i in range(3)]
+
+        assert all_pages(db) == [dated[2], dated[1], dated[0], dated[3], undated[2], undated[1], undated[0]]
+
+def test_malformed_cursor_starts_from_the_first_page(app):
+    with app.app_context():
+        db = get_db()
+        add_job(db, 'Go developer', 'go')
+
+        assert search_jobs(db, 'go', after='not-a-cursor') == search_jobs(db, 'go')
+
+def test_location_filter_matches_wildcards_literally(app):
+    with app.app_context():
+        db = get_db()
+        literal = add_job(db, 'Go developer', 'go', location='Floor 100%_B')
+        add_job(db, 'Go developer', 'go', location='Floor 1000 B')
+
+        jobs, _ = search_jobs(db, 'go', location='100%_')
+
+        assert [job['id'] for job in jobs] == [literal]
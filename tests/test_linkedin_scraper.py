@@ -0,0 +1,183 @@
+import time
+import threading
+import pytest
+import requests
+from app.utils import base_scraper
+from app.utils.job_ingest import KnownPostings, canonical_job_url
+from app.utils.linkedin_scraper import LinkedInScraper
+from app.utils.rate_limiter import HostRateLimiter, TokenBucket
+
+def make_scraper(stub, max_workers=8, requests_per_second=1000.0, burst=1000):
+    scraper = LinkedInScraper(base_url=stub.search_url, max_workers=max_workers)
+    scraper.rate_limiter = HostRateLimiter(requests_per_second, burst)
+    return scraper
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    """Record retry jitter instead of sleeping"""
+    calls = []
+    def uniform(low, high):
+        calls.append((low, high))
+        return 0.0
+    monkeypatch.setattr(base_scraper.random, 'uniform', uniform)
+    return calls
+
+def test_pages_through_every_results_page(linkedin_stub):
+    scraper = make_scraper(linkedin_stub)
+    pages = list(scraper.iter_pages('python', 'Egypt', num_jobs=100))
+
+    assert linkedin_stub.search_starts() == [0, 25, 50]
+    assert [offset for offset, _ in pages] == [25, 50, 57]
+    jobs = [job for _, page_jobs in pages for job in page_jobs]
+    assert len(jobs) == 57
+    assert len({job['application_link'] for job in jobs}) == 57
+    assert all(job['title'] and job['company'] and job['location'] for job in jobs)
+    assert all('3+ years of professional experience with Python' in job['description'] for job in jobs)
+
+def test_resumes_from_start_offset(linkedin_stub):
+    scraper = make_scraper(linkedin_stub)
+    pages = list(scraper.iter_pages('python', 'Egypt', num_jobs=100, start_offset=25))
+
+    assert linkedin_stub.search_starts() == [25, 50]
+    assert [offset for offset, _ in pages] == [50, 57]
+
+def test_stops_at_num_jobs(linkedin_stub):
+    scraper = make_scraper(linkedin_stub)
+    jobs = scraper.scrape_jobs('python', 'Egypt', num_jobs=25)
+
+    assert linkedin_stub.search_starts() == [0]
+    assert len(jobs) == 25
+    assert len(linkedin_stub.paths('/jobs/view/')) == 25
+
+def test_stops_when_a_whole_page_is_already_stored(linkedin_stub):
+    scraper = make_scraper(linkedin_stub)
+    first_page = scraper.scrape_jobs('python', 'Egypt', num_jobs=25)
+    linkedin_stub.requests.clear()
+
+    scraper.known_postings = KnownPostings(canonical_job_url(job['application_link']) for job in first_page)
+    pages = list(scraper.iter_pages('python', 'Egypt', num_jobs=100))
+
+    assert pages == [(25, [])]
+    assert linkedin_stub.search_starts() == [0]
+    assert linkedin_stub.paths('/jobs/view/') == []
+    assert scraper.stats['known_skipped'] == 25
+
+def test_filtering_leaves_recording_postings_to_ingestion(linkedin_stub):
+    scraper = make_scraper(linkedin_stub)
+    scraper.known_postings = KnownPostings()
+    jobs = scraper.scrape_jobs('python', 'Egypt', num_jobs=25)
+
+    # A posting whose fetch or ingestion fails must still be new to the next run
+    assert len(jobs) == 25
+    assert len(scraper.known_postings) == 0
+
+def test_description_fetches_are_bounded_by_max_workers(linkedin_stub):
+    linkedin_stub.delay = 0.05
+    scraper = make_scraper(linkedin_stub, max_workers=4)
+    started = time.monotonic()
+    jobs = scraper.scrape_jobs('python', 'Egypt', num_jobs=25)
+    elapsed = time.monotonic() - started
+
+    assert len(jobs) == 25
+    assert linkedin_stub.max_in_flight == 4
+    # 26 requests one after another would take at least 1.3 s
+    assert elapsed < 26 * 0.05 / 2
+
+def test_concurrent_scrape_beats_serial_fetching(linkedin_stub):
+    linkedin_stub.delay = 0.2
+    scraper = make_scraper(linkedin_stub, max_workers=8)
+    started = time.monotonic()
+    jobs = scraper.scrape_jobs('python', 'Egypt', num_jobs=40)
+    elapsed = time.monotonic() - started
+
+    assert len(jobs) == 40
+    requests_made = len(linkedin_stub.requests)
+    assert requests_made == 42
+    assert elapsed < requests_made * 0.2 / 3
+
+def test_map_concurrently_preserves_order_and_bound(linkedin_stub):
+    scraper = make_scraper(linkedin_stub, max_workers=3)
+    lock = threading.Lock()
+    active, peak = [0], [0]
+
+    def work(item):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+        return item * 2
+
+    assert scraper.map_concurrently(work, range(12)) == [item * 2 for item in range(12)]
+    assert peak[0] == 3
+    assert scraper.map_concurrently(work, []) == []
+
+def test_token_bucket_allows_burst_then_waits():
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket.try_acquire() == 0.0
+    assert bucket.try_acquire() == 0.0
+    assert bucket.try_acquire() == pytest.approx(0.1, abs=0.02)
+
+def test_requests_to_one_host_are_spaced_by_its_token_bucket(linkedin_stub):
+    scraper = make_scraper(linkedin_stub, requests_per_second=20.0, burst=1)
+    scraper.scrape_jobs('python', 'Egypt', num_jobs=10)
+
+    times = [at for at, _, _ in linkedin_stub.requests]
+    assert len(times) == 11
+    assert times[-1] - times[0] >= 10 / 20.0 * 0.9
+
+def test_hosts_are_throttled_independently(linkedin_stub):
+    other = type(linkedin_stub)().start()
+    try:
+        scraper = make_scraper(linkedin_stub, requests_per_second=10.0, burst=1)
+        urls = [f'{stub.url}/jobs/view/job-{i}' for i in range(5) for stub in (linkedin_stub, other)]
+        started = time.monotonic()
+        scraper.map_concurrently(scraper.make_request, urls)
+        elapsed = time.monotonic() - started
+    finally:
+        other.stop()
+
+    # Five requests per host at 10/s take 0.4 s; one shared bucket would need 0.9 s
+    assert 0.4 * 0.9 <= elapsed < 0.75
+
+def test_retries_rate_limiting_and_server_errors_with_jitter(linkedin_stub, no_backoff):
+    scraper = make_scraper(linkedin_stub)
+    linkedin_stub.fail('/jobs/view/', [429, 503])
+
+    response = scraper.make_request(linkedin_stub.url + '/jobs/view/backend-engineer-1')
+
+    assert response.status_code == 200
+    assert len(linkedin_stub.paths('/jobs/view/')) == 3
+    # Full jitter: each wait is drawn from [0, 2**attempt)
+    assert no_backoff == [(0, 1), (0, 2)]
+    assert scraper.stats == {'requests': 3, 'request_errors': 2, 'known_skipped': 0}
+
+def test_gives_up_after_max_retries(linkedin_stub, no_backoff):
+    scraper = make_scraper(linkedin_stub)
+    linkedin_stub.fail('/jobs/view/', [500, 502, 503])
+
+    with pytest.raises(requests.HTTPError):
+        scraper.make_request(linkedin_stub.url + '/jobs/view/backend-engineer-1')
+
+    assert len(linkedin_stub.paths('/jobs/view/')) == scraper.max_retries
+    assert len(no_backoff) == scraper.max_retries - 1
+
+@pytest.mark.parametrize('status', [400, 401, 403, 404])
+def test_does_not_retry_other_client_errors(linkedin_stub, no_backoff, status):
+    scraper = make_scraper(linkedin_stub)
+    linkedin_stub.fail('/jobs/view/', [status])
+
+    with pytest.raises(requests.HTTPError):
+        scraper.make_request(linkedin_stub.url + '/jobs/view/backend-engineer-1')
+
+    assert len(linkedin_stub.paths('/jobs/view/')) == 1
+    assert no_backoff == []
+
+def test_failed_description_leaves_the_job_without_one(linkedin_stub, no_backoff):
+    scraper = make_scraper(linkedin_stub, max_workers=1)
+    linkedin_stub.fail('/jobs/view/', [404])
+    jobs = scraper.scrape_jobs('python', 'Egypt', num_jobs=5)
+
+    assert len(jobs) == 5
+    assert [bool(job['description']) for job in jobs] == [False, True, True, True, True]
@@ -0,0 +1,33 @@
+from app.utils.db_utils import get_db
+from app.models.match_store import save_match_results, get_match_results, load_match_jobs
+
+def test_results_are_only_returned_to_their_owner(app):
+    with app.app_context():
+        db = get_db()
+        match_id = save_match_results(db, 1, [(3, 0.5123456789, {'text': 0.4}), (1, 0.25)])
+
+        # Matches saved without components load with an empty breakdown
+        assert get_match_results(db, match_id, 1) == [(3, 0.512346, {'text': 0.4}), (1, 0.25, {})]
+        assert get_match_results(db, match_id, 2) is None
+        assert get_match_results(db, 'unknown', 1) is None
+        assert get_match_results(db, None, 1) is None
+
+def test_dashboard_jobs_keep_the_ranked_order(app):
+    with app.app_context():
+        db = get_db()
+        # Job 999 was deleted after matching
+        match_id = save_match_results(db, 1, [(4, 0.9), (999, 0.7), (2, 0.5)])
+        jobs = load_match_jobs(db, match_id, 1)
+
+        assert [(job['id'], job['score']) for job in jobs] == [(4, 0.9), (2, 0.5)]
+        assert all(len(job['description']) <= 201 for job in jobs)
+
+def test_saving_prunes_expired_results(app):
+    with app.app_context():
+        db = get_db()
+        db.execute(
+            "INSERT INTO match_results (id, user_id, matches, created) VALUES ('old', 1, '[]', datetime('now', '-30 days'))"
+        )
+        save_match_results(db, 1, [(1, 0.5)])
+
+        assert db.execute("SELECT COUNT(*) FROM match_results WHERE id = 'old'").fetchone()[0] == 0
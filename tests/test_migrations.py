@@ -0,0 +1,49 @@
+from app.utils import migrations
+from app.utils.db_utils import get_db, upgrade_db
+
+def schema(db):
+    return db.execute('SELECT type, name, sql FROM sqlite_master ORDER BY name').fetchall()
+
+def test_upgrading_a_current_database_changes_nothing(app):
+    with app.app_context():
+        db = get_db()
+        before, jobs = schema(db), db.execute('SELECT COUNT(*) FROM jobs').fetchone()[0]
+
+        assert upgrade_db() == migrations.LATEST_VERSION
+        assert migrations.upgrade(db) == migrations.LATEST_VERSION
+        assert schema(db) == before
+        assert db.execute('SELECT COUNT(*) FROM jobs').fetchone()[0] == jobs
+
+def test_unversioned_database_upgrades_in_place(app):
+    with app.app_context():
+        db = get_db()
+        # The original schema.sql tables, with data and no version table
+        migrations.drop_all(db)
+        with app.open_resource('schema.sql') as f:
+            migrations._execute_script(db, f.read().decode('utf8'))
+        db.executemany(
+            'INSERT INTO jobs (title, application_link) VALUES (?, ?)',
+            [('First', 'https://example.com/jobs/1?utm_source=feed'), ('Repost', 'https://example.com/jobs/1/'),
+             ('Second', 'https://example.com/jobs/2')]
+        )
+        db.commit()
+
+        assert migrations.upgrade(db) == migrations.LATEST_VERSION
+        assert migrations.upgrade(db) == migrations.LATEST_VERSION
+        links = db.execute('SELECT title, canonical_link FROM jobs ORDER BY id').fetchall()
+        assert [tuple(row) for row in links] == [
+            ('First', 'https://example.com/jobs/1'), ('Repost', None), ('Second', 'https://example.com/jobs/2'),
+        ]
+        versions = db.execute('SELECT version FROM schema_version ORDER BY version').fetchall()
+        assert [row[0] for row in versions] == [number for number, _, _ in migrations.MIGRATIONS]
+
+def test_a_step_rerun_after_a_crash_is_harmless(app):
+    with app.app_context():
+        db = get_db()
+        # As if the process died after a step ran but before its version was recorded
+        db.execute('DELETE FROM schema_version WHERE version >= 3')
+        db.commit()
+        before = schema(db)
+
+        assert migrations.upgrade(db) == migrations.LATEST_VERSION
+        assert schema(db) == before
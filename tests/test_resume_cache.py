@@ -0,0 +1,33 @@
+from app.utils.db_utils import get_db
+from app.utils.resume_cache import ResumeCache, file_content_hash
+
+ANALYSIS = {'text': 'python developer', 'features': {'skills': ['python']}, 'quality': {'score': 70}}
+
+def test_identical_files_hash_alike(tmp_path):
+    first, second, other = tmp_path / 'a.pdf', tmp_path / 'b.pdf', tmp_path / 'c.pdf'
+    first.write_bytes(b'resume')
+    second.write_bytes(b'resume')
+    other.write_bytes(b'another resume')
+
+    assert file_content_hash(str(first)) == file_content_hash(str(second))
+    assert file_content_hash(str(first)) != file_content_hash(str(other))
+
+def test_hits_come_from_memory_then_the_table(app):
+    with app.app_context():
+        db = get_db()
+        cache = ResumeCache('1')
+        assert cache.get('hash', db) is None
+        cache.put('hash', ANALYSIS, db)
+
+        assert cache.get('hash', db) == ANALYSIS
+        # A new process starts with an empty memory tier
+        assert ResumeCache('1').get('hash', db) == ANALYSIS
+
+def test_entries_from_another_extractor_version_are_evicted(app):
+    with app.app_context():
+        db = get_db()
+        ResumeCache('1').put('hash', ANALYSIS, db)
+
+        assert ResumeCache('2').get('hash', db) is None
+        assert db.execute('SELECT COUNT(*) FROM resume_cache').fetchone()[0] == 0
+        assert ResumeCache('1').get('hash', db) is None
@@ -0,0 +1,68 @@
+from app.utils.db_utils import get_db
+from app.utils.job_ingest import ingest_jobs
+from app.utils.linkedin_scraper import LinkedInScraper
+from app.utils.rate_limiter import HostRateLimiter
+from app.utils.scrape_pipeline import ScrapeScheduler, get_checkpoint
+
+def make_scraper(stub):
+    scraper = LinkedInScraper(base_url=stub.search_url)
+    scraper.rate_limiter = HostRateLimiter(1000.0, 1000)
+    return scraper
+
+def linkedin_jobs(db):
+    return db.execute("SELECT COUNT(*) FROM jobs WHERE source = 'linkedin'").fetchone()[0]
+
+def test_partial_page_checkpoints_the_cards_it_consumed(app, linkedin_stub):
+    with app.app_context():
+        db = get_db()
+        scheduler = ScrapeScheduler([make_scraper(linkedin_stub)])
+        scheduler.run(db, ['python'], 'Egypt', num_jobs=30, budget=25)
+
+        checkpoint = get_checkpoint(db, 'linkedin', 'python', 'Egypt')
+        assert (checkpoint['next_offset'], checkpoint['jobs_seen'], checkpoint['completed']) == (25, 25, 0)
+
+        scheduler.run(db, ['python'], 'Egypt', num_jobs=30, resume=True)
+
+        checkpoint = get_checkpoint(db, 'linkedin', 'python', 'Egypt')
+        # The resumed query took 5 of page 2's cards, so the offset must not skip the other 20
+        assert (checkpoint['next_offset'], checkpoint['jobs_seen'], checkpoint['completed']) == (30, 30, 1)
+        assert linkedin_stub.search_starts() == [0, 25]
+        assert linkedin_jobs(db) == 30
+
+def test_known_postings_count_towards_budget_and_resume(app, linkedin_stub):
+    with app.app_context():
+        db = get_db()
+        # Ten postings of the first page are already stored
+        ingest_jobs(db, make_scraper(linkedin_stub).scrape_jobs('python', 'Egypt', num_jobs=10))
+        linkedin_stub.requests.clear()
+
+        scheduler = ScrapeScheduler([make_scraper(linkedin_stub)])
+        result = scheduler.run(db, ['python'], 'Egypt', num_jobs=50, budget=25)
+
+        assert result.inserted == 15
+        assert linkedin_stub.search_starts() == [0]
+        checkpoint = get_checkpoint(db, 'linkedin', 'python', 'Egypt')
+        assert (checkpoint['next_offset'], checkpoint['jobs_seen'], checkpoint['completed']) == (25, 25, 0)
+
+        scheduler.run(db, ['python'], 'Egypt', num_jobs=50, resume=True)
+
+        # 25 of the 50 cards were already read, so the resumed run needs page 2 only
+        assert linkedin_stub.search_starts() == [0, 25]
+        checkpoint = get_checkpoint(db, 'linkedin', 'python', 'Egypt')
+        assert (checkpoint['next_offset'], checkpoint['jobs_seen'], checkpoint['completed']) == (50, 50, 1)
+        assert linkedin_jobs(db) == 50
+        assert scheduler.report()[0]['jobs'] == 25
+
+def test_checkpoints_in_another_result_order_start_over(app, linkedin_stub):
+    with app.app_context():
+        db = get_db()
+        scheduler = ScrapeScheduler([make_scraper(linkedin_stub)])
+        scheduler.run(db, ['python'], 'Egypt', num_jobs=30, budget=25)
+        assert get_checkpoint(db, 'linkedin', 'python', 'Egypt')['result_order'] == 'DD'
+
+        # Without skip_known LinkedIn sorts by relevance, where offset 25 is a different place
+        scheduler.run(db, ['python'], 'Egypt', num_jobs=30, resume=True, skip_known=False)
+
+        assert linkedin_stub.search_starts() == [0, 0, 25]
+        checkpoint = get_checkpoint(db, 'linkedin', 'python', 'Egypt')
+        assert (checkpoint['next_offset'], checkpoint['completed'], checkpoint['result_order']) == (30, 1, 'R')
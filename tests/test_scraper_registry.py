@@ -0,0 +1,62 @@
+import time
+import pytest
+from app.utils.base_scraper import BaseScraper, SCRAPERS
+from app.utils.db_utils import get_db
+from app.utils.linkedin_scraper import LinkedInScraper
+from app.utils.scraper_registry import create_scrapers, discover_scrapers
+from app.utils.scrape_pipeline import ScrapeScheduler, get_checkpoint
+
+class FakeSource(BaseScraper):
+    """Serves two pages of two jobs per query, each page taking `delay` seconds"""
+
+    def __init__(self, name, delay=0.2):
+        super().__init__()
+        # Set per instance so the fakes stay out of the registry
+        self.source_name = name
+        self.delay = delay
+
+    def iter_pages(self, keywords, location, num_jobs=10, start_offset=0):
+        offset = start_offset
+        while offset < min(num_jobs, 4):
+            time.sleep(self.delay)
+            jobs = [{
+                'title': f'{keywords} engineer {offset + i}',
+                'company': self.source_name,
+                'description': f'{keywords} work',
+                'application_link': f'https://{self.source_name}.example.com/{keywords}/{offset + i}',
+            } for i in range(2)]
+            offset += len(jobs)
+            yield offset, jobs
+
+def test_subclasses_register_under_their_source_name():
+    class OtherScraper(FakeSource):
+        source_name = 'other-board'
+    try:
+        assert discover_scrapers()['other-board'] is OtherScraper
+    finally:
+        SCRAPERS.pop('other-board')
+
+def test_create_scrapers_by_name():
+    assert 'linkedin' in discover_scrapers()
+    assert [type(scraper) for scraper in create_scrapers(['linkedin'])] == [LinkedInScraper]
+    with pytest.raises(ValueError, match='nosuchboard'):
+        create_scrapers(['linkedin', 'nosuchboard'])
+
+def test_sources_and_keywords_run_in_parallel(app):
+    with app.app_context():
+        db = get_db()
+        scheduler = ScrapeScheduler([FakeSource('board-a'), FakeSource('board-b')])
+        started = time.monotonic()
+        result = scheduler.run(db, ['python', 'java'], 'Egypt', num_jobs=4)
+        elapsed = time.monotonic() - started
+
+        # Eight pages of 0.2 s each; the four queries run side by side
+        assert elapsed < 8 * 0.2 / 2
+        assert result.inserted == 16
+        for source in ('board-a', 'board-b'):
+            for keyword in ('python', 'java'):
+                assert get_checkpoint(db, source, keyword, 'Egypt')['completed']
+        report = {metrics['source']: metrics for metrics in scheduler.report()}
+        assert report['board-a']['queries'] == 2
+        assert report['board-a']['pages'] == 4
+        assert report['board-b']['jobs'] == 8
@@ -0,0 +1,34 @@
+from app.utils.db_utils import get_db
+from app.models.job_index import build_job_index
+from app.models.skill_index import SkillIndex
+
+def insert_job(db, number, description, skills):
+    return db.execute(
+        'INSERT INTO jobs (title, company, description, location, skills_required, application_link, posted_date, source)'
+        " VALUES (?, 'Acme', ?, 'Remote', ?, ?, '2024-01-01', 'test')",
+        (f'Engineer {number}', description, skills, f'https://example.com/jobs/{number}')
+    ).lastrowid
+
+def test_lookup_finds_rows_sharing_any_skill():
+    index = SkillIndex.build([{'python', 'sql'}, {'rust'}, set()])
+    index.append([{'rust', 'go'}])
+
+    assert index.lookup(['Rust']).tolist() == [1, 3]
+    assert index.lookup(['python', 'go']).tolist() == [0, 3]
+    assert index.lookup(['cobol']).tolist() == []
+
+def test_search_only_scores_jobs_sharing_a_skill(app):
+    with app.app_context():
+        db = get_db()
+        rust = [insert_job(db, i, 'backend services in rust', 'Rust') for i in range(3)]
+        python = [insert_job(db, i + 3, 'backend services in python, python apis', 'Python') for i in range(3)]
+        db.commit()
+        index = build_job_index(db)
+
+        ranked, _ = index.search('python backend services', ['rust'], top_n=3, min_candidates=1)
+        assert sorted(index.job_ids[ranked].tolist()) == rust
+
+        # Too few candidates: every job is scored, and the python jobs win on text
+        ranked, scores = index.search('python backend services', ['rust'], top_n=3, min_candidates=100)
+        assert sorted(index.job_ids[ranked].tolist()) == python
+        assert list(scores) == sorted(scores, reverse=True)
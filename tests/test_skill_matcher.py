@@ -0,0 +1,29 @@
+import re
+import pytest
+from app.utils.skill_matcher import SkillMatcher, DEFAULT_SKILLS_FILE, load_skills
+
+SKILLS = load_skills(DEFAULT_SKILLS_FILE)
+
+def naive_find(skills, text):
+    # One regex per skill, as extract_skills used to do it
+    text = text.lower()
+    return [i for i, skill in enumerate(skills) if re.search(rf'(?<!\w){re.escape(skill)}(?!\w)', text)]
+
+@pytest.mark.parametrize('text', [
+    'C++, C#, ASP.NET and .NET developers; react native and React',
+    'javascript but not java_ or xjava; ui/ux, ci/cd and objective-c',
+    'xasp.net (.net) c++x c++',
+    'Python',
+    'react  native',
+    'scikit-learn!',
+    '',
+])
+def test_finds_what_a_regex_per_skill_finds(text):
+    matcher = SkillMatcher(SKILLS)
+
+    assert matcher.find(text) == naive_find(matcher.skills, text)
+
+def test_overlapping_skills_are_reported_in_taxonomy_order():
+    matcher = SkillMatcher(['react native', 'react', 'java', 'javascript'])
+
+    assert matcher.extract('JavaScript and React Native') == ['react native', 'react', 'javascript']
@@ -0,0 +1,73 @@
+import time
+import pytest
+from app.utils.db_utils import get_db
+from app.utils.task_queue import TASK_HANDLERS, get_task_queue
+
+@pytest.fixture
+def handlers(monkeypatch):
+    def add(payload):
+        return payload['a'] + payload['b']
+
+    def broken(payload):
+        raise RuntimeError('parser crashed')
+
+    monkeypatch.setitem(TASK_HANDLERS, 'test_add', add)
+    monkeypatch.setitem(TASK_HANDLERS, 'test_broken', broken)
+
+def set_running(task_id, started, attempts):
+    db = get_db()
+    db.execute(
+        "UPDATE tasks SET status = 'running', started = datetime('now', ?), attempts = ? WHERE id = ?",
+        (started, attempts, task_id)
+    )
+    db.commit()
+
+def test_inline_tasks_finish_with_their_result(app, handlers):
+    with app.app_context():
+        queue = get_task_queue()
+        found = queue.get(queue.enqueue('test_add', {'a': 2, 'b': 3}, user_id=1))
+
+        assert (found['status'], found['result'], found['attempts'], found['user_id']) == ('done', 5, 1, 1)
+
+def test_a_raising_handler_marks_the_task_failed(app, handlers):
+    with app.app_context():
+        queue = get_task_queue()
+        found = queue.get(queue.enqueue('test_broken', {}))
+
+        assert (found['status'], found['error'], found['result']) == ('failed', 'parser crashed', None)
+        assert found['finished'] is not None
+
+def test_unknown_kinds_are_refused(app):
+    with app.app_context():
+        with pytest.raises(ValueError):
+            get_task_queue().enqueue('no_such_kind', {})
+
+def test_requeue_stale_puts_back_interrupted_tasks(app, handlers):
+    with app.app_context():
+        queue = get_task_queue()
+        interrupted, recent, exhausted = (queue.enqueue('test_add', {'a': 1, 'b': i}) for i in range(3))
+        set_running(interrupted, '-1 hour', 1)
+        set_running(recent, '-1 second', 1)
+        set_running(exhausted, '-1 hour', 3)
+
+        assert queue.broker.requeue_stale(stale_after=600, max_attempts=3) == 1
+        assert [queue.get(task_id)['status'] for task_id in (interrupted, recent, exhausted)] == ['queued', 'running', 'failed']
+
+        # The requeued task runs again; the running one is left to its worker
+        assert queue.run_next()
+        assert not queue.run_next()
+        assert (queue.get(interrupted)['status'], queue.get(interrupted)['attempts']) == ('done', 2)
+
+def test_workers_drain_the_queue(app, handlers):
+    with app.app_context():
+        queue = get_task_queue()
+        queue.workers = 2
+        try:
+            task_ids = [queue.enqueue('test_add', {'a': i, 'b': i}) for i in range(5)]
+            for _ in range(200):
+                if all(queue.get(task_id)['status'] == 'done' for task_id in task_ids):
+                    break
+                time.sleep(0.05)
+            assert [queue.get(task_id)['result'] for task_id in task_ids] == [0, 2, 4, 6, 8]
+        finally:
+            queue.stop()